@@ -0,0 +1,145 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Async Disk Collector Module
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.disk_collector import collect_render_layer
+from RenderManager2.render_manager2.core.disk_walker import scan_dir, sort_render_layers
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.render.render_layer import Render
+
+log = get_stream_logger('RenderManager2 - AsyncCollector')
+
+# seconds between checks of the cancel token while waiting for layers
+CANCEL_POLL_SECONDS = 0.05
+
+
+class CancelToken:
+    def __init__(self) -> None:
+        """Thread safe flag to stop a running scan from any thread."""
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the scan to stop, layers not resolved yet are dropped."""
+        self._event.set()
+
+    def cancelled(self) -> bool:
+        """Return True if the scan was cancelled."""
+        return self._event.is_set()
+
+
+async def iter_render_layers(
+    path: str,
+    token: CancelToken = None,
+    timeout: float = None,
+    executor: ThreadPoolExecutor = None,
+    index: ScanIndex = None,
+    latest_only: bool = False,
+    defer_info: bool = False,
+) -> AsyncIterator[Render]:
+    """Yield Render objects of a shot as soon as each render layer is resolved.
+
+    Every layer is collected with collect_render_layer on the executor, so the
+    results match collect_render_layers_by_role, but layers come in completion
+    order and each one yields its versions newest first.
+
+    Args:
+        path (str): path to search on shot frames
+        token (CancelToken, optional): stops the scan when cancelled.
+        timeout (float, optional): seconds allowed to read the shot folder and
+            to collect each render layer, layers taking longer are skipped with
+            a warning.
+        executor (ThreadPoolExecutor, optional): pool for the blocking filesystem
+            calls, the loop default executor if not given.
+        index (ScanIndex, optional): persistent index of previous scans.
+        latest_only (bool, optional): only resolve the newest valid version of
+            each render layer.
+        defer_info (bool, optional): load user and abc info on first access.
+    Yields:
+        Render: render versions of the shot.
+    """
+    token = token or CancelToken()
+    read_dir = index.scan_dir if index is not None else scan_dir
+
+    try:
+        root = await _run_blocking(executor, timeout, read_dir, path)
+    except asyncio.TimeoutError:
+        log.warning(f'Timeout reading render path: {path}')
+        return
+
+    if root is None:
+        log.warning(f'Path does not exist: {path}')
+        return
+
+    pending = {
+        asyncio.ensure_future(
+            _run_blocking(
+                executor,
+                timeout,
+                collect_render_layer,
+                path,
+                name,
+                index=index,
+                latest_only=latest_only,
+                defer_info=defer_info,
+            )
+        ): name
+        for name in sort_render_layers(root.dirs)
+    }
+
+    try:
+        while pending:
+            done, _ = await asyncio.wait(
+                pending, timeout=CANCEL_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                name = pending.pop(task)
+                try:
+                    renders = task.result()
+                except asyncio.TimeoutError:
+                    log.warning(f'Timeout collecting render layer: {name}')
+                    continue
+
+                if not renders:
+                    log.warning(f'No valid versions found for: {path}/{name}')
+
+                for render in renders:
+                    if token.cancelled():
+                        break
+                    yield render
+
+            if token.cancelled():
+                log.info(f'Scan cancelled, {len(pending)} render layers skipped.')
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+
+        if index is not None:
+            index.commit()
+
+
+async def collect_render_layers_async(path: str, **kwargs) -> list:
+    """Return all Render objects of a shot, see iter_render_layers.
+
+    Args:
+        path (str): path to search on shot frames
+    """
+    return [render async for render in iter_render_layers(path, **kwargs)]
+
+
+async def _run_blocking(
+    executor: ThreadPoolExecutor, timeout: float, func: Callable, *args, **kwargs
+):
+    """Run a blocking call on the executor, raise asyncio.TimeoutError after timeout."""
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, partial(func, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout)
@@ -0,0 +1,95 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Batch Collector Module
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Tuple
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.disk_walker import ScanStats
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.render.render_layer import Render
+from RenderManager2.render_manager2.render.tokens import (
+    BATCH_SHOT_WORKERS,
+    SCAN_WORKERS,
+)
+
+log = get_stream_logger('RenderManager2 - BatchCollector')
+
+
+def collect_shots(
+    paths: Iterable[str],
+    shot_workers: int = BATCH_SHOT_WORKERS,
+    workers: int = SCAN_WORKERS,
+    index: ScanIndex = None,
+    stats: ScanStats = None,
+    latest_only: bool = False,
+) -> Iterator[Tuple[str, dict[str, List[Render]]]]:
+    """Scan many shot render folders concurrently, yielding each shot when done.
+
+    Every shot goes through collect_render_layers_by_role, so results match the
+    single shot tool. Shots share one scan thread pool, the index and the info
+    cache; shot_workers bounds how many shots are walked at the same time.
+
+    Args:
+        paths (Iterable[str]): shot render paths, eg: shot.path_renders_cg()
+        shot_workers (int, optional): number of shots scanned at the same time.
+        workers (int, optional): number of threads shared by all shot scans.
+        index (ScanIndex, optional): persistent index of previous scans.
+        stats (ScanStats, optional): counter of filesystem calls of all shots.
+        latest_only (bool, optional): only resolve the newest valid version of
+            each render layer.
+    Yields:
+        tuple: shot path and its renders by role, in completion order. Shots
+            that fail to scan yield an empty dict.
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix='RenderManager2Scan'
+    ) as scan_pool, ThreadPoolExecutor(
+        max_workers=max(1, shot_workers), thread_name_prefix='RenderManager2Shot'
+    ) as shot_pool:
+        futures = {
+            shot_pool.submit(
+                collect_render_layers_by_role,
+                path,
+                stats,
+                index=index,
+                latest_only=latest_only,
+                executor=scan_pool,
+            ): path
+            for path in paths
+        }
+
+        try:
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    yield path, future.result()
+                except Exception as e:
+                    log.error(f'Error collecting renders from {path}: {e}')
+                    yield path, {}
+        finally:
+            # the caller stopped early, skip shots not started yet
+            for future in futures:
+                future.cancel()
+
+
+def collect_sequence(paths: Iterable[str], **kwargs) -> dict[str, dict[str, List[Render]]]:
+    """Return the renders by role of every shot, see collect_shots.
+
+    Args:
+        paths (Iterable[str]): shot render paths.
+    Returns:
+        dict: renders by role for each shot path, in the given path order.
+    """
+    paths = list(dict.fromkeys(paths))
+    results = dict(collect_shots(paths, **kwargs))
+    return {path: results[path] for path in paths}
@@ -0,0 +1,55 @@
+# ----------------------------------------------------------------------------------------
+# Deadline post job script, writes the render manifest of the rendered versions
+# ----------------------------------------------------------------------------------------
+import os
+import sys
+
+sys.path.append("C:/Python/Python311/Lib/site-packages")
+# folder holding the RenderManager2 package, five levels above this script
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 5)))
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.render_manifest import (
+    build_manifest,
+    find_version_path,
+    write_manifest,
+)
+
+log = get_stream_logger("PythonScriptJob")
+
+
+def get_argument(name):
+    """returns the value of given argument name from sysargs"""
+    for arg in sys.argv:
+        if arg.startswith(name):
+            return arg.split("=")[1]
+    return None
+
+
+def write_version_manifests(output_paths):
+    """writes the manifest of each version folder holding the given outputs"""
+    version_paths = {find_version_path(path) for path in output_paths if path}
+    version_paths.discard(None)
+
+    for version_path in sorted(version_paths):
+        try:
+            manifest_path = write_manifest(version_path, build_manifest(version_path))
+        except OSError as e:
+            log.error(f"Error writing render manifest of {version_path}: {e}")
+            continue
+
+        log.info(f"Render manifest written: {manifest_path}")
+
+
+def __main__(*args):
+    """Deadline post job script entry, called with the DeadlinePlugin"""
+    log.info("Running Render Manifest Script")
+    job = args[0].GetJob()
+    write_version_manifests(list(job.JobOutputDirectories))
+    log.info("Closing Render Manifest Script")
+
+
+if __name__ == "__main__":
+    # python job: version_path=<render version folder>
+    write_version_manifests([get_argument("version_path")])
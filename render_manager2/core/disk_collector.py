@@ -3,197 +3,332 @@
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
 import os
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, List
 
 from backpack.json_utils import json_load
 from qt_log.stream_log import get_stream_logger
 
-from RenderManager2.render_manager2.render.render_layer import Render
-from RenderManager2.render_manager2.render.tokens import (
-    RENDER_LAYER_ORDER,
-    RENDER_PREFIX,
-    RENDER_PREFIX_VERSION,
-    RENDER_ROLE,
-    TECHS_AOVS_IN_LAYER,
+from RenderManager2.render_manager2.core.disk_walker import (
+    ScanStats,
+    scan_dir,
+    scan_executor,
+    scan_map,
+    scanned_version,
+    sort_render_layers,
+    walk_render_layer,
+    walk_render_tree,
+    walk_version,
+)
+from RenderManager2.render_manager2.core.info_cache import INFO_CACHE
+from RenderManager2.render_manager2.core.libs.info_extractor import (
+    extract_user_and_references,
 )
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.render.render_layer import Render
 
 log = get_stream_logger('RenderManager2 - DiskCollector')
 
 
-def collect_render_layers_by_role(path: str) -> dict[str, List[Render]]:
+def collect_render_layers_by_role(
+    path: str,
+    stats: ScanStats = None,
+    workers: int = 0,
+    index: ScanIndex = None,
+    latest_only: bool = False,
+    defer_info: bool = False,
+    executor: ThreadPoolExecutor = None,
+    budget: float = None,
+    resume: ScanResult = None,
+) -> ScanResult:
     """Return a dictionary of Render objects grouped by role.
 
+    The shot tree is read in a single pass, see disk_walker.walk_render_tree.
+    With workers, layer and version listing, version validation and info json
+    loading run on a bounded thread pool, results keep the serial order.
+    With an index, only directories whose mtime changed are listed again.
+    With latest_only, older versions are stub Render objects, see resolve_versions.
+    With defer_info, info json files are only read when a Render asks for them.
+    With a budget, the scan returns when the time is up even if some render
+    layers were not read, the result is then not complete and lists them as
+    pending. Passing that result as resume scans only the pending layers, and
+    lists the path first if the time was up before it was listed.
+
     Args:
         path (str): path to search on shot frames
+        stats (ScanStats, optional): counter of filesystem calls issued by the scan.
+        workers (int, optional): number of scan threads, 0 scans serially.
+        index (ScanIndex, optional): persistent index of previous scans.
+        latest_only (bool, optional): only resolve the newest valid version of
+            each render layer.
+        defer_info (bool, optional): load user and abc info on first access.
+        executor (ThreadPoolExecutor, optional): scan pool shared with other
+            scans, used instead of creating one for workers.
+        budget (float, optional): max seconds to wait for the scan.
+        resume (ScanResult, optional): incomplete result of a previous scan of
+            the same path, updated in place and returned.
     Returns:
-        dict: dictionary with RENDER_ROLE keys and list of Render objects as values
+        ScanResult: dictionary with RENDER_ROLE keys and list of Render objects
+            as values, without renders if the path does not exist.
     """
-    if not os.path.exists(path):
-        log.warning(f'Path does not exist: {path}')
-        return {}
-
-    # Initialize dictionary with empty lists for each role
-    render_layers_by_role = {role: [] for role in RENDER_ROLE}
+    if budget is not None or resume is not None:
+        return _collect_within_budget(
+            path, stats, workers, index, latest_only, defer_info, executor, budget, resume
+        )
 
-    layers = _get_valid_render_layers(path)
+    read_dir = index.scan_dir if index is not None else scan_dir
 
-    for layer in layers:
-        # Extract role from layer name (second part after splitting by '_')
-        layer_parts = layer.split('_')
-        if len(layer_parts) < 2:
-            log.warning(f'Invalid layer format: {layer}')
-            continue
+    with scan_executor(workers, executor) as executor:
+        versions = walk_render_tree(path, stats, executor, read_dir, latest_only)
+        if versions is None:
+            return ScanResult(path)
 
-        role = layer_parts[1]
-        if role not in RENDER_ROLE:
-            log.warning(f'Invalid role found: {role}')
-            continue
+        if defer_info:
+            infos = [_info_loader(version, index) for version in versions]
+        else:
+            infos = scan_map(executor, lambda v: _load_info(v, stats, index), versions)
 
-        for name in _get_render_layer_names(path, layer):
-            base_path = os.path.join(path, name)
-            version_paths = _get_all_version_paths(base_path)
+    if index is not None:
+        index.commit()
 
-            # filter out invalid paths or folders
-            if not version_paths:
-                log.warning(f'No valid versions found for: {base_path}')
-                continue
+    # collect aovs and data for all versions of each render layer
+    renders_by_name = {}
+    for version, info_json in zip(versions, infos):
+        renders_by_name.setdefault(version.name, []).append(
+            _create_render(version, info_json, index)
+        )
 
-            # collect aovs and data for all versions of this render layer
-            for version_path in version_paths:
-                info_json = get_user_and_reference(get_json_data(version_path))
-                aovs = _get_aovs(version_path, name)
-                render = Render(
-                    path=version_path, name=name, aovs=aovs, info_json=info_json
-                )
-                render_layers_by_role[role].append(render)
+    render_layers_by_role = ScanResult(path, list(renders_by_name))
+    for name, renders in renders_by_name.items():
+        render_layers_by_role.add_layer(name, renders)
 
     return render_layers_by_role
 
 
-def _get_valid_render_layers(frame_path: str) -> tuple:
-    """Get names of render layers with the correct pipeline naming.
-
-    Returns:
-        list: list of valid render layers names
+def _collect_within_budget(
+    path: str,
+    stats: ScanStats,
+    workers: int,
+    index: ScanIndex,
+    latest_only: bool,
+    defer_info: bool,
+    executor: ThreadPoolExecutor,
+    budget: float,
+    resume: ScanResult,
+) -> ScanResult:
+    """Scan render layers one by one, stopping when the budget runs out.
+
+    Each render layer is a unit of work on the pool, even with 0 workers one
+    thread is used so a slow or hung share never blocks past the budget. Layers
+    still running when the time is up are left pending, their threads finish in
+    the background and their results are dropped.
     """
-    rnd_layers = []
-
-    # Convert to sets for O(1) lookup instead of O(n)
-    render_prefix_set = set(RENDER_PREFIX)
-    render_role_set = set(RENDER_ROLE)
-    render_layer_order_set = set(RENDER_LAYER_ORDER)
+    deadline = None if budget is None else time.monotonic() + budget
+    read_dir = index.scan_dir if index is not None else scan_dir
 
-    for name in os.listdir(frame_path):
-        split_name = name.split('_')
+    def remaining():
+        return None if deadline is None else max(deadline - time.monotonic(), 0)
 
-        # Need at least 2 parts for prefix and role
-        if len(split_name) < 2:
-            continue
+    pool = executor or ThreadPoolExecutor(
+        max_workers=max(workers, 1), thread_name_prefix='RenderManager2Scan'
+    )
+    try:
+        result = resume if resume is not None else ScanResult(path, listed=False)
+        if not result.listed:
+            root_future = pool.submit(read_dir, path, stats)
+            wait([root_future], timeout=remaining())
+            if not root_future.done():
+                log.warning(f'Scan budget exceeded listing: {path}')
+                root_future.cancel()
+                return result
+
+            root = root_future.result()
+            if root is None:
+                log.warning(f'Path does not exist: {path}')
+                result.listed = True
+                return result
+
+            result.add_pending(sort_render_layers(root.dirs))
+            result.listed = True
+
+        futures = {
+            pool.submit(
+                collect_render_layer, path, name, stats, index, latest_only, defer_info
+            ): name
+            for name in result.pending()
+        }
+        done, not_done = wait(futures, timeout=remaining())
+        for future in not_done:
+            future.cancel()
+    finally:
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        name = futures[future]
+        try:
+            result.add_layer(name, future.result())
+        except OSError as e:
+            log.error(f'Error scanning {path}/{name}: {e}')
 
-        # filter only valid prefixes folders
-        if split_name[0] not in render_prefix_set:
-            continue
+    if index is not None:
+        index.commit()
 
-        # filter only valid role folders
-        if split_name[1] not in render_role_set:
-            continue
+    if not result.complete:
+        log.warning(
+            f'Scan budget exceeded, {len(result.pending())} render layers pending: {path}'
+        )
 
-        # filter only valid render layer type of folders
-        if split_name[-1] in render_layer_order_set:
-            rnd_layers.append(('_').join(split_name[:-1]))
-        else:
-            log.warning(f'Invalid Render Layers Found: {name}')
+    return result
 
-    # Remove duplicates and sort
-    return sorted(set(rnd_layers))
 
+def collect_render_layer(
+    path: str,
+    name: str,
+    stats: ScanStats = None,
+    index: ScanIndex = None,
+    latest_only: bool = False,
+    defer_info: bool = False,
+) -> List[Render]:
+    """Return the Render objects of all valid versions of one render layer.
 
-def _get_render_layer_names(path: str, layer: str) -> list:
-    """Return a list of name rnd layers.
+    Same rules as collect_render_layers_by_role, for a single layer folder.
+    The index is not committed, that is left to the caller.
 
     Args:
         path (str): path to search on shot frames
-        layer (str): layer name
+        name (str): render layer folder name, eg: RND_FG_BTY
+        stats (ScanStats, optional): counter of filesystem calls issued by the scan.
+        index (ScanIndex, optional): persistent index of previous scans.
+        latest_only (bool, optional): stub versions older than the latest valid one.
+        defer_info (bool, optional): load user and abc info on first access.
     Returns:
-        list: list of rnd layers full names with suffix
-
-    # ! this method is duplicated from the get_valid_render_layers, we already
-    # ! have the layer name, we should not be doing this again
-    # ! we use this method only to sort the render layers by type
-    # ! move the sort to the get_valid_render_layers method and remove this one
+        List[Render]: versions of the render layer, newest first.
     """
-    render_layer_names = []
-
-    for suffix in RENDER_LAYER_ORDER:
-        full_name = f'{layer}_{suffix}'
-        if os.path.exists(os.path.join(path, full_name)):
-            render_layer_names.append(full_name)
+    read_dir = index.scan_dir if index is not None else scan_dir
+    versions = walk_render_layer(path, name, stats, read_dir, latest_only)
 
-    return render_layer_names
-
-
-def _get_all_version_paths(path_layer: str) -> List[str]:
-    """Get all valid version folders of a render layer.
+    renders = []
+    for version in versions:
+        if defer_info:
+            info_json = _info_loader(version, index)
+        else:
+            info_json = _load_info(version, stats, index)
+        renders.append(_create_render(version, info_json, index))
+
+    return renders
+
+
+def _create_render(
+    version: scanned_version, info_json: dict, index: ScanIndex = None
+) -> Render:
+    """Return the Render object of a scanned version, aov folders read via index."""
+    return Render(
+        path=version.path,
+        name=version.name,
+        aovs=version.aovs,
+        info_json=info_json,
+        aov_files=version.aov_files,
+        frame_sets=version.frame_sets,
+        read_dir=index.scan_dir if index is not None else None,
+    )
+
+
+def resolve_versions(
+    renders_by_role: dict[str, List[Render]],
+    name: str,
+    workers: int = 0,
+    index: ScanIndex = None,
+) -> List[Render]:
+    """Resolve in bulk the stub versions of a render layer.
+
+    Stubs are read from disk and filled in place, the ones that turn out to be
+    empty or invalid are removed from renders_by_role. Info json files are only
+    read when a resolved Render asks for them. Versions of a ScanResult are taken
+    from its name index instead of the role lists.
 
     Args:
-        path_layer (str): full path of render layer
+        renders_by_role (dict): collector result, see collect_render_layers_by_role.
+        name (str): render layer name, eg: RND_FG_BTY
+        workers (int, optional): number of scan threads, 0 scans serially.
+        index (ScanIndex, optional): persistent index of previous scans.
     Returns:
-        List[str]: list of all valid version paths (non-empty)
+        List[Render]: all valid versions of the render layer, newest first.
     """
-    if not os.path.exists(path_layer):
-        return []
-
-    # Get directory contents once instead of multiple times
-    dir_contents = os.listdir(path_layer)
-
-    versions = []
-    for _path in dir_contents:
-        for suffix in RENDER_PREFIX_VERSION:
-            if _path.startswith(suffix):
-                versions.append(_path)
-                break  # Stop checking other suffixes once we find a match
-
-    versions.sort(reverse=True)
-
-    valid_paths = []
-    for folder in versions:
-        path = os.path.join(path_layer, folder)
+    if isinstance(renders_by_role, ScanResult):
+        renders = renders_by_role.versions(name)
+    else:
+        renders = renders_by_role.get(name.split('_')[1], [])
+    stubs = [r for r in renders if r.name() == name and not r.is_resolved()]
+    read_dir = index.scan_dir if index is not None else scan_dir
+
+    with scan_executor(workers) as executor:
+        versions = scan_map(
+            executor, lambda r: walk_version(r.path(), name, None, read_dir), stubs
+        )
+
+    if index is not None:
+        index.commit()
+
+    for render, version in zip(stubs, versions):
+        if version is None:
+            log.warning(f'Invalid version removed: {render.path()}')
+            if isinstance(renders_by_role, ScanResult):
+                renders_by_role.remove_render(render)
+            else:
+                renders.remove(render)
+            continue
 
-        if not check_for_empty_subfolders(path):
-            valid_paths.append(path.replace('\\', '/'))
+        render.resolve(
+            version.aovs,
+            _info_loader(version, index),
+            version.aov_files,
+            version.frame_sets,
+            index.scan_dir if index is not None else None,
+        )
 
-    return valid_paths
+    if isinstance(renders_by_role, ScanResult):
+        # already indexed newest first
+        return list(renders_by_role.versions(name))
 
+    same_name_renders = [r for r in renders if r.name() == name]
+    same_name_renders.sort(key=lambda r: r.int_version(), reverse=True)
+    return same_name_renders
 
-def _get_last_version_path(path_layer: str) -> str:
-    """Get the last version folder of a render layer with LGT in the name.
 
-    If the folder is empty, get the previous one.
+def _load_info(version: scanned_version, stats: ScanStats, index: ScanIndex) -> dict:
+    """Return user and abc info of a scanned version.
 
-    Args:
-        path_layer (str): full path of last render version
+    Info is taken from the session cache, then from the index, and only parsed
+    from the info json file when it changed. Stubs and invalid versions have no info.
     """
-    all_versions = _get_all_version_paths(path_layer)
-    return all_versions[0] if all_versions else None
+    if version is None or version.aovs is None:
+        return None
 
+    if version.info is not None:
+        return version.info
 
-def _get_aovs(path: str, name: str) -> list:
-    """Return a list of aovs by reading subfolders of a render layer.
+    def parse():
+        return load_user_and_reference(version.path, version.files)
 
-    Args:
-        path (str): path to search for shot frames
-        name (str): name of the render layer
-    Returns:
-        list: list of aovs from valid directories
-    """
-    aovs = os.listdir(path)
+    def loader():
+        if index is None:
+            return parse()
+        return index.cached_info(version.path, version.files, parse, stats)
+
+    return INFO_CACHE.get(version.path, version.files, loader, stats)
 
-    # collecting specific aovs for technical layers
-    for key, values in TECHS_AOVS_IN_LAYER.items():
-        if name.endswith(key):
-            aovs = [aov for aov in aovs if aov in values]
 
-    return [p for p in aovs if os.path.isdir(os.path.join(path, p))]
+def _info_loader(version: scanned_version, index: ScanIndex) -> Callable:
+    """Return a deferred loader of the info of a scanned version, None for stubs."""
+    if version is None or version.aovs is None:
+        return None
+    if version.info is not None:
+        return version.info
+    return partial(_load_info, version, None, index)
 
 
 def check_for_files_exr(folder_path: str) -> bool:
@@ -304,25 +439,55 @@ def get_user_and_reference(data: dict) -> dict:
     return result
 
 
-def get_json_data(path: str) -> dict:
+def load_user_and_reference(path: str, files: tuple = None) -> dict:
+    """Return user and ABC version information of a version folder.
+
+    The info json file is streamed with extract_user_and_references, only the
+    lines up to the user and references fields are read.
+
+    Args:
+        path (str): version folder path.
+        files (tuple, optional): file names already listed from the folder.
+    Returns:
+        dict: Dictionary with user and ABC version information
+    """
+    if files is None:
+        files = os.listdir(path)
+
+    json_files = [file for file in files if file.lower().endswith('.json')]
+    if not json_files:
+        # default info data, see get_json_data
+        return get_user_and_reference(get_json_data(path, ()))
+
+    if len(json_files) > 1:
+        log.warning(
+            f'Multiple JSON files found in {path}. Using the first one: {json_files[0]}'
+        )
+
+    return extract_user_and_references(os.path.join(path, json_files[0]))
+
+
+def get_json_data(path: str, files: tuple = None) -> dict:
     """Find and load a JSON file from a directory or load a specific JSON file.
 
     Args:
         path (str): Path to a directory containing a JSON file, or path to a specific JSON file
+        files (tuple, optional): file names already listed from the directory,
+            skips probing and listing the path again.
 
     Returns:
         dict: The JSON data as a dictionary, or None if no JSON file found or errors occur.
     """
-    if not os.path.exists(path):
+    if files is None and not os.path.exists(path):
         log.warning(f'Path does not exist: {path}')
         return None
 
     # If it's a directory, search for the JSON file
-    if os.path.isdir(path):
+    if files is not None or os.path.isdir(path):
         json_files = []
 
         # Search for JSON files in the directory
-        for file in os.listdir(path):
+        for file in os.listdir(path) if files is None else files:
             if file.lower().endswith('.json'):
                 json_files.append(file)
 
@@ -0,0 +1,422 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Disk Walker Module
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Iterable, List
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.render_manifest import (
+    manifest_frame_sets,
+    manifest_info,
+    read_manifest,
+)
+from RenderManager2.render_manager2.render.tokens import (
+    RENDER_LAYER_ORDER,
+    RENDER_MANIFEST,
+    RENDER_PREFIX,
+    RENDER_PREFIX_VERSION,
+    RENDER_ROLE,
+    TECHS_AOVS_IN_LAYER,
+)
+
+log = get_stream_logger('RenderManager2 - DiskWalker')
+
+# one directory read: sub folders and files names, in disk order
+listing = namedtuple('listing', ['dirs', 'files'])
+
+# one valid version folder of a render layer, as found on disk
+# aov_files holds the listings of the aov folders already read while validating
+# frame_sets and info are taken from the render manifest when the version has one
+# stubs of versions not read yet only have role, name and path, see version_stub
+scanned_version = namedtuple(
+    'scanned_version',
+    ['role', 'name', 'path', 'aovs', 'files', 'aov_files', 'frame_sets', 'info'],
+    defaults=(None, None),
+)
+
+
+class ScanStats:
+    def __init__(self) -> None:
+        """Counter of filesystem calls issued during a scan."""
+        self.scandir = 0
+        self.stat = 0
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f'SCAN STATS scandir {self.scandir}, stat {self.stat}'
+
+    def total(self) -> int:
+        """Return the total number of filesystem round trips."""
+        return self.scandir + self.stat
+
+    def add(self, scandir: int = 0, stat: int = 0) -> None:
+        """Add calls to the counter, safe to use from scan worker threads."""
+        with self._lock:
+            self.scandir += scandir
+            self.stat += stat
+
+
+@contextmanager
+def scan_executor(workers: int = 0, shared: ThreadPoolExecutor = None):
+    """Yield a bounded thread pool for a scan, or None to scan serially.
+
+    Args:
+        workers (int): max number of threads, 0 or 1 for a serial scan.
+        shared (ThreadPoolExecutor, optional): pool owned by the caller, yielded
+            as is and left running, workers is ignored.
+    """
+    if shared is not None:
+        yield shared
+        return
+
+    if workers is None or workers <= 1:
+        yield None
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix='RenderManager2Scan'
+    ) as executor:
+        yield executor
+
+
+def scan_map(executor: ThreadPoolExecutor, func: Callable, items: Iterable) -> list:
+    """Map func over items on the executor, keeping the input order.
+
+    Args:
+        executor (ThreadPoolExecutor): pool to run on, None runs serially.
+        func (Callable): function to call with each item.
+        items (Iterable): items to process.
+    """
+    if executor is None:
+        return [func(item) for item in items]
+    return list(executor.map(func, items))
+
+
+def scan_dir(path: str, stats: ScanStats = None) -> listing:
+    """Read a directory once, splitting folders and files with DirEntry type info.
+
+    Args:
+        path (str): directory to read.
+        stats (ScanStats, optional): counter to update.
+    Returns:
+        listing: folders and files of the directory, None if it can not be read.
+    """
+    if stats is not None:
+        stats.add(scandir=1)
+
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry.name)
+    except OSError:
+        return None
+
+    return listing(tuple(dirs), tuple(files))
+
+
+def walk_render_tree(
+    path: str,
+    stats: ScanStats = None,
+    executor: ThreadPoolExecutor = None,
+    read_dir: Callable = scan_dir,
+    latest_only: bool = False,
+) -> List[scanned_version]:
+    """Walk a shot render folder reading each directory exactly once.
+
+    Results are sorted like the previous collector: layers by name, suffixes by
+    RENDER_LAYER_ORDER and versions from newest to oldest. With an executor the
+    layer folders are listed first and then every version is validated, each
+    step fanned out over the pool, so the order never depends on the threads.
+
+    Args:
+        path (str): path to search on shot frames
+        stats (ScanStats, optional): counter to update.
+        executor (ThreadPoolExecutor, optional): pool to scan on, see scan_executor.
+        read_dir (Callable, optional): directory reader with the scan_dir signature,
+            eg: ScanIndex.scan_dir to reuse unchanged listings.
+        latest_only (bool, optional): only read the newest valid version of each
+            layer, older versions are returned as stubs, see version_stub.
+    Returns:
+        List[scanned_version]: valid versions of every valid render layer,
+            None if the path does not exist.
+    """
+    root = read_dir(path, stats)
+    if root is None:
+        log.warning(f'Path does not exist: {path}')
+        return None
+
+    names = sort_render_layers(root.dirs)
+    folders = scan_map(
+        executor, lambda name: list_version_paths(path, name, stats, read_dir), names
+    )
+
+    if latest_only:
+        by_layer = scan_map(
+            executor,
+            lambda job: walk_latest_version(job[0], job[1], stats, read_dir),
+            list(zip(names, folders)),
+        )
+    else:
+        jobs = [(name, p) for name, paths in zip(names, folders) for p in paths]
+        scanned = iter(
+            scan_map(
+                executor, lambda job: walk_version(job[1], job[0], stats, read_dir), jobs
+            )
+        )
+        by_layer = [
+            [version for version in islice(scanned, len(paths)) if version is not None]
+            for paths in folders
+        ]
+
+    versions = []
+    for name, layer_versions in zip(names, by_layer):
+        if not layer_versions:
+            log.warning(f'No valid versions found for: {os.path.join(path, name)}')
+            continue
+
+        versions.extend(layer_versions)
+
+    return versions
+
+
+def walk_render_layer(
+    path: str,
+    name: str,
+    stats: ScanStats = None,
+    read_dir: Callable = scan_dir,
+    latest_only: bool = False,
+) -> List[scanned_version]:
+    """Return all valid versions of a render layer folder, newest first.
+
+    Args:
+        path (str): path to search on shot frames
+        name (str): render layer folder name, eg: RND_FG_BTY
+        stats (ScanStats, optional): counter to update.
+        read_dir (Callable, optional): directory reader, see walk_render_tree.
+        latest_only (bool, optional): stub versions older than the latest valid one.
+    """
+    version_paths = list_version_paths(path, name, stats, read_dir)
+    if latest_only:
+        return walk_latest_version(name, version_paths, stats, read_dir)
+
+    versions = []
+    for version_path in version_paths:
+        version = walk_version(version_path, name, stats, read_dir)
+        if version is not None:
+            versions.append(version)
+
+    return versions
+
+
+def walk_latest_version(
+    name: str,
+    version_paths: List[str],
+    stats: ScanStats = None,
+    read_dir: Callable = scan_dir,
+) -> List[scanned_version]:
+    """Read versions newest first until a valid one is found, stub the older ones.
+
+    Args:
+        name (str): render layer name, eg: RND_FG_BTY
+        version_paths (List[str]): version folder paths, newest first.
+        stats (ScanStats, optional): counter to update.
+        read_dir (Callable, optional): directory reader, see walk_render_tree.
+    Returns:
+        List[scanned_version]: latest valid version and older stubs, empty if
+            there is no valid version.
+    """
+    for i, version_path in enumerate(version_paths):
+        version = walk_version(version_path, name, stats, read_dir)
+        if version is not None:
+            return [version] + [version_stub(name, p) for p in version_paths[i + 1 :]]
+
+    return []
+
+
+def version_stub(name: str, version_path: str) -> scanned_version:
+    """Return a version not read from disk yet, it may turn out to be invalid.
+
+    Args:
+        name (str): render layer name, eg: RND_FG_BTY
+        version_path (str): full path of the version folder.
+    """
+    return scanned_version(
+        role=name.split('_')[1],
+        name=name,
+        path=version_path,
+        aovs=None,
+        files=None,
+        aov_files=None,
+    )
+
+
+def list_version_paths(
+    path: str, name: str, stats: ScanStats = None, read_dir: Callable = scan_dir
+) -> List[str]:
+    """Return the version folder paths of a render layer, newest first.
+
+    Args:
+        path (str): path to search on shot frames
+        name (str): render layer folder name, eg: RND_FG_BTY
+        stats (ScanStats, optional): counter to update.
+        read_dir (Callable, optional): directory reader, see walk_render_tree.
+    """
+    path_layer = os.path.join(path, name)
+    layer = read_dir(path_layer, stats)
+    if layer is None:
+        return []
+
+    folders = [
+        folder
+        for folder in layer.dirs
+        if any(folder.startswith(prefix) for prefix in RENDER_PREFIX_VERSION)
+    ]
+    folders.sort(reverse=True)
+
+    path_layer = path_layer.replace('\\', '/')
+    return [f'{path_layer}/{folder}' for folder in folders]
+
+
+def walk_version(
+    version_path: str, name: str, stats: ScanStats = None, read_dir: Callable = scan_dir
+) -> scanned_version:
+    """Read a version folder and validate it against its aov folders.
+
+    Same rules as check_for_empty_subfolders: the 'beauty' aov must hold exr
+    files, or any aov when there is no beauty folder. Versions with a render
+    manifest are validated from it and their aov folders are not read.
+
+    Args:
+        version_path (str): full path of the version folder.
+        name (str): render layer name, eg: RND_FG_BTY
+        stats (ScanStats, optional): counter to update.
+        read_dir (Callable, optional): directory reader, see walk_render_tree.
+    Returns:
+        scanned_version: the version data, None if it is empty or invalid.
+    """
+    version = read_dir(version_path, stats)
+    if version is None or not (version.dirs or version.files):
+        return None
+
+    if RENDER_MANIFEST in version.files:
+        manifest = read_manifest(version_path)
+        if stats is not None:
+            stats.add(stat=1)
+        if manifest is not None:
+            return _version_from_manifest(version_path, name, version, manifest)
+
+    aov_files = {}
+    candidates = ['beauty'] if 'beauty' in version.dirs else version.dirs
+    valid = False
+    for aov in candidates:
+        aov_listing = read_dir(os.path.join(version_path, aov), stats)
+        aov_files[aov] = aov_listing.files if aov_listing else ()
+        if any(file.endswith('.exr') for file in aov_files[aov]):
+            valid = True
+            break
+
+    if not valid:
+        return None
+
+    return scanned_version(
+        role=name.split('_')[1],
+        name=name,
+        path=version_path,
+        aovs=_filter_aovs(name, version.dirs),
+        files=version.files,
+        aov_files=aov_files,
+    )
+
+
+def _version_from_manifest(
+    version_path: str, name: str, version: listing, manifest: dict
+) -> scanned_version:
+    """Return the scanned version described by a render manifest.
+
+    Same rules as walk_version, only aovs with exr files in the manifest are kept.
+    """
+    frame_sets = manifest_frame_sets(manifest)
+    if not frame_sets:
+        return None
+
+    if 'beauty' in version.dirs and 'beauty' not in frame_sets:
+        return None
+
+    aovs = [aov for aov in version.dirs if aov in frame_sets]
+    return scanned_version(
+        role=name.split('_')[1],
+        name=name,
+        path=version_path,
+        aovs=_filter_aovs(name, aovs),
+        files=version.files,
+        aov_files={},
+        frame_sets=frame_sets,
+        info=manifest_info(manifest),
+    )
+
+
+def sort_render_layers(folders: tuple) -> List[str]:
+    """Filter render layer folders with the pipeline naming and sort them.
+
+    Layers are sorted by prefix and role, then by suffix following RENDER_LAYER_ORDER.
+
+    Args:
+        folders (tuple): folder names of the shot render path.
+    Returns:
+        List[str]: full render layer names, eg: ['RND_FG_CRYPTO', 'RND_FG_BTY']
+    """
+    render_prefix_set = set(RENDER_PREFIX)
+    render_role_set = set(RENDER_ROLE)
+    suffix_order = {suffix: i for i, suffix in enumerate(RENDER_LAYER_ORDER)}
+
+    names = []
+    for folder in folders:
+        split_name = folder.split('_')
+
+        if len(split_name) < 2:
+            continue
+
+        if split_name[0] not in render_prefix_set:
+            continue
+
+        if split_name[1] not in render_role_set:
+            continue
+
+        if split_name[-1] not in suffix_order:
+            log.warning(f'Invalid Render Layers Found: {folder}')
+            continue
+
+        names.append(folder)
+
+    return sorted(
+        names, key=lambda n: (n.rsplit('_', 1)[0], suffix_order[n.rsplit('_', 1)[1]])
+    )
+
+
+def _filter_aovs(name: str, aovs: tuple) -> list:
+    """Return the aov folders to collect for a render layer.
+
+    Args:
+        name (str): name of the render layer
+        aovs (tuple): aov folder names of the version
+    """
+    aovs = list(aovs)
+
+    # collecting specific aovs for technical layers
+    for key, values in TECHS_AOVS_IN_LAYER.items():
+        if name.endswith(key):
+            aovs = [aov for aov in aovs if aov in values]
+
+    return aovs
@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Info Json Cache
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from RenderManager2.render_manager2.core.disk_walker import ScanStats
+from RenderManager2.render_manager2.render.tokens import INFO_CACHE_SIZE
+
+
+class InfoCache:
+    def __init__(self, max_size: int = INFO_CACHE_SIZE) -> None:
+        """In memory LRU cache of render info data keyed by (path, mtime, size).
+
+        Only the extracted fields (user, abc_versions) are kept, never the full
+        scene info json.
+
+        Args:
+            max_size (int): max number of info files kept, oldest used are evicted.
+        """
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(
+        self, path: str, files: tuple, loader: Callable, stats: ScanStats = None
+    ) -> dict:
+        """Return info data of a version folder, loading it only if its file changed.
+
+        Args:
+            path (str): version folder path.
+            files (tuple): file names of the version folder.
+            loader (Callable): returns the info data when it is not cached.
+            stats (ScanStats, optional): counter to update.
+        """
+        json_files = [file for file in files if file.lower().endswith('.json')]
+        if not json_files:
+            return loader()
+
+        file_path = os.path.join(path, json_files[0]).replace('\\', '/')
+        if stats is not None:
+            stats.add(stat=1)
+
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return loader()
+
+        key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+
+        data = loader()
+        if data is None:
+            return None
+
+        data = {'user': data.get('user'), 'abc_versions': data.get('abc_versions', [])}
+        with self._lock:
+            self._data[key] = data
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        return data
+
+    def clear(self) -> None:
+        """Remove all cached info data."""
+        with self._lock:
+            self._data.clear()
+
+
+# shared by all scans of this session
+INFO_CACHE = InfoCache()
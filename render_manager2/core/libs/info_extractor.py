@@ -0,0 +1,119 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Scene Info Extractor
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import json
+import re
+
+from qt_log.stream_log import get_stream_logger
+
+log = get_stream_logger('RenderManager2 - InfoExtractor')
+
+# top level key of a json saved with indent 4, eg: '    "system": {'
+SECTION_LINE = re.compile(r'^ {4}"(?P<key>[^"]+)":')
+
+# json string value of the user, still escaped
+USER_LINE = re.compile(r'^\s*"User":\s*(?P<value>"(?:[^"\\]|\\.)*")')
+
+# start of the references item of the arcane section
+REFERENCES_PREFIX = '"STRING references '
+
+# one item of the references list literal, single or double quoted like a python
+# repr or a json list, captures the file path in the group of its quote style
+REFERENCE_ITEM = re.compile(
+    r"'Reference Node:[^'F]*(?:F(?!ilePath:)[^'F]*)*FilePath:(?P<single>[^']*)'"
+    r'|"Reference Node:[^"F]*(?:F(?!ilePath:)[^"F]*)*FilePath:(?P<double>[^"]*)"'
+)
+
+
+def extract_user_and_references(file_path: str) -> dict:
+    """Stream a Maya scene info json file and extract user and ABC references.
+
+    The file is read line by line and closed as soon as system.User and the
+    'STRING references' line of the arcane section are found. When the stream
+    does not find both, eg: files not saved with indent 4, the file is fully
+    parsed instead.
+
+    Args:
+        file_path (str): path of the scene info json file.
+    Returns:
+        dict: same result as disk_collector.get_user_and_reference
+    """
+    result = {'user': 'Unknown', 'abc_versions': []}
+    user, references = None, None
+    section = None
+
+    try:
+        with open(file_path, encoding='utf-8') as f:
+            for line in f:
+                section_match = SECTION_LINE.match(line)
+                if section_match:
+                    section = section_match['key']
+                    continue
+
+                if section == 'system' and user is None:
+                    match = USER_LINE.match(line)
+                    if match:
+                        user = json.loads(match['value'])
+
+                elif section == 'arcane' and references is None:
+                    value = line.strip()
+                    if value.startswith(REFERENCES_PREFIX):
+                        references = json.loads(value.rstrip(','))
+
+                if user is not None and references is not None:
+                    break
+
+            if user is None or references is None:
+                f.seek(0)
+                return _extract_from_data(json.load(f))
+
+    except (OSError, ValueError) as e:
+        log.error(f'Error reading info JSON {file_path}: {e}')
+        return result
+
+    if user is not None:
+        result['user'] = user
+    if references is not None:
+        result['abc_versions'] = abc_files_from_references(references)
+
+    return result
+
+
+def abc_files_from_references(references_line: str) -> list:
+    """Return ABC and MA file names from a 'STRING references [...]' line.
+
+    Args:
+        references_line (str): references line of the arcane section.
+    Returns:
+        list: file names, shader references are skipped.
+    """
+    start_bracket = references_line.find('[')
+    end_bracket = references_line.rfind(']')
+    if start_bracket == -1 or end_bracket == -1:
+        return []
+
+    files = []
+    for match in REFERENCE_ITEM.finditer(references_line, start_bracket, end_bracket + 1):
+        # basename for both separators, like os.path.basename on windows
+        filename = match[match.lastgroup].strip().replace('\\', '/').rpartition('/')[2]
+        lower_name = filename.lower()
+
+        if 'shaders' in lower_name:
+            continue
+
+        if lower_name.endswith(('.abc', '.ma')):
+            files.append(filename)
+
+    return files
+
+
+def _extract_from_data(data: dict) -> dict:
+    """Extract user and ABC references from an already parsed info json."""
+    references = next(
+        (item for item in data.get('arcane', []) if 'STRING references' in item), ''
+    )
+    return {
+        'user': data.get('system', {}).get('User', 'Unknown'),
+        'abc_versions': abc_files_from_references(references),
+    }
@@ -0,0 +1,166 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Render Version Manifest
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import json
+import os
+from array import array
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.libs.info_extractor import (
+    extract_user_and_references,
+)
+from RenderManager2.render_manager2.render.frame_set import FrameSet
+from RenderManager2.render_manager2.render.tokens import (
+    RENDER_MANIFEST,
+    RENDER_PREFIX_VERSION,
+)
+
+log = get_stream_logger('RenderManager2 - RenderManifest')
+
+# bump when the manifest data changes, other versions are ignored by the collector
+MANIFEST_VERSION = 1
+
+
+def build_manifest(version_path: str) -> dict:
+    """Describe a finished render version from its folder.
+
+    Run once by the render job, see job_scripts/write_render_manifest.py.
+
+    Args:
+        version_path (str): full path of the version folder.
+    Returns:
+        dict: manifest with the exr sequence of every aov, and user and
+            abc_versions when the version has an info json.
+
+    Example:
+        {
+            'manifest_version': 1,
+            'user': 'jdoe',
+            'abc_versions': ['char_v003.abc'],
+            'aovs': {
+                'beauty': {
+                    'name': 'RND_FG_BTY_beauty',
+                    'extension': 'exr',
+                    'padding': 4,
+                    'ranges': [[1001, 1020]],
+                },
+            },
+        }
+    """
+    aovs = {}
+    json_file = None
+    with os.scandir(version_path) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_file() and entry.name.lower().endswith('.json'):
+                json_file = json_file or entry.path
+                continue
+
+            if not entry.is_dir():
+                continue
+
+            frame_set = FrameSet.from_files(os.listdir(entry.path), 'exr')
+            if frame_set is None:
+                continue
+
+            aovs[entry.name] = {
+                'name': frame_set.name,
+                'extension': frame_set.extension,
+                'padding': frame_set.padding,
+                'ranges': frame_set.ranges(),
+            }
+
+    manifest = {'manifest_version': MANIFEST_VERSION, 'aovs': aovs}
+    if json_file is not None:
+        manifest.update(extract_user_and_references(json_file))
+
+    return manifest
+
+
+def write_manifest(version_path: str, manifest: dict) -> str:
+    """Write the manifest file of a version folder, replacing it atomically.
+
+    Returns:
+        str: path of the manifest file.
+    """
+    file_path = os.path.join(version_path, RENDER_MANIFEST).replace('\\', '/')
+    temp_path = f'{file_path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.replace(temp_path, file_path)
+    return file_path
+
+
+def read_manifest(version_path: str) -> dict:
+    """Return the manifest of a version folder.
+
+    Returns:
+        dict: manifest data, None if it can't be read or has another version,
+            the caller is expected to walk the version folder instead.
+    """
+    file_path = os.path.join(version_path, RENDER_MANIFEST)
+    try:
+        with open(file_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning(f'Error reading render manifest {file_path}: {e}')
+        return None
+
+    if manifest.get('manifest_version') != MANIFEST_VERSION:
+        log.warning(f'Unsupported render manifest version: {file_path}')
+        return None
+
+    return manifest
+
+
+def manifest_frame_sets(manifest: dict) -> dict:
+    """Return the FrameSet of every aov of a manifest, by aov name."""
+    frame_sets = {}
+    for aov, sequence in manifest.get('aovs', {}).items():
+        if not sequence.get('ranges'):
+            continue
+
+        runs = array('q', (frame for run in sequence['ranges'] for frame in run))
+        frame_sets[aov] = FrameSet.from_runs(
+            sequence['name'], sequence['extension'], runs, sequence['padding']
+        )
+    return frame_sets
+
+
+def manifest_info(manifest: dict) -> dict:
+    """Return user and abc info of a manifest, like the info json loaders.
+
+    Returns:
+        dict: info data, None if the version has no info json.
+    """
+    if 'user' not in manifest:
+        return None
+
+    return {
+        'user': manifest['user'],
+        'abc_versions': manifest.get('abc_versions', []),
+    }
+
+
+def find_version_path(path: str) -> str:
+    """Return the version folder holding a render output path.
+
+    Args:
+        path (str): version folder or any folder or file inside it, eg: the
+            output directory of a render job.
+    Returns:
+        str: version folder path, None if the path is not inside one.
+    """
+    path = path.replace('\\', '/').rstrip('/')
+    while path:
+        folder = path.rpartition('/')[2]
+        if any(folder.startswith(prefix) for prefix in RENDER_PREFIX_VERSION):
+            return path
+
+        parent = path.rpartition('/')[0]
+        if parent == path:
+            break
+        path = parent
+
+    return None
@@ -0,0 +1,145 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Invalidating Scan Cache
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+from RenderManager2.render_manager2.core.disk_walker import sort_render_layers
+from RenderManager2.render_manager2.render.render_layer import Render
+from RenderManager2.render_manager2.render.tokens import SCAN_CACHE_SHOTS
+
+
+class ScanCache:
+    def __init__(self, max_shots: int = SCAN_CACHE_SHOTS) -> None:
+        """In memory LRU cache of scanned render layers, checked by folder mtimes.
+
+        Each render layer is kept with its signature, the mtime of the layer
+        folder, of each version folder and of its beauty folder. A refresh only
+        rescans the layers whose signature changed, eg: a new version, a removed
+        version, aovs added to a version or beauty frames written, so a version
+        dropped while its beauty folder was empty is validated again. Frames
+        written into another aov folder do not change the signature, a forced
+        reload picks them up.
+
+        Args:
+            max_shots (int): max number of shots kept, oldest used are evicted.
+        """
+        self.max_shots = max_shots
+        self._shots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._shots)
+
+    def get(self, path: str, name: str, signature: tuple) -> List[Render]:
+        """Return the cached renders of a render layer if it did not change.
+
+        Args:
+            path (str): shot render path.
+            name (str): render layer folder name, eg: RND_FG_BTY
+            signature (tuple): current signature, see layer_signature.
+        Returns:
+            List[Render]: renders of the layer, None if it must be scanned.
+        """
+        if signature is None:
+            return None
+
+        with self._lock:
+            layers = self._shots.get(path)
+            if layers is None:
+                return None
+            self._shots.move_to_end(path)
+            cached = layers.get(name)
+
+        if cached is None or cached[0] != signature:
+            return None
+        return list(cached[1])
+
+    def store(self, path: str, layers: dict) -> None:
+        """Replace the cached render layers of a shot.
+
+        Args:
+            path (str): shot render path.
+            layers (dict): (signature, renders) by render layer name.
+        """
+        layers = {
+            name: (signature, tuple(renders))
+            for name, (signature, renders) in layers.items()
+            if signature is not None
+        }
+        with self._lock:
+            self._shots[path] = layers
+            self._shots.move_to_end(path)
+            while len(self._shots) > self.max_shots:
+                self._shots.popitem(last=False)
+
+    def invalidate(self, path: str = None) -> None:
+        """Forget the cached layers of a shot, or of every shot if path is None."""
+        with self._lock:
+            if path is None:
+                self._shots.clear()
+            else:
+                self._shots.pop(path, None)
+
+
+def layer_signature(layer_path: str) -> Tuple:
+    """Return the mtimes of a render layer folder, its versions and their beauty.
+
+    One stat of the layer folder, one directory read and one stat of the beauty
+    folder of each version, the version mtimes come from the DirEntry of the
+    listing. The beauty folder validates a version and gives its frame range.
+
+    Args:
+        layer_path (str): render layer folder path.
+    Returns:
+        tuple: (layer mtime, ((version name, version mtime, beauty mtime), ...)),
+            None if the folder can not be read. beauty mtime is None if the
+            version has no beauty folder.
+    """
+    try:
+        mtime = os.stat(layer_path).st_mtime_ns
+        versions = []
+        with os.scandir(layer_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    versions.append(
+                        (entry.name, entry.stat().st_mtime_ns, _beauty_mtime(entry.path))
+                    )
+    except OSError:
+        return None
+
+    return mtime, tuple(sorted(versions))
+
+
+def shot_signature(path: str) -> Tuple:
+    """Return the mtime of a shot render folder and the signatures of its layers.
+
+    Changes when a render layer is added or removed, or when any of them
+    changes, see layer_signature.
+
+    Args:
+        path (str): shot render path.
+    Returns:
+        tuple: (shot mtime, ((layer name, layer signature), ...)), None if the
+            folder can not be read.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+        with os.scandir(path) as entries:
+            folders = [entry.name for entry in entries if entry.is_dir()]
+    except OSError:
+        return None
+
+    names = sort_render_layers(folders)
+    return mtime, tuple((name, layer_signature(f'{path}/{name}')) for name in names)
+
+
+def _beauty_mtime(version_path: str) -> int:
+    """Return the mtime of the beauty folder of a version, None if missing."""
+    try:
+        return os.stat(os.path.join(version_path, 'beauty')).st_mtime_ns
+    except OSError:
+        return None
@@ -0,0 +1,201 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Persistent Scan Index
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import json
+import os
+import sqlite3
+import threading
+from typing import Callable
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.disk_walker import ScanStats, listing, scan_dir
+from RenderManager2.render_manager2.render.tokens import SCAN_INDEX_PATH
+
+log = get_stream_logger('RenderManager2 - ScanIndex')
+
+# bump when the stored data changes, old databases are rebuilt
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    dirs TEXT NOT NULL,
+    files TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS info (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+class ScanIndex:
+    def __init__(self, db_path: str = SCAN_INDEX_PATH) -> None:
+        """Local index of directory listings keyed by directory mtime.
+
+        A directory is only listed again when its mtime changed since the last
+        scan, otherwise one stat is enough. Version folders hold the aov list,
+        aov folders the exr frame list, and parsed info json data is stored by
+        file mtime and size.
+
+        Args:
+            db_path (str): sqlite database file, ':memory:' for a temporary index.
+        """
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._pending_dirs = {}
+        self._pending_info = {}
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Create the tables, dropping them if they belong to an older schema."""
+        with self._lock:
+            version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._connection.executescript(
+                    'DROP TABLE IF EXISTS dirs; DROP TABLE IF EXISTS info;'
+                )
+                self._connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self._connection.executescript(SCHEMA)
+            self._connection.commit()
+
+    def scan_dir(
+        self, path: str, stats: ScanStats = None, force: bool = False
+    ) -> listing:
+        """Return the listing of a directory, reading it only if its mtime changed.
+
+        Same contract as disk_walker.scan_dir.
+
+        Args:
+            path (str): directory to read.
+            stats (ScanStats, optional): counter to update.
+            force (bool, optional): read it even if its mtime did not change.
+        """
+        if stats is not None:
+            stats.add(stat=1)
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        key = _key(path)
+        with self._lock:
+            row = self._pending_dirs.get(key) or self._connection.execute(
+                'SELECT mtime, dirs, files FROM dirs WHERE path = ?', (key,)
+            ).fetchone()
+
+        if row and row[0] == mtime and not force:
+            return listing(tuple(json.loads(row[1])), tuple(json.loads(row[2])))
+
+        result = scan_dir(path, stats)
+        if result is not None:
+            with self._lock:
+                self._pending_dirs[key] = (
+                    mtime,
+                    json.dumps(result.dirs),
+                    json.dumps(result.files),
+                )
+        return result
+
+    def rescan(self) -> 'ScanIndex':
+        """Return a view of the index that reads every directory again.
+
+        Used for forced reloads, eg: frames rewritten in place keep the mtime of
+        their folder. The fresh listings are stored, later scans reuse them.
+        """
+        return _RescanIndex(self)
+
+    def cached_info(
+        self, path: str, files: tuple, loader: Callable, stats: ScanStats = None
+    ) -> dict:
+        """Return parsed info json data of a version folder, loading it if it changed.
+
+        Args:
+            path (str): version folder path.
+            files (tuple): file names of the version folder.
+            loader (Callable): returns the parsed data when it is not indexed.
+            stats (ScanStats, optional): counter to update.
+        """
+        json_files = [file for file in files if file.lower().endswith('.json')]
+        if not json_files:
+            return loader()
+
+        file_path = _key(os.path.join(path, json_files[0]))
+        if stats is not None:
+            stats.add(stat=1)
+
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return loader()
+
+        with self._lock:
+            row = self._pending_info.get(file_path) or self._connection.execute(
+                'SELECT mtime, size, data FROM info WHERE path = ?', (file_path,)
+            ).fetchone()
+
+        if row and row[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+            return json.loads(row[2])
+
+        data = loader()
+        with self._lock:
+            self._pending_info[file_path] = (
+                file_stat.st_mtime_ns,
+                file_stat.st_size,
+                json.dumps(data),
+            )
+        return data
+
+    def commit(self) -> None:
+        """Write all listings and info data collected since the last commit."""
+        with self._lock:
+            if not (self._pending_dirs or self._pending_info):
+                return
+
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?)',
+                [(key, *row) for key, row in self._pending_dirs.items()],
+            )
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO info VALUES (?, ?, ?, ?)',
+                [(key, *row) for key, row in self._pending_info.items()],
+            )
+            self._connection.commit()
+            log.debug(
+                f'Scan index updated: {len(self._pending_dirs)} dirs, '
+                f'{len(self._pending_info)} info files'
+            )
+            self._pending_dirs.clear()
+            self._pending_info.clear()
+
+    def close(self) -> None:
+        """Commit pending data and close the database."""
+        self.commit()
+        self._connection.close()
+
+
+class _RescanIndex:
+    def __init__(self, index: ScanIndex) -> None:
+        """ScanIndex whose scan_dir always reads the directory, see ScanIndex.rescan."""
+        self._index = index
+
+    def scan_dir(self, path: str, stats: ScanStats = None) -> listing:
+        """Read a directory and store its listing in the index."""
+        return self._index.scan_dir(path, stats, force=True)
+
+    def __getattr__(self, name: str):
+        return getattr(self._index, name)
+
+
+def _key(path: str) -> str:
+    """Return the normalized path used as index key."""
+    return path.replace('\\', '/')
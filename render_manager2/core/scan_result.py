@@ -0,0 +1,130 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Scan Result Container
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+from typing import List
+
+from RenderManager2.render_manager2.render.render_layer import Render
+from RenderManager2.render_manager2.render.tokens import RENDER_ROLE
+
+
+class ScanResult(dict):
+    def __init__(self, path: str, names: List[str] = (), listed: bool = True) -> None:
+        """Renders by role returned by collect_render_layers_by_role.
+
+        Works as the plain dict with RENDER_ROLE keys and lists of Render objects,
+        and keeps track of render layers not scanned yet when a scan ran out of
+        time, so a later scan can resume from them. Versions are also indexed by
+        render layer name, newest first, for constant time version lookups.
+
+        Args:
+            path (str): shot render path of the scan.
+            names (List[str], optional): render layer folder names found in the
+                path, in collector order, all of them pending.
+            listed (bool, optional): False if the path itself was not listed
+                yet, the result is then not complete even without pending layers.
+        """
+        super().__init__({role: [] for role in RENDER_ROLE})
+        self.path = path
+        self.listed = listed
+        self._order = {}
+        self._pending = []
+        self._versions = {}
+        self._latest = None
+        self.add_pending(names)
+
+    @property
+    def complete(self) -> bool:
+        """Return True if the path was listed and every render layer was scanned."""
+        return self.listed and not self._pending
+
+    def pending(self) -> List[str]:
+        """Return render layer folder names not scanned yet, in collector order."""
+        return list(self._pending)
+
+    def pending_paths(self) -> List[str]:
+        """Return full paths of render layer folders not scanned yet."""
+        return [f'{self.path}/{name}' for name in self._pending]
+
+    def add_pending(self, names: List[str]) -> None:
+        """Register render layer folder names to scan, in collector order."""
+        for name in names:
+            if name not in self._order:
+                self._order[name] = len(self._order)
+                self._pending.append(name)
+
+    def add_layer(self, name: str, renders: List[Render]) -> None:
+        """Store the scanned versions of a render layer, newest first.
+
+        Versions stored by a previous scan of the layer are replaced, other
+        layers and their index entries are kept.
+
+        Args:
+            name (str): render layer folder name, eg: RND_FG_BTY
+            renders (List[Render]): versions of the layer, may be empty.
+        """
+        self.add_pending([name])
+        if name in self._pending:
+            self._pending.remove(name)
+
+        role = name.split('_')[1]
+        previous = self._versions.pop(name, None)
+        self._latest = None
+        if not renders:
+            if previous:
+                self[role] = [r for r in self[role] if r.name() != name]
+            return
+
+        layers = [r for r in self[role] if r.name() != name] + list(renders)
+        # stable sort, versions keep their order inside each layer
+        layers.sort(key=lambda r: self._order.get(r.name(), len(self._order)))
+        self[role] = layers
+        self._versions[name] = sorted(
+            renders, key=lambda r: r.int_version(), reverse=True
+        )
+
+    def remove_render(self, render: Render) -> None:
+        """Remove a version of a render layer, eg: found invalid when resolved."""
+        name = render.name()
+        role = self.get(name.split('_')[1], [])
+        if render in role:
+            role.remove(render)
+
+        versions = self._versions.get(name, [])
+        if render in versions:
+            versions.remove(render)
+            self._latest = None
+        if not versions:
+            self._versions.pop(name, None)
+
+    def versions(self, name: str) -> List[Render]:
+        """Return all versions of a render layer, newest first.
+
+        The returned list is the index itself, it must not be modified.
+
+        Args:
+            name (str): render layer name, eg: RND_FG_BTY
+        """
+        return self._versions.get(name, [])
+
+    def latest(self, name: str) -> Render:
+        """Return the newest version of a render layer, None if it has none."""
+        versions = self._versions.get(name)
+        return versions[0] if versions else None
+
+    def latest_versions(self) -> List[Render]:
+        """Return the newest version of every render layer.
+
+        Layers are sorted by role and collector order, like the role lists.
+        """
+        if self._latest is None:
+            roles = {role: i for i, role in enumerate(self)}
+            names = sorted(
+                self._versions,
+                key=lambda n: (
+                    roles.get(n.split('_')[1], len(roles)),
+                    self._order.get(n, len(self._order)),
+                ),
+            )
+            self._latest = [self._versions[name][0] for name in names]
+        return list(self._latest)
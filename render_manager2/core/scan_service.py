@@ -0,0 +1,317 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Local Shot Scan Service
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import contextlib
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.async_collector import CancelToken
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.scan_cache import shot_signature
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.render.tokens import (
+    SCAN_SERVICE_ADDRESS,
+    SCAN_SERVICE_KEEPALIVE,
+    SCAN_SERVICE_KEY_PATH,
+    SCAN_SERVICE_POLL_SECONDS,
+    SCAN_SERVICE_SHOTS,
+    SCAN_SERVICE_TIMEOUT,
+    SCAN_WORKERS,
+)
+
+log = get_stream_logger('RenderManager2 - ScanService')
+
+# answer sent every SCAN_SERVICE_KEEPALIVE seconds while a requested scan runs
+SCANNING = 'scanning'
+
+
+class ScanService:
+    def __init__(
+        self,
+        address: tuple = SCAN_SERVICE_ADDRESS,
+        key_path: str = SCAN_SERVICE_KEY_PATH,
+        max_shots: int = SCAN_SERVICE_SHOTS,
+        poll_seconds: float = SCAN_SERVICE_POLL_SECONDS,
+        index: ScanIndex = None,
+    ) -> None:
+        """Background service keeping the scans of recently used shots warm.
+
+        Nuke sessions of the workstation ask for a shot with request_scan and get
+        the last scan result after checking its render layer signatures, a warm
+        shot whose layers changed since its scan is scanned again before being
+        served. Warm shots are also scanned again every poll_seconds through the
+        scan index, so unchanged directories cost one stat and only folders whose
+        mtime changed are listed. Requests of a shot being scanned wait for that
+        scan instead of starting another.
+
+        Args:
+            address (tuple): local (host, port) to listen on.
+            key_path (str): file with the secret shared with the sessions,
+                created on start if missing.
+            max_shots (int): shots kept warm, least recently requested are dropped.
+            poll_seconds (float): seconds between refreshes of the warm shots.
+            index (ScanIndex, optional): scan index, the default database if None.
+        """
+        self.address = address
+        self.key_path = key_path
+        self.max_shots = max_shots
+        self.poll_seconds = poll_seconds
+        self.index = index or ScanIndex()
+
+        self._shots = OrderedDict()
+        self._scans = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=SCAN_WORKERS, thread_name_prefix='RenderManager2Scan'
+        )
+
+    def get(self, path: str, force: bool = False) -> ScanResult:
+        """Return the scan of a shot, scanning it now if it is not warm.
+
+        Args:
+            path (str): shot render path.
+            force (bool, optional): scan again even if the shot is warm.
+        """
+        return self._scan_future(path, force).result()
+
+    def _scan_future(self, path: str, force: bool = False) -> Future:
+        """Return the scan of a shot as a future, joining a scan of it in progress.
+
+        A warm shot is served only if its signature did not change since it was
+        scanned, eg: no new version and no beauty frames written.
+        """
+        future = Future()
+        with self._lock:
+            warm = self._shots.get(path)
+
+        if warm is not None and not force and warm[0] == shot_signature(path):
+            with self._lock:
+                if path in self._shots:
+                    self._shots.move_to_end(path)
+            future.set_result(warm[1])
+            return future
+
+        with self._lock:
+            if path in self._scans:
+                return self._scans[path]
+            self._scans[path] = future
+
+        threading.Thread(
+            target=self._run_scan,
+            args=(path, future, force),
+            name='RenderManager2Request',
+            daemon=True,
+        ).start()
+        return future
+
+    def _run_scan(self, path: str, future: Future, force: bool) -> None:
+        """Scan a shot for a request and set the result of its future."""
+        try:
+            future.set_result(self._scan(path, force=force))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._scans.pop(path, None)
+
+    def refresh(self) -> None:
+        """Scan again all warm shots, unchanged directories are not listed."""
+        with self._lock:
+            paths = list(self._shots)
+
+        for path in paths:
+            if self._stop.is_set():
+                return
+            self._scan(path, keep_order=True)
+
+    def _scan(
+        self, path: str, keep_order: bool = False, force: bool = False
+    ) -> ScanResult:
+        """Scan a shot and store the result, dropping the oldest warm shots.
+
+        Forced scans read every folder again, even if its mtime did not change.
+        The signature is read first, so changes made during the scan are seen by
+        the next request.
+        """
+        signature = shot_signature(path)
+        index = self.index.rescan() if force else self.index
+        result = collect_render_layers_by_role(
+            path, index=index, latest_only=True, executor=self._executor
+        )
+
+        with self._lock:
+            if keep_order and path not in self._shots:
+                return result
+
+            self._shots[path] = (signature, result)
+            if not keep_order:
+                self._shots.move_to_end(path)
+
+            while len(self._shots) > self.max_shots:
+                self._shots.popitem(last=False)
+        return result
+
+    def serve_forever(self) -> None:
+        """Listen for session requests until stop() is called."""
+        self._listener = Listener(self.address, authkey=service_key(self.key_path, True))
+        log.info(f'Scan service listening on {self.address}')
+
+        threading.Thread(
+            target=self._poll, name='RenderManager2Poll', daemon=True
+        ).start()
+
+        with self._listener:
+            while not self._stop.is_set():
+                try:
+                    connection = self._listener.accept()
+                except (AuthenticationError, EOFError, OSError) as e:
+                    if not self._stop.is_set():
+                        log.warning(f'Rejected scan service client: {e}')
+                    continue
+
+                threading.Thread(
+                    target=self._handle, args=(connection,), daemon=True
+                ).start()
+
+    def stop(self) -> None:
+        """Stop serving and refreshing, commit the scan index."""
+        self._stop.set()
+        if self._listener is not None:
+            # wake up the blocking accept so the serve loop can exit
+            with contextlib.suppress(OSError):
+                socket.create_connection(self._listener.address, timeout=1).close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.index.commit()
+
+    def _poll(self) -> None:
+        """Refresh warm shots every poll_seconds."""
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                log.error(f'Error refreshing warm shots: {e}')
+
+    def _handle(self, connection) -> None:
+        """Answer the requests of one session connection."""
+        with connection:
+            while True:
+                try:
+                    request = connection.recv()
+                    command = request[0]
+                    if command == 'ping':
+                        connection.send('pong')
+                    elif command == 'scan':
+                        self._send_scan(connection, *request[1:])
+                    else:
+                        log.warning(f'Unknown scan service request: {command}')
+                        connection.send(None)
+                except (EOFError, OSError):
+                    # closed by the session, eg: it stopped waiting for a scan
+                    return
+
+    def _send_scan(self, connection, path: str, force: bool) -> None:
+        """Send the scan of a shot, and SCANNING while it is running."""
+        future = self._scan_future(path, force)
+        while not wait([future], timeout=SCAN_SERVICE_KEEPALIVE).done:
+            connection.send(SCANNING)
+
+        try:
+            result = future.result()
+        except Exception as e:
+            log.error(f'Error scanning {path}: {e}')
+            result = None
+        connection.send(result)
+
+
+def service_key(key_path: str = SCAN_SERVICE_KEY_PATH, create: bool = False) -> bytes:
+    """Return the secret shared by the service and the sessions of this user.
+
+    Args:
+        key_path (str): secret file path.
+        create (bool, optional): write a new secret readable only by the user
+            if the file does not exist.
+    Returns:
+        bytes: the secret, None if it does not exist and was not created.
+    """
+    try:
+        with open(key_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        if not create:
+            return None
+
+    os.makedirs(os.path.dirname(key_path), exist_ok=True)
+    key = os.urandom(32)
+    descriptor = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def request_scan(
+    path: str,
+    force: bool = False,
+    address: tuple = SCAN_SERVICE_ADDRESS,
+    key_path: str = SCAN_SERVICE_KEY_PATH,
+    timeout: float = SCAN_SERVICE_TIMEOUT,
+    token: CancelToken = None,
+) -> ScanResult:
+    """Ask the local scan service for the scan of a shot.
+
+    While the service is scanning the shot it keeps sending SCANNING, so a slow
+    scan is waited for instead of being read again by the session.
+
+    Args:
+        path (str): shot render path.
+        force (bool, optional): ask the service to scan the shot again.
+        address (tuple): local (host, port) of the service.
+        key_path (str): secret file path.
+        timeout (float): seconds to wait for each answer of the service.
+        token (CancelToken, optional): stops waiting for a running scan.
+    Returns:
+        ScanResult: the scan, None if the service is not running, did not
+            answer in time or the wait was cancelled, the caller is expected
+            to scan by itself.
+    """
+    key = service_key(key_path)
+    if key is None:
+        return None
+
+    try:
+        with Client(address, authkey=key) as connection:
+            connection.send(('scan', path, force))
+            while True:
+                if not connection.poll(timeout):
+                    log.warning(f'Scan service timeout for: {path}')
+                    return None
+
+                answer = connection.recv()
+                if answer != SCANNING:
+                    return answer
+                if token is not None and token.cancelled():
+                    return None
+    except (OSError, EOFError, AuthenticationError) as e:
+        log.debug(f'Scan service not available: {e}')
+        return None
+
+
+if __name__ == '__main__':
+    service = ScanService()
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
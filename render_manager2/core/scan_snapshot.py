@@ -0,0 +1,322 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Binary Scan Snapshot
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import partial
+from typing import List
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.disk_collector import load_user_and_reference
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.render.frame_set import FrameSet
+from RenderManager2.render_manager2.render.render_layer import Render
+
+log = get_stream_logger('RenderManager2 - ScanSnapshot')
+
+MAGIC = b'RM2S'
+
+# bump when the layout changes, older snapshots are rejected
+FORMAT_VERSION = 2
+
+# string, aov and reference index meaning no value, as reference count the info
+# was not loaded when saved
+NONE = 0xFFFFFFFF
+
+# magic, version, byte order of the runs, flags, counts of strings, renders, aovs,
+# references, runs, layer names, pending layer names and the shot path string
+HEADER = struct.Struct('<4sHBBIIIIIIII')
+
+# header flag of a scan that ran out of time before listing the shot path
+NOT_LISTED = 1
+
+# name, path, user, first reference, reference count, first aov, aov count
+RENDER = struct.Struct('<IIIIIII')
+
+# aov name, sequence name, extension, padding, first run value, run values count
+AOV = struct.Struct('<IIIIII')
+
+_BYTE_ORDERS = {'little': 0, 'big': 1}
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        """Unique strings of a snapshot, stored once and referenced by index."""
+        self.strings = []
+        self._ids = {}
+
+    def add(self, value: str) -> int:
+        """Return the index of a string, NONE for None."""
+        if value is None:
+            return NONE
+        if value not in self._ids:
+            self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return self._ids[value]
+
+
+def save_snapshot(renders_by_role: dict, file_path: str) -> None:
+    """Write the scan of a shot to a binary snapshot file.
+
+    Renders, aovs, frame sets and info fields (user, abc_versions) are stored,
+    frame sets as the flat runs of FrameSet. Only data already in memory is
+    written, nothing is read from disk: deferred info and aovs not listed yet
+    are stored as such and read when a loaded Render asks for them, like aovs
+    without exr files. Stub renders are stored as stubs.
+
+    Args:
+        renders_by_role (dict): collector result, see collect_render_layers_by_role.
+        file_path (str): snapshot file, replaced atomically.
+    """
+    strings = _StringTable()
+    runs = array('q')
+    references = array('I')
+    renders, aovs = [], []
+
+    for render in (r for layers in renders_by_role.values() for r in layers):
+        first_aov, aov_count = len(aovs), NONE
+        first_reference, reference_count, user = len(references), 0, NONE
+
+        if render.is_resolved():
+            aov_count = len(render.aovs())
+            for aov_name in render.aovs():
+                aovs.append(_pack_aov(render, aov_name, strings, runs))
+
+            if render.info_loaded():
+                info = render.info() or {}
+                user = strings.add(info.get('user'))
+                abc_versions = info.get('abc_versions', [])
+                references.extend(strings.add(abc) for abc in abc_versions)
+                reference_count = len(abc_versions)
+            else:
+                reference_count = NONE
+
+        renders.append(
+            RENDER.pack(
+                strings.add(render.name()),
+                strings.add(render.path()),
+                user,
+                first_reference,
+                reference_count,
+                first_aov,
+                aov_count,
+            )
+        )
+
+    flags = 0
+    if isinstance(renders_by_role, ScanResult):
+        path = renders_by_role.path
+        pending = renders_by_role.pending()
+        if not renders_by_role.listed:
+            flags |= NOT_LISTED
+    else:
+        path, pending = '', []
+
+    names = list(
+        dict.fromkeys(r.name() for layers in renders_by_role.values() for r in layers)
+    )
+    layers = array('I', [strings.add(name) for name in names + pending])
+    path_id = strings.add(path)
+
+    encoded = [value.encode('utf-8') for value in strings.strings]
+    offsets = array('I', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        _BYTE_ORDERS[sys.byteorder],
+        flags,
+        len(encoded),
+        len(renders),
+        len(aovs),
+        len(references),
+        len(runs),
+        len(names),
+        len(pending),
+        path_id,
+    )
+
+    temp_path = f'{file_path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(_little(offsets))
+        f.write(b''.join(encoded))
+        f.write(b'\0' * (-f.tell() % 8))
+        # native order, byte swapped on load only if the order does not match
+        f.write(runs.tobytes())
+        f.write(b''.join(renders))
+        f.write(b''.join(aovs))
+        f.write(_little(references))
+        f.write(_little(layers))
+    os.replace(temp_path, file_path)
+
+    log.debug(f'Snapshot saved: {file_path}, {len(renders)} renders, {len(aovs)} aovs')
+
+
+def _pack_aov(
+    render: Render, aov_name: str, strings: _StringTable, runs: array
+) -> bytes:
+    """Return the aov record of a render, adding its frame runs to runs."""
+    if not render.frame_set_loaded(aov_name):
+        return AOV.pack(strings.add(aov_name), NONE, NONE, 0, 0, 0)
+
+    try:
+        frame_set = render.frame_set(aov_name)
+    except OSError:
+        return AOV.pack(strings.add(aov_name), NONE, NONE, 0, 0, 0)
+
+    first = len(runs)
+    for start, end in frame_set.ranges():
+        runs.extend((start, end))
+
+    return AOV.pack(
+        strings.add(aov_name),
+        strings.add(frame_set.name),
+        strings.add(frame_set.extension),
+        frame_set.padding,
+        first,
+        len(runs) - first,
+    )
+
+
+def load_snapshot(file_path: str) -> ScanResult:
+    """Load a scan snapshot written by save_snapshot.
+
+    The file is memory mapped while it is read and closed before returning, so
+    a later save_snapshot can replace it. Frame runs are copied in one block,
+    nothing is read from disk until a Render asks for an aov without frame set.
+
+    Args:
+        file_path (str): snapshot file.
+    Returns:
+        ScanResult: renders by role, like collect_render_layers_by_role.
+    Raises:
+        ValueError: the file is not a snapshot or has another format version.
+    """
+    # slices of the map are bytes copies, no buffer outlives the with block
+    with open(file_path, 'rb') as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        if len(data) < HEADER.size or data[:4] != MAGIC:
+            raise ValueError(f'Not a RenderManager2 snapshot: {file_path}')
+
+        (
+            _,
+            version,
+            byte_order,
+            flags,
+            string_count,
+            render_count,
+            aov_count,
+            reference_count,
+            run_count,
+            name_count,
+            pending_count,
+            path_id,
+        ) = HEADER.unpack_from(data)
+
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported snapshot version {version}: {file_path}')
+
+        position = HEADER.size
+        offsets = _read_ints(data, position, string_count + 1)
+        position += (string_count + 1) * 4
+        blob = data[position : position + offsets[-1]]
+        strings = [
+            str(blob[offsets[i] : offsets[i + 1]], 'utf-8') for i in range(string_count)
+        ]
+        position += offsets[-1]
+        position += -position % 8
+
+        runs = array('q')
+        runs.frombytes(data[position : position + run_count * 8])
+        if byte_order != _BYTE_ORDERS[sys.byteorder]:
+            runs.byteswap()
+        position += run_count * 8
+
+        size = render_count * RENDER.size
+        render_records = list(RENDER.iter_unpack(data[position : position + size]))
+        position += size
+        size = aov_count * AOV.size
+        aov_records = list(AOV.iter_unpack(data[position : position + size]))
+        position += size
+        references = _read_ints(data, position, reference_count)
+        position += reference_count * 4
+        layer_ids = _read_ints(data, position, name_count + pending_count)
+
+    layers = [strings[i] for i in layer_ids]
+    result = ScanResult(strings[path_id], layers, listed=not flags & NOT_LISTED)
+    renders_by_name = {}
+    for record in render_records:
+        render = _unpack_render(strings, runs, aov_records, references, record)
+        renders_by_name.setdefault(render.name(), []).append(render)
+
+    for name in layers[:name_count]:
+        result.add_layer(name, renders_by_name.get(name, []))
+
+    return result
+
+
+def _unpack_render(
+    strings: List[str], runs, aov_records: list, references: array, record: tuple
+) -> Render:
+    """Return the Render of a render record."""
+    name, path, user, first_reference, reference_count, first_aov, aov_count = record
+    if aov_count == NONE:
+        return Render(path=strings[path], name=strings[name], aovs=None, info_json=None)
+
+    aovs, frame_sets = [], {}
+    for aov in aov_records[first_aov : first_aov + aov_count]:
+        aov_name, sequence, extension, padding, first, count = aov
+        aovs.append(strings[aov_name])
+        if sequence != NONE:
+            frame_sets[strings[aov_name]] = FrameSet.from_runs(
+                strings[sequence],
+                strings[extension],
+                runs[first : first + count],
+                padding,
+            )
+
+    if reference_count == NONE:
+        info_json = partial(load_user_and_reference, strings[path])
+    else:
+        last_reference = first_reference + reference_count
+        info_json = {
+            'abc_versions': [
+                strings[i] for i in references[first_reference:last_reference]
+            ]
+        }
+        if user != NONE:
+            info_json['user'] = strings[user]
+
+    return Render(
+        path=strings[path],
+        name=strings[name],
+        aovs=aovs,
+        info_json=info_json,
+        frame_sets=frame_sets,
+    )
+
+
+def _little(values: array) -> bytes:
+    """Return the bytes of an unsigned int array in little endian order."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_ints(data: mmap.mmap, position: int, count: int) -> array:
+    """Read count little endian unsigned ints."""
+    values = array('I')
+    values.frombytes(data[position : position + count * 4])
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
@@ -75,10 +75,15 @@ class RenderManager(QtWidgets.QMainWindow):
         """UI Reset."""
         log.info(' '.join([app_name, version]))
         self.setWindowTitle(f'{app_name} [{self.session.project_name()}]')
-        self.refresh()
+        self.refresh(force=True)
 
-    def refresh(self):
-        """Refresh the UI and update the render path."""
+    def refresh(self, force: bool = False):
+        """Refresh the UI and update the render path.
+
+        Args:
+            force (bool, optional): scan every render layer again, by default
+                only the layers whose folders changed are scanned.
+        """
         self._path = 'not set'
         self.ui.cbox_shot.clear()
         self.ui.cbox_shot.addItem('Not in Context')
@@ -110,7 +115,7 @@ class RenderManager(QtWidgets.QMainWindow):
         # if self.path():
         #    self.controller.reset_db(self.path())
 
-        self.controller.reset_db(self.path())
+        self.controller.reset_db(self.path(), force)
 
     def path(self):
         """Returns render path for current shot."""
@@ -118,6 +123,7 @@ class RenderManager(QtWidgets.QMainWindow):
 
     def closeEvent(self, event):
         """Final close event method."""
+        self.controller.cancel_scan()
         self.loggers.close()
         self.close()
 
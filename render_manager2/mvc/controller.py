@@ -3,23 +3,37 @@
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
 import json
+import time
 
 try:
-    from PySide2.QtWidgets import QMainWindow
+    from PySide2.QtCore import QThreadPool
+    from PySide2.QtWidgets import (
+        QHBoxLayout,
+        QMainWindow,
+        QProgressBar,
+        QPushButton,
+    )
 
     PYSIDE_VERSION = 2
 except ImportError:
-    from PySide6.QtWidgets import QMainWindow
+    from PySide6.QtCore import QThreadPool
+    from PySide6.QtWidgets import (
+        QHBoxLayout,
+        QMainWindow,
+        QProgressBar,
+        QPushButton,
+    )
 
     PYSIDE_VERSION = 6
-from backpack.cache import timed_lru_cache
-from backpack.test_utils import time_function_decorator
 from qt_log.stream_log import get_stream_logger
 
-from RenderManager2.render_manager2.core.disk_collector import (
-    collect_render_layers_by_role,
-)
+from RenderManager2.render_manager2.core.async_collector import CancelToken
+from RenderManager2.render_manager2.core.scan_cache import ScanCache
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.mvc.libs.scan_worker import ScanWorker
 from RenderManager2.render_manager2.mvc.view import RendersView
+from RenderManager2.render_manager2.render.libs.create import Create
 
 log = get_stream_logger('RenderManager2 - Controller')
 
@@ -34,13 +48,50 @@ class Controller:
         self.parent = parent
         self.ui = parent.ui
         self.view = RendersView(self, self.ui, self.ui.table_view)
+        self.index = ScanIndex()
+        self.scan_cache = ScanCache()
+        self._renders = {}
+
+        # background scans, a single one runs at a time
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self._generation = 0
+        self._token = CancelToken()
+        self._worker = None
+        self._scan_start = 0.0
 
         log.debug(f'Parent: {self.parent}')
 
+        self._set_scan_widgets()
+
         # signal connections
         self.ui.btn_import.clicked.connect(self.load_callback)
         self.ui.btn_remove.clicked.connect(self.remove_callback)
 
+    def _set_scan_widgets(self):
+        """Adds busy indicator and cancel actions of the background scan."""
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setRange(0, 0)
+        self.scan_progress.setTextVisible(False)
+        self.scan_progress.setMaximumHeight(12)
+        self.btn_cancel_scan = QPushButton('Cancel Scan')
+        self.btn_cancel_scan.clicked.connect(self.cancel_scan)
+
+        scan_layout = QHBoxLayout()
+        scan_layout.addWidget(self.scan_progress)
+        scan_layout.addWidget(self.btn_cancel_scan)
+        self.ui.log_layout.insertLayout(0, scan_layout)
+
+        self.mnu_cancel_scan = self.ui.menuMenu.addAction('Cancel Scan')
+        self.mnu_cancel_scan.triggered.connect(self.cancel_scan)
+        self._set_busy(False)
+
+    def _set_busy(self, busy: bool):
+        """Shows or hides the scan busy indicator."""
+        self.scan_progress.setVisible(busy)
+        self.btn_cancel_scan.setVisible(busy)
+        self.mnu_cancel_scan.setEnabled(busy)
+
     def renders(self):
         """Get the list of renders.
 
@@ -50,13 +101,75 @@ class Controller:
 
         return self._renders
 
-    @time_function_decorator
-    @timed_lru_cache(seconds=30)
-    def reset_db(self, path):
-        """Clear find cache for shaders."""
+    def reset_db(self, path, force=False):
+        """Scan renders of a shot in background, the view fills in as layers arrive.
+
+        A running scan is cancelled and its results are dropped. Only render
+        layers whose folders changed since the last scan are read again, the
+        others keep their previous renders.
+
+        Args:
+            path (str): shot render path.
+            force (bool, optional): scan every render layer, ignoring the caches.
+        """
         log.process('Reloading Renders....')
-        self._renders = collect_render_layers_by_role(path)
-        self.view.update_view(self.renders())
+        self._token.cancel()
+        self._generation += 1
+        self._token = CancelToken()
+
+        if not isinstance(self._renders, ScanResult) or self._renders.path != path:
+            self._renders = ScanResult(path)
+            self.view.update_view(self._renders)
+
+        self._worker = ScanWorker(
+            path,
+            self._generation,
+            self.index,
+            self._token,
+            cache=self.scan_cache,
+            force=force,
+        )
+        self._worker.signals.listed.connect(self._on_scan_listed)
+        self._worker.signals.batch.connect(self._on_scan_batch)
+        self._worker.signals.finished.connect(self._on_scan_finished)
+        self._set_busy(True)
+        self._scan_start = time.perf_counter()
+        self.thread_pool.start(self._worker)
+
+    def cancel_scan(self):
+        """Cancel the running scan, renders already received are kept."""
+        if not self._token.cancelled():
+            log.warning('Cancelling render scan...')
+        self._token.cancel()
+
+    def _on_scan_listed(self, generation: int, names: list):
+        """Registers the render layers of the shot, so batches keep their order."""
+        if generation != self._generation:
+            return
+
+        self._renders.add_pending(names)
+
+    def _on_scan_batch(self, generation: int, name: str, renders: list):
+        """Adds the renders of a scanned layer to the view."""
+        if generation != self._generation:
+            return
+
+        self._renders.add_layer(name, renders)
+        self.view.update_view(self._renders)
+
+    def _on_scan_finished(self, generation: int, result: dict):
+        """Replaces the renders with the complete scan, if it is the latest one."""
+        if generation != self._generation:
+            return
+
+        self._set_busy(False)
+        self._worker = None
+        if result is None:
+            return
+
+        self._renders = result
+        self.view.update_view(self._renders)
+        log.done(f'Renders reloaded in {time.perf_counter() - self._scan_start:.2f}s.')
 
     # ------------------------------------------------------------------------------------
     # ASSETS CALLBACKS
@@ -76,16 +189,8 @@ class Controller:
             log.warning('Nothing Selected!')
             return
 
-        counter, count_max = 1, len(selection)
-        for render in selection:
-            log.process(
-                f'Loading: {render.name()}_{render.version()} ({counter} of {count_max})'
-            )
-
-            # if render.status() != SYNC.value:
-            render.load()
-
-            counter += 1
+        log.process(f'Loading {len(selection)} Render Layers...')
+        Create().load_all(selection)
 
         log.done('RenderLayers loaded.')
         self.parent.refresh()
@@ -30,9 +30,12 @@ except ImportError:
     PYSIDE_VERSION = 6
 
 from qt_log.stream_log import get_stream_logger
+from RenderManager2.render_manager2.core.disk_collector import resolve_versions
 from RenderManager2.render_manager2.core.dl_collector_job.libs.render.render_layer import (
     Render,
 )
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.render.tokens import SCAN_WORKERS
 
 log = get_stream_logger('RenderManager - EditRenderDialog')
 
@@ -100,6 +103,7 @@ class EditRenderDialog(QDialog):
         all_renders (dict[str, list[Render]]): Dictionary containing all available
             renders organized by role, where each role maps to a list of Render objects.
         parent (QWidget, optional): Parent widget for the dialog. Defaults to None.
+        index (ScanIndex, optional): scan index used to resolve stub versions.
 
     Attributes:
         render (Render): The currently selected render object.
@@ -112,17 +116,25 @@ class EditRenderDialog(QDialog):
         select_version(): Confirms the selected version and closes the dialog.
     """
 
-    def __init__(self, render: Render, all_renders: dict[str, list[Render]], parent=None):
+    def __init__(
+        self,
+        render: Render,
+        all_renders: dict[str, list[Render]],
+        parent=None,
+        index: ScanIndex = None,
+    ):
         """Inicializa el diálogo de edición de render.
 
         Args:
             render (Render): El objeto Render actual para el cual se buscan versiones.
             all_renders (dict[str, list[Render]]): Diccionario que contiene todos los renders disponibles organizados por rol.
             parent (QWidget, optional): Widget padre para el diálogo. Por defecto es None.
+            index (ScanIndex, optional): Índice de escaneo para resolver versiones stub.
         """
         super().__init__(parent)
         self.render = render
         self.all_renders = all_renders
+        self.index = index
         self.selected_version = None
 
         self.setWindowTitle(f'Select Version for: {render.name()}')
@@ -182,17 +194,10 @@ class EditRenderDialog(QDialog):
 
     def load_versions(self):
         """Cargar todas las versiones del mismo render."""
-        same_name_renders = []
-
-        # Iterar sobre la estructura de diccionario con roles
-        for rol in self.all_renders.keys():
-            for layer in self.all_renders[rol]:
-                # Filtrar layers con el mismo nombre
-                if layer.name() == self.render.name():
-                    same_name_renders.append(layer)
-
-        # Ordenar por versión (más alta primero)
-        same_name_renders.sort(key=lambda x: x.int_version(), reverse=True)
+        # Resolver en bloque las versiones stub, ordenadas (más alta primero)
+        same_name_renders = resolve_versions(
+            self.all_renders, self.render.name(), SCAN_WORKERS, self.index
+        )
 
         # Crear y asignar modelo
         self.model = VersionTableModel(same_name_renders)
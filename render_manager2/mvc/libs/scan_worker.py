@@ -0,0 +1,175 @@
+# ----------------------------------------------------------------------------------------
+# RenderManager Nuke - Background Shot Scan Worker
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+try:
+    from PySide2.QtCore import QObject, QRunnable, Signal
+
+    PYSIDE_VERSION = 2
+except ImportError:
+    from PySide6.QtCore import QObject, QRunnable, Signal
+
+    PYSIDE_VERSION = 6
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.async_collector import (
+    CANCEL_POLL_SECONDS,
+    CancelToken,
+)
+from RenderManager2.render_manager2.core.disk_collector import collect_render_layer
+from RenderManager2.render_manager2.core.disk_walker import scan_dir, sort_render_layers
+from RenderManager2.render_manager2.core.scan_cache import ScanCache, layer_signature
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.core.scan_service import request_scan
+from RenderManager2.render_manager2.render.tokens import SCAN_WORKERS
+
+log = get_stream_logger('RenderManager2 - ScanWorker')
+
+
+class ScanSignals(QObject):
+    """Signals of a ScanWorker, all of them carry the scan generation.
+
+    listed: generation and the render layer names of the shot, in collector order.
+    batch: generation, render layer name and its Render objects.
+    finished: generation and the complete ScanResult, None if cancelled.
+    """
+
+    listed = Signal(int, object)
+    batch = Signal(int, str, object)
+    finished = Signal(int, object)
+
+
+class ScanWorker(QRunnable):
+    def __init__(
+        self,
+        path: str,
+        generation: int,
+        index: ScanIndex = None,
+        token: CancelToken = None,
+        cache: ScanCache = None,
+        force: bool = False,
+    ) -> None:
+        """Scan a shot on a QThreadPool thread, sending each render layer when ready.
+
+        The scan of the local service is used when it is running, otherwise
+        render layers are scanned on SCAN_WORKERS threads and each one is sent
+        as soon as it is ready. Layer names are sent first in collector order,
+        so receivers can keep that order, see ScanResult.add_pending. With a
+        cache only the layers whose folders changed are scanned and sent, the
+        rest are taken from the cache. Receivers should drop results of an
+        older generation.
+
+        Args:
+            path (str): shot render path.
+            generation (int): refresh number, sent back with every signal.
+            index (ScanIndex, optional): persistent index of previous scans.
+            token (CancelToken, optional): stops the scan, render layers still
+                running are dropped.
+            cache (ScanCache, optional): render layers of previous scans.
+            force (bool, optional): scan every render layer, ignoring the caches
+                and reading every folder from disk.
+        """
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.index = index
+        self.token = token or CancelToken()
+        self.cache = cache
+        self.force = force
+        self.signals = ScanSignals()
+
+    def run(self) -> None:
+        """Scan the shot and emit its render layers."""
+        try:
+            result = self._scan()
+        except Exception as e:
+            log.error(f'Error scanning {self.path}: {e}')
+            result = None
+
+        if self.token.cancelled():
+            log.info(f'Scan cancelled: {self.path}')
+            result = None
+
+        self.signals.finished.emit(self.generation, result)
+
+    def _scan(self) -> ScanResult:
+        """Return the scan result, emitting batch for every scanned render layer."""
+        # shared scan of the local service, sent in a single batch
+        result = request_scan(self.path, self.force, token=self.token)
+        if result is not None:
+            return result
+
+        index = self.index
+        if index is not None and self.force:
+            # reload from disk, even folders whose mtime did not change
+            index = index.rescan()
+
+        read_dir = index.scan_dir if index is not None else scan_dir
+        root = read_dir(self.path)
+        if root is None:
+            log.warning(f'Path does not exist: {self.path}')
+            return ScanResult(self.path)
+
+        result = ScanResult(self.path, sort_render_layers(root.dirs))
+        names = result.pending()
+        self.signals.listed.emit(self.generation, names)
+
+        layers = {}
+        if self.cache is not None:
+            if self.force:
+                self.cache.invalidate(self.path)
+            for name in names:
+                signature = layer_signature(f'{self.path}/{name}')
+                renders = self.cache.get(self.path, name, signature)
+                layers[name] = (signature, renders)
+                if renders is not None:
+                    result.add_layer(name, renders)
+
+        changed = result.pending()
+        log.debug(f'Render layers to scan: {len(changed)} of {len(names)}')
+
+        executor = ThreadPoolExecutor(
+            max_workers=max(SCAN_WORKERS, 1), thread_name_prefix='RenderManager2Scan'
+        )
+        futures = {
+            executor.submit(
+                collect_render_layer,
+                self.path,
+                name,
+                index=index,
+                latest_only=True,
+                defer_info=True,
+            ): name
+            for name in changed
+        }
+
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(
+                    pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED
+                )
+                if self.token.cancelled():
+                    return None
+
+                # completion order, the result keeps the collector order
+                for future in done:
+                    name = futures[future]
+                    renders = future.result()
+                    result.add_layer(name, renders)
+                    if name in layers:
+                        layers[name] = (layers[name][0], renders)
+                    self.signals.batch.emit(self.generation, name, renders)
+        finally:
+            # layers still running when cancelled finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.index is not None:
+            self.index.commit()
+        if self.cache is not None:
+            self.cache.store(self.path, layers)
+
+        return result
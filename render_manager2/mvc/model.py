@@ -3,38 +3,135 @@
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
 try:
-    from PySide2.QtCore import QAbstractTableModel, Qt
+    from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
     from PySide2.QtGui import QColor
     from PySide2.QtWidgets import QMainWindow
 
     PYSIDE_VERSION = 2
 except ImportError:
-    from PySide6.QtCore import QAbstractTableModel, Qt
+    from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
     from PySide6.QtGui import QColor
     from PySide6.QtWidgets import QMainWindow
 
     PYSIDE_VERSION = 6
+from collections import namedtuple
+
 from qt_log.stream_log import get_stream_logger
 
 from RenderManager2.render_manager2.mvc.config import MODEL_DATA, MODEL_DISPLAYROLE
+from RenderManager2.render_manager2.render.libs.scene_index import SCENE_INDEX
+from RenderManager2.render_manager2.render.render_layer import Render
 
 log = get_stream_logger('RenderManager2 - Model')
 
 
+# cached data of one table row, one value per column for each role
+table_row = namedtuple('table_row', ['display', 'foreground', 'tooltip'])
+
+
 class RenderTableModel(QAbstractTableModel):
     # colors for status text: red, yellow, green
     STATUS_COLOR = [QColor(255, 100, 100), QColor(0, 250, 250), QColor(20, 250, 20)]
+    DEFAULT_COLOR = QColor(230, 230, 230)
+
+    # name column aligned left, the rest centered
+    ALIGNMENT = [Qt.AlignLeft | Qt.AlignVCenter]
+    ALIGNMENT += [Qt.AlignCenter] * (len(MODEL_DATA) - 1)
 
     def __init__(self, parent: QMainWindow, renders: dict, *args):  # noqa: D417
         """Initialize the render table model.
 
+        Row values are computed once per render and kept until the renders are
+        replaced, invalidate() is called or the scene backdrops change.
+
         Args:
             parent (QMainWindow): parent widget for the model.
             renders (dict): dictionary of render objects to display in the table.
         """
         QAbstractTableModel.__init__(self, parent, *args)
+        self._rows = {}
+        self._scene_generation = SCENE_INDEX.generation
         self.renders = renders
 
+    @property
+    def renders(self) -> list:
+        """Renders shown by the table, one per row."""
+        return self._renders
+
+    @renders.setter
+    def renders(self, renders: list) -> None:
+        self._renders = list(renders)
+        self.invalidate()
+
+    def set_renders(self, renders: list) -> None:
+        """Replace the renders notifying only the rows that changed.
+
+        Rows are matched by render_key, missing ones are removed and new ones
+        inserted. Kept rows are compared by row_state, which never reads the
+        disk nor loads the deferred render info, rows whose state differs emit
+        dataChanged and their values are computed when a view asks for them.
+        Selection and scroll position of the views are kept. If the kept rows
+        changed their order, the model is reset instead.
+
+        Args:
+            renders (list): new renders, one per row.
+        """
+        new_keys = {render_key(render) for render in renders}
+        removed = [
+            row
+            for row, render in enumerate(self._renders)
+            if render_key(render) not in new_keys
+        ]
+        for first, last in reversed(_row_blocks(removed)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for render in self._renders[first : last + 1]:
+                self._rows.pop(render, None)
+            del self._renders[first : last + 1]
+            self.endRemoveRows()
+
+        current_keys = {render_key(render) for render in self._renders}
+        inserted = [
+            row
+            for row, render in enumerate(renders)
+            if render_key(render) not in current_keys
+        ]
+        for first, last in _row_blocks(inserted):
+            self.beginInsertRows(QModelIndex(), first, last)
+            self._renders[first:first] = renders[first : last + 1]
+            self.endInsertRows()
+
+        if [render_key(r) for r in self._renders] != [render_key(r) for r in renders]:
+            log.debug('Render order changed, resetting model.')
+            self.beginResetModel()
+            self.renders = renders
+            self.endResetModel()
+            return
+
+        last_column = len(MODEL_DATA) - 1
+        for row, render in enumerate(renders):
+            previous = self._renders[row]
+            if previous is render:
+                continue
+
+            self._renders[row] = render
+            old_values = self._rows.pop(previous, None)
+            if row_state(previous) == row_state(render):
+                if old_values is not None:
+                    self._rows[render] = old_values
+                continue
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def invalidate(self, render: Render = None) -> None:
+        """Forget cached row values, of one render or of all rows.
+
+        Args:
+            render (Render, optional): render whose row changed, all rows if None.
+        """
+        if render is None:
+            self._rows.clear()
+        else:
+            self._rows.pop(render, None)
+
     def rowCount(self, parent):  # noqa: N802
         """Returns the number of rows in the model."""
         return len(self.renders)
@@ -50,58 +147,100 @@ class RenderTableModel(QAbstractTableModel):
 
         # align role
         if role == Qt.TextAlignmentRole:
-            # Alineación específica por columna
-            if index.column() == 0:  # Columna del nombre
-                return Qt.AlignLeft | Qt.AlignVCenter
-            else:  # Resto de columnas
-                return Qt.AlignCenter
+            return self.ALIGNMENT[index.column()]
 
-        render = self.renders[index.row()]
+        if role == Qt.DisplayRole:
+            return self._row(index.row()).display[index.column()]
 
         # ColorRole for Sync Status and Render Roles
         if role == Qt.ForegroundRole:
-            # Status column gets specific status colors
-            if index.column() == 4:
-                return self.STATUS_COLOR[render.status()]
-            return QColor(230, 230, 230)
+            return self._row(index.row()).foreground[index.column()]
 
         # ToolTip role for ABC versions column
         if role == Qt.ToolTipRole:
-            if index.column() == 6:  # ABC versions column
-                abc_versions = render.abc_version_from_backdrop()
-                if abc_versions == 'Not Found':
-                    return 'Not Found'
-                if abc_versions:
-                    tooltip_text = 'ABC Versions:\n' + '\n'.join(
-                        [f'• {version}' for version in abc_versions]
-                    )
-                    return tooltip_text
-                else:
-                    return 'Not Found'
-            return None
+            return self._row(index.row()).tooltip[index.column()]
 
-        # display role filter
-        if role != Qt.DisplayRole:
-            return None
+        return None
+
+    def _row(self, row: int) -> table_row:
+        """Return the cached values of a row, computing them on first access."""
+        if self._scene_generation != SCENE_INDEX.generation:
+            self._scene_generation = SCENE_INDEX.generation
+            self._rows.clear()
+
+        render = self.renders[row]
+        if render not in self._rows:
+            self._rows[render] = self._compute_row(render)
+        return self._rows[render]
+
+    def _compute_row(self, render: Render) -> table_row:
+        """Return display, color and tooltip values of all columns of a render."""
+        abc = render.abc_version_from_backdrop()
 
         # render object data
         column_data = dict(MODEL_DISPLAYROLE)
         column_data[0] = render.name()
         column_data[1] = f'v00{render.version_from_read()}'
-        column_data[2] = (
-            f'v00{render.int_version()}'  # Mostrar la versión actual del render, no la cargada en Nuke            render.int_version()
-        )
+        # Mostrar la versión actual del render, no la cargada en Nuke
+        column_data[2] = f'v00{render.int_version()}'
         nrange, _ = render.ranges_from_read()
         column_data[3] = nrange
         column_data[4] = render.status_text()
         column_data[5] = render.user()
-        abc = render.abc_version_from_backdrop()
         column_data[6] = 'Not found.' if abc == 'Not Found' else ', '.join(abc)
 
-        return column_data[index.column()]
+        # Status column gets specific status colors
+        foreground = [self.DEFAULT_COLOR] * len(MODEL_DATA)
+        foreground[4] = self.STATUS_COLOR[render.status()]
+
+        tooltip = [None] * len(MODEL_DATA)
+        if abc != 'Not Found' and abc:
+            tooltip[6] = 'ABC Versions:\n' + '\n'.join(
+                [f'• {version}' for version in abc]
+            )
+        else:
+            tooltip[6] = 'Not Found'
+
+        return table_row(
+            display=tuple(column_data[column] for column, _, _ in MODEL_DATA),
+            foreground=tuple(foreground),
+            tooltip=tuple(tooltip),
+        )
 
     def headerData(self, col, orientation, role):  # noqa: N802
         """Returns the header data for a given column and role."""
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
             return MODEL_DATA[col][1]
         return None
+
+
+def render_key(render: Render) -> tuple:
+    """Return the identity of a table row, layer name and version."""
+    return render.name(), render.int_version()
+
+
+def row_state(render: Render) -> tuple:
+    """Return the render values of a row held in memory, no info json, no listing.
+
+    Frames are part of the state only if the frame set of the first aov was
+    already loaded or listed by the scan, the diff runs on the main thread.
+    """
+    aovs = render.aovs()
+    frames = None
+    if aovs and render.frame_set_loaded(aovs[0]):
+        try:
+            frames = render.frames()
+        except OSError:
+            pass
+    return render_key(render) + (render.path(), tuple(aovs or ()), frames)
+
+
+def _row_blocks(rows: list) -> list:
+    """Return sorted row numbers grouped in (first, last) contiguous blocks."""
+    blocks = []
+    for row in rows:
+        if blocks and blocks[-1][1] == row - 1:
+            blocks[-1][1] = row
+        else:
+            blocks.append([row, row])
+    return blocks
@@ -21,6 +21,7 @@ from CG_Template.cg_template.libs.create_init_constant import create_init_consta
 from CG_Template.cg_template.main import run
 from qt_log.stream_log import get_stream_logger
 
+from RenderManager2.render_manager2.core.scan_result import ScanResult
 from RenderManager2.render_manager2.mvc.config import MODEL_DATA
 from RenderManager2.render_manager2.mvc.libs.edit_render_dialog import (
     EditRenderDialog,
@@ -54,10 +55,14 @@ class RendersView:
             self.table_view.setColumnWidth(index, width)
 
     def update_view(self, renders: dict):
-        """Main update method for this view."""
-        self.table_view.clearSelection()
-        self.model.renders = self.get_last_version(renders)
-        self.model.layoutChanged.emit()
+        """Main update method for this view.
+
+        Only rows whose render layer or version changed are updated, the
+        selection and scroll position are kept.
+        """
+        self.model.set_renders(self.get_last_version(renders))
+        # kept rows may show new scene data, eg: after loading a layer
+        self.table_view.viewport().update()
 
     def update_render_in_view(self, old_render, new_render):
         """Update a specific render in the view without reloading all data."""
@@ -66,6 +71,7 @@ class RendersView:
             if render.name() == old_render.name():
                 # Replace the old render with the new one
                 self.model.renders[i] = new_render
+                self.model.invalidate(old_render)
 
                 # Notify the model that this specific row has changed
                 top_left = self.model.index(i, 0)
@@ -144,7 +150,9 @@ class RendersView:
         """Abrir diálogo para seleccionar versión sin modificar el render original."""
 
         log.debug(f'OPENING DIALOG: Original render version: {render.int_version()}')
-        dialog = EditRenderDialog(render, self.parent.renders(), None)
+        dialog = EditRenderDialog(
+            render, self.parent.renders(), None, index=self.parent.index
+        )
         if dialog.exec_() == QDialog.Accepted:
             # Aplicar cambios de forma segura DESPUÉS de cerrar el diálogo
             success, selected_render = dialog.apply_changes_safely()
@@ -238,7 +246,10 @@ class RendersView:
               highest version number is included in the result
             - Handles edge case where current_latest might be a list (though
               this shouldn't normally occur)
+            - A ScanResult answers from its version index without looping
         """
+        if isinstance(renders, ScanResult):
+            return renders.latest_versions()
 
         latest_renders = {}
 
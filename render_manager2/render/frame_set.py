@@ -0,0 +1,158 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Frame Set for image sequences
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import re
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+# sequence file name, eg: RND_FG_BTY_beauty_1001.exr
+SEQUENCE_FILE = re.compile(r'^(?P<name>.+)_(?P<frame>\d+)\.(?P<extension>[^.]+)$')
+
+
+class FrameSet:
+    def __init__(
+        self, name: str, extension: str, frames: Iterable[int], padding: int = 4
+    ) -> None:
+        """Sorted frames of an image sequence stored as runs of consecutive frames.
+
+        Args:
+            name (str): file name without frame and extension, eg: RND_FG_BTY_beauty
+            extension (str): file extension, eg: exr
+            frames (Iterable[int]): frame numbers in any order, duplicates are ignored.
+            padding (int): number of digits of the frame numbers.
+        """
+        self.name = name
+        self.extension = extension
+        self.padding = padding
+
+        # flat array of (start, end) pairs, both inclusive
+        self._runs = array('q')
+        self._count = 0
+        for frame in sorted(set(frames)):
+            if self._runs and frame == self._runs[-1] + 1:
+                self._runs[-1] = frame
+            else:
+                self._runs.extend((frame, frame))
+            self._count += 1
+
+    @classmethod
+    def from_files(cls, files: Iterable[str], extension: str = 'exr') -> 'FrameSet':
+        """Build a frame set from the file names of a folder, in a single pass.
+
+        Files of other sequences or extensions are skipped, the sequence is taken
+        from the first matching file.
+
+        Args:
+            files (Iterable[str]): file names in any order.
+            extension (str): extension of the sequence files.
+        Returns:
+            FrameSet: the sequence, None if no file matches.
+        """
+        name, padding, frames = None, None, []
+        for file in files:
+            match = SEQUENCE_FILE.match(file)
+            if not match or match['extension'] != extension:
+                continue
+
+            if name is None:
+                name = match['name']
+            elif match['name'] != name:
+                continue
+
+            frame = match['frame']
+            padding = len(frame) if padding is None else min(padding, len(frame))
+            frames.append(int(frame))
+
+        if name is None:
+            return None
+
+        return cls(name, extension, frames, padding)
+
+    @classmethod
+    def from_runs(
+        cls, name: str, extension: str, runs: Sequence[int], padding: int = 4
+    ) -> 'FrameSet':
+        """Build a frame set from already sorted runs, without copying them.
+
+        Args:
+            name (str): file name without frame and extension.
+            extension (str): file extension.
+            runs (Sequence[int]): flat (start, end) pairs, eg: an array('q') of
+                a scan snapshot.
+            padding (int): number of digits of the frame numbers.
+        """
+        frame_set = cls(name, extension, (), padding)
+        frame_set._runs = runs
+        frame_set._count = sum(runs[1::2]) - sum(runs[::2]) + len(runs) // 2
+        return frame_set
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.ranges():
+            yield from range(start, end + 1)
+
+    def __contains__(self, frame: int) -> bool:
+        # index of the last run start <= frame
+        position = bisect_right(self._runs[::2], frame) - 1
+        return position >= 0 and frame <= self._runs[position * 2 + 1]
+
+    def __str__(self) -> str:
+        runs = []
+        for start, end in self.ranges():
+            run = self.format(start)
+            if end != start:
+                run += f'-{self.format(end)}'
+            runs.append(run)
+        return ','.join(runs)
+
+    def __repr__(self) -> str:
+        return f'FrameSet({self.name}.{self.extension} [{self}])'
+
+    @property
+    def first(self) -> int:
+        """Return the first frame."""
+        return self._runs[0]
+
+    @property
+    def last(self) -> int:
+        """Return the last frame."""
+        return self._runs[-1]
+
+    def format(self, frame: int) -> str:
+        """Return a frame number with the sequence padding.
+
+        Example:
+            '1001'
+        """
+        return f'{frame:0{self.padding}d}'
+
+    def frame_range(self) -> str:
+        """Return the first to last frame range, gaps included.
+
+        Example:
+            '1001-1020'
+        """
+        return f'{self.format(self.first)}-{self.format(self.last)}'
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Return runs of consecutive frames as (start, end) pairs."""
+        return list(zip(self._runs[::2], self._runs[1::2]))
+
+    def gaps(self) -> List[Tuple[int, int]]:
+        """Return missing frame runs between first and last as (start, end) pairs."""
+        return [
+            (self._runs[i] + 1, self._runs[i + 1] - 1)
+            for i in range(1, len(self._runs) - 1, 2)
+        ]
+
+    def missing(self) -> List[int]:
+        """Return missing frame numbers between first and last."""
+        return [frame for start, end in self.gaps() for frame in range(start, end + 1)]
+
+    def is_complete(self) -> bool:
+        """Return True if there are no missing frames between first and last."""
+        return len(self._runs) == 2
@@ -2,14 +2,29 @@
 # ACME RenderManager Nuke - CreateRead for RenderLayer
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
+from typing import List
+
 from qt_log.stream_log import get_stream_logger
 
 from RenderManager2.render_manager2.render.libs.helpers.backdrops import (
+    BackdropState,
     create_backdrop_container,
     create_backdrop_subcontainer,
+    create_container,
+    delete_subcontainers,
     get_next_row_container,
     get_next_row_subcontainer,
+    plan_layers,
+    replace_subcontainer,
+    restore_connections,
+)
+from RenderManager2.render_manager2.render.libs.helpers.config import CREATE_ENGINE
+from RenderManager2.render_manager2.render.libs.helpers.layout import plan_layout
+from RenderManager2.render_manager2.render.libs.helpers.nk_script import (
+    nk_render_layer,
+    paste_script,
 )
+from RenderManager2.render_manager2.render.libs.helpers.reads import prefetch_aov_data
 from RenderManager2.render_manager2.render.render_layer_types import Render
 
 log = get_stream_logger('RenderManager2 - Create Reads for RenderLayer')
@@ -19,6 +34,7 @@ class Create:
     def load(self, render_layer: Render) -> None:
         """Create all reads for all renders in a shot."""
         log.info(f'Loading Render Layer {render_layer.name()}.{render_layer.version()}')
+        prefetch_aov_data([render_layer])
 
         next_row_container = get_next_row_container(render_layer)
         create_backdrop_container(render_layer, next_row_container)
@@ -26,3 +42,55 @@ class Create:
         create_backdrop_subcontainer(render_layer, next_row_subcontainer)
 
         log.info(f'{render_layer.name()} Reads Created.')
+
+    def load_all(self, render_layers: List[Render], engine: str = CREATE_ENGINE) -> None:
+        """Create reads of several render layers, reading the script backdrops once.
+
+        Aov frame data of all layers is read concurrently first. Rows and
+        containers of every layer are planned from a single snapshot of the
+        backdrops and their node positions are laid out, then all nodes are
+        created at their final position in one pass.
+
+        Args:
+            render_layers (List[Render]): render layers to load.
+            engine (str, optional): 'knobs' or 'nk', see config.CREATE_ENGINE.
+        """
+        prefetch_aov_data(render_layers)
+        plans = plan_layers(render_layers, BackdropState())
+        layouts = plan_layout(plans)
+
+        if engine == 'nk':
+            self._paste_all(plans, layouts)
+            log.info(f'{len(plans)} Render Layers Created.')
+            return
+
+        for count, (plan, layout) in enumerate(zip(plans, layouts), 1):
+            render_layer = plan.render
+            log.info(
+                f'Loading Render Layer {render_layer.name()}.{render_layer.version()}'
+                f' ({count} of {len(plans)})'
+            )
+
+            if plan.new_container:
+                create_container(render_layer, plan.container_row)
+            replace_subcontainer(
+                render_layer, plan.row, plan.subcontainers, layout
+            )
+
+        log.info(f'{len(plans)} Render Layers Created.')
+
+    def _paste_all(self, plans: list, layouts: list) -> None:
+        """Create the nodes of all planned layers pasting a single nuke script text."""
+        connections = {}
+        for plan in plans:
+            connections.update(delete_subcontainers(plan.subcontainers))
+
+        paste_script(
+            '\n'.join(
+                nk_render_layer(
+                    plan.render, plan.container_row, plan.row, layout, plan.new_container
+                )
+                for plan, layout in zip(plans, layouts)
+            )
+        )
+        restore_connections(connections)
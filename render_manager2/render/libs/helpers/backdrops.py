@@ -3,6 +3,8 @@
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
 import contextlib
+from collections import defaultdict, namedtuple
+from typing import List
 
 try:
     import nuke
@@ -12,13 +14,105 @@ except ImportError:
 from RenderManager2.render_manager2.render.libs.helpers.config import (
     BACKDROP_SIZE,
     COLOR_BACKDROP_RL,
-    OFFSET_BDROP_X,
-    OFFSET_BDROP_Y,
-    ROL_POSITION_X,
 )
-from RenderManager2.render_manager2.render.libs.helpers.reads import create_all_aovs
+from RenderManager2.render_manager2.render.libs.helpers.knobs import (
+    add_user_knobs,
+    backdrop_knobs,
+)
+from RenderManager2.render_manager2.render.libs.helpers.layout import (
+    container_position,
+    layer_layout,
+    layout_render_layer,
+    node_position,
+)
+from RenderManager2.render_manager2.render.libs.helpers.reads import create_reads
 from RenderManager2.render_manager2.render.render_layer_types import Render
 
+# backdrops to create for a render layer, see plan_layers
+layer_plan = namedtuple(
+    'layer_plan', ['render', 'container_row', 'new_container', 'row', 'subcontainers']
+)
+
+
+class BackdropState:
+    def __init__(self) -> None:
+        """Containers and subcontainers of the script, read in a single pass.
+
+        Answers the same questions as get_next_row_container,
+        get_next_row_subcontainer and the searches of create_backdrop_container
+        and create_backdrop_subcontainer, without iterating the backdrops again
+        for every render layer.
+        """
+        # first container found by rol_layer, (node, row)
+        self.containers = {}
+        # max container row by rol_main
+        self.rows = {}
+        # subcontainers by name_layer
+        self.subcontainers = defaultdict(list)
+
+        for backdrop in nuke.allNodes('BackdropNode'):
+            with contextlib.suppress(NameError, AttributeError, ValueError):
+                if backdrop['container'].getValue():
+                    self.add_container(
+                        backdrop,
+                        backdrop['rol_main'].getValue(),
+                        backdrop['rol_layer'].getValue(),
+                        int(backdrop['row'].getValue()),
+                    )
+                    continue
+
+            with contextlib.suppress(NameError, AttributeError):
+                if backdrop['subcontainer'].getValue():
+                    name_layer = backdrop['name_layer'].getValue()
+                    self.subcontainers[name_layer].append(backdrop)
+
+    def add_container(self, node, rol_main: str, rol_layer: str, row: int) -> None:
+        """Register a container, node is None if it is planned but not created."""
+        self.containers.setdefault(rol_layer, (node, row))
+        self.rows[rol_main] = max(row, self.rows.get(rol_main, row))
+
+    def next_row(self, rol_main: str) -> int:
+        """Return the row for a new container, see get_next_row_container."""
+        return self.rows[rol_main] + 1 if rol_main in self.rows else 1
+
+
+def plan_layers(render_layers: List[Render], state: BackdropState) -> List[layer_plan]:
+    """Plan rows and containers of render layers to load, before creating any node.
+
+    Containers planned for a layer are added to the state, so later layers of
+    the same rol_layer share them and later rol_layers of the same rol_main get
+    the next rows.
+
+    Args:
+        render_layers (List[Render]): render layers to load, in loading order.
+        state (BackdropState): backdrops of the script.
+    Returns:
+        List[layer_plan]: one plan per render layer.
+    """
+    plans = []
+    for render in render_layers:
+        container = state.containers.get(render.rol_layer())
+        new_container = container is None
+        if new_container:
+            container_row = state.next_row(render.rol_main())
+            state.add_container(
+                None, render.rol_main(), render.rol_layer(), container_row
+            )
+        else:
+            container_row = container[1]
+
+        # the old subcontainer of the layer keeps its row
+        subcontainers = state.subcontainers.pop(render.name(), [])
+        row = container_row
+        for backdrop in subcontainers:
+            with contextlib.suppress(NameError, ValueError):
+                row = int(backdrop['row'].getValue())
+
+        plans.append(
+            layer_plan(render, container_row, new_container, row, subcontainers)
+        )
+    return plans
+
 
 def get_next_row_container(render: Render) -> int:
     """Get the maximum row number of the backdrop node for this layer in the script."""
@@ -70,10 +164,18 @@ def create_backdrop_container(render: Render, row: int) -> str:
             ):
                 return n
 
-    node = _create_backdrop(render.prefix_rol_layer(), BACKDROP_SIZE['GENERAL'])
+    return create_container(render, row)
+
+
+def create_container(render: Render, row: int):
+    """Create the backdrop container of a rol_layer, without searching the script."""
+    node = _create_backdrop(
+        render.prefix_rol_layer(),
+        BACKDROP_SIZE['GENERAL'],
+        position=container_position(render.rol_main(), row),
+    )
     node['tile_color'].setValue(COLOR_BACKDROP_RL[render.rol_main()])
     _add_attributes_tab(node, render, row, container=True)
-    _move_backdrop(node)
 
     return node
 
@@ -81,137 +183,111 @@ def create_backdrop_container(render: Render, row: int) -> str:
 def create_backdrop_subcontainer(render: Render, row: int):
     """Create backdrop for all renders."""
 
-    connections = {}
-
+    subcontainers = []
     for bd in nuke.allNodes('BackdropNode'):
         with contextlib.suppress(NameError):
             if (
                 bd['name_layer'].getValue() == render.name()
                 and bd['subcontainer'].getValue()
             ):
-                for node in bd.getNodes():
-                    # Save current connections in dict
-                    dependent_node = []
+                # overwrite current row before delete the subcontainer
+                row = int(bd['row'].getValue())
+                subcontainers.append(bd)
 
-                    for _ in node.dependent():
-                        dependent_node.append(_)
+    replace_subcontainer(render, row, subcontainers)
 
-                    connections[node.name()] = dependent_node
-                    nuke.delete(node)
 
-                # overwrite current row before delete the subcontainer
-                row = int(bd['row'].getValue())
-                nuke.delete(bd)
+def replace_subcontainer(
+    render: Render, row: int, subcontainers: list, layout: layer_layout = None
+) -> None:
+    """Delete the previous subcontainers of a render layer and create the new one.
 
-    for backdrop_type in BACKDROP_SIZE:
-        if backdrop_type == render.suffix():
-            node = _create_backdrop(
-                backdrop_type, BACKDROP_SIZE[backdrop_type], subcontainer=True
-            )
-            _add_attributes_tab(node, render, row, container=False)
-            create_all_aovs(render)
-            _move_backdrop(node)
+    Args:
+        render (Render): render layer to create.
+        row (int): row of the new subcontainer.
+        subcontainers (list): previous subcontainer backdrops of the render layer.
+        layout (layer_layout, optional): final node positions, see
+            layout.layout_render_layer, computed from the row if None.
+    """
+    if layout is None:
+        layout = layout_render_layer(render, row, row)
 
-            # restore connections
-            for read in connections:
-                for _node in connections[read]:
-                    _node.setInput(0, nuke.toNode(read))
+    connections = delete_subcontainers(subcontainers)
 
+    if layout.subcontainer is not None:
+        backdrop_type = render.suffix()
+        node = _create_backdrop(
+            backdrop_type,
+            BACKDROP_SIZE[backdrop_type],
+            subcontainer=True,
+            position=layout.subcontainer,
+        )
+        _add_attributes_tab(node, render, row, container=False)
+        create_reads(render, zip(render.aovs(), layout.reads))
+        nukescripts.clear_selection_recursive()
 
-def _add_attributes_tab(node, render: Render, row: int, container: bool = False) -> None:
-    # sourcery skip: extract-duplicate-method
-    """Create Arcane tab with knobs attributes."""
-    Arcane_tab = nuke.Tab_Knob('ARCANE')
-    node.addKnob(Arcane_tab)
-
-    rol_main = nuke.String_Knob('rol_main', 'rol_main')
-    node.addKnob(rol_main)
-    rol_main.setValue(render.rol_main())
-
-    rol_layer = nuke.String_Knob('rol_layer', 'rol_layer')
-    node.addKnob(rol_layer)
-    rol_layer.setValue(render.rol_layer())
-
-    prefix_rol_layer = nuke.String_Knob('prefix_rol_layer', 'prefix_rol_layer')
-    node.addKnob(prefix_rol_layer)
-    prefix_rol_layer.setValue(render.prefix_rol_layer())
-
-    range_knob = nuke.String_Knob('range', 'range')
-    node.addKnob(range_knob)
-    range_knob.setValue(render.frame_range())
-
-    frames_knob = nuke.String_Knob('frames', 'frames')
-    node.addKnob(frames_knob)
-    frames_knob.setValue(str(render.frames()))
-
-    column = nuke.Int_Knob('column', 'column')
-    node.addKnob(column)
-    column.setValue(ROL_POSITION_X[render.rol_main()])
-
-    row_knob = nuke.Int_Knob('row', 'row')
-    node.addKnob(row_knob)
-    row_knob.setValue(row)
-    row_knob.clearFlag(nuke.STARTLINE)
-
-    if container:
-        container_knob = nuke.Boolean_Knob('container', 'container')
-        node.addKnob(container_knob)
-        container_knob.setValue(container)
-    else:
-        subcontainer = nuke.Boolean_Knob('subcontainer', 'subcontainer')
-        node.addKnob(subcontainer)
-        subcontainer.setValue(True)
-        name = nuke.String_Knob('name_layer', 'name_layer')
-        node.addKnob(name)
-        name.setValue(render.name())
+        restore_connections(connections)
+
+
+def delete_subcontainers(subcontainers: list) -> dict:
+    """Delete subcontainer backdrops and their nodes.
 
-    path_render = nuke.String_Knob('path_render', 'path_render')
-    node.addKnob(path_render)
-    path_render.setValue(render.path())
+    Returns:
+        dict: nodes connected to each deleted node, by deleted node name.
+    """
+    connections = {}
 
-    abc_version_knob = nuke.String_Knob('abc_version', 'abc_version')
-    node.addKnob(abc_version_knob)
-    abc_version_knob.setValue(', '.join(render.abc_versions()))
+    for bd in subcontainers:
+        for node in bd.getNodes():
+            # Save current connections in dict
+            dependent_node = []
 
-    version_knob = nuke.String_Knob('version', 'version')
-    node.addKnob(version_knob)
-    version_knob.setValue(str(render.int_version()))
+            for _ in node.dependent():
+                dependent_node.append(_)
 
+            connections[node.name()] = dependent_node
+            nuke.delete(node)
 
-def _move_backdrop(backdrop_node: str) -> None:
-    """Custom position for backdrop."""
+        nuke.delete(bd)
 
-    backdrop = nuke.toNode(backdrop_node.name())
-    column = int(backdrop['column'].getValue())
-    row = int(backdrop['row'].getValue())
+    return connections
 
-    node_in_backdrop = backdrop.getNodes()
-    node_in_backdrop.append(backdrop_node)
 
-    for node in node_in_backdrop:
-        _xpos = int(node['xpos'].getValue())
-        _ypos = int(node['ypos'].getValue())
+def restore_connections(connections: dict) -> None:
+    """Connect again the nodes of deleted reads to the new reads of the same name."""
+    for read in connections:
+        for _node in connections[read]:
+            _node.setInput(0, nuke.toNode(read))
 
-        xpos_custom = OFFSET_BDROP_X * column
-        ypos_custom = OFFSET_BDROP_Y * row
 
-        node.setXYpos(_xpos + xpos_custom, _ypos + ypos_custom)
+def _add_attributes_tab(node, render: Render, row: int, container: bool = False) -> None:
+    """Create Arcane tab with knobs attributes, see knobs.backdrop_knobs."""
+    add_user_knobs(node, backdrop_knobs(render, row, container))
 
-    nukescripts.clear_selection_recursive()
 
+def _create_backdrop(
+    backdrop_name: str,
+    backdrop_size: dict,
+    subcontainer: bool = False,
+    position: node_position = None,
+):
+    """Creates and returns a backdrop node, sets pos/size/label attributes.
 
-def _create_backdrop(backdrop_name: str, backdrop_size: dict, subcontainer: bool = False):
-    """Creates and returns a backdrop node, sets pos/size/label attributes."""
+    The node is created at position, or at the backdrop_size position if None.
+    """
 
     _label = backdrop_name
     if subcontainer:
         _label += ' v[value version]'
 
+    if position is None:
+        position = node_position(backdrop_size['xpos'], backdrop_size['ypos'])
+
     node = nuke.nodes.BackdropNode(
         label=_label,
-        xpos=backdrop_size['xpos'],
+        xpos=position.xpos,
         bdwidth=backdrop_size['bdwidth'],
-        ypos=backdrop_size['ypos'],
+        ypos=position.ypos,
         bdheight=backdrop_size['bdheight'],
         tile_color=backdrop_size['tile_color'],
         z_order=backdrop_size['z_order'],
@@ -82,3 +82,11 @@ ANCHOR_READ = 80
 # Reads
 # Offset beetwen read nodes
 OFFSET_READ_X = 30
+# Reads
+# Vertical offset of the second line of reads
+OFFSET_READ_Y = 150
+
+# Reads
+# Engine used to create the nodes of render layers: 'knobs' creates each node
+# and sets its knobs one by one, 'nk' pastes all of them as nuke script text
+CREATE_ENGINE = 'knobs'
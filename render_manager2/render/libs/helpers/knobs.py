@@ -0,0 +1,105 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Custom Knobs of RenderLayer Nodes
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+from collections import namedtuple
+from typing import List
+
+try:
+    import nuke
+except ImportError:
+    import RenderManager2.render_manager2.mocks.nuke as nuke
+from plugin.utils_nuke.config_colorspace import EXR_CG
+
+from RenderManager2.render_manager2.render.libs.helpers.config import (
+    NODE_CUSTOM,
+    ROL_POSITION_X,
+)
+from RenderManager2.render_manager2.render.render_layer_types import Render
+
+# user knob types, values are the .nk addUserKnob type ids
+TAB, STRING, INT, BOOLEAN = 20, 1, 3, 6
+
+# startline: None keeps the knob default, False clears the STARTLINE flag
+user_knob = namedtuple('user_knob', ['kind', 'name', 'value', 'startline'])
+user_knob.__new__.__defaults__ = (None, None)
+
+
+def backdrop_knobs(render: Render, row: int, container: bool = False) -> List[user_knob]:
+    """Return the ARCANE tab knobs of a container or subcontainer backdrop."""
+    knobs = [
+        user_knob(TAB, 'ARCANE'),
+        user_knob(STRING, 'rol_main', render.rol_main()),
+        user_knob(STRING, 'rol_layer', render.rol_layer()),
+        user_knob(STRING, 'prefix_rol_layer', render.prefix_rol_layer()),
+        user_knob(STRING, 'range', render.frame_range()),
+        user_knob(STRING, 'frames', str(render.frames())),
+        user_knob(INT, 'column', ROL_POSITION_X[render.rol_main()]),
+        user_knob(INT, 'row', row, False),
+    ]
+
+    if container:
+        knobs.append(user_knob(BOOLEAN, 'container', container))
+    else:
+        knobs.append(user_knob(BOOLEAN, 'subcontainer', True))
+        knobs.append(user_knob(STRING, 'name_layer', render.name()))
+
+    knobs += [
+        user_knob(STRING, 'path_render', render.path()),
+        user_knob(STRING, 'abc_version', ', '.join(render.abc_versions())),
+        user_knob(STRING, 'version', str(render.int_version())),
+    ]
+    return knobs
+
+
+def read_name(render: Render, aov_name: str) -> str:
+    """Return the node name of the read of an aov."""
+    return f'{render.rol_layer()}_{aov_name}_00'
+
+
+def read_values(render: Render, aov_name: str) -> dict:
+    """Return the values of the built in knobs of the read of an aov."""
+    aov_data = render.get_aov_data(aov_name)
+    file = f'{render.path()}/{aov_name}/{aov_data["files"]}_####.{aov_data["extension"]}'
+
+    return {
+        'file': file,
+        'first': aov_data['first'],
+        'last': aov_data['last'],
+        'label': aov_name,
+        'colorspace': EXR_CG,
+        'postage_stamp': NODE_CUSTOM['postage_stamp'],
+    }
+
+
+def read_knobs(render: Render, aov_name: str) -> List[user_knob]:
+    """Return the ARCANE tab knobs of the read of an aov."""
+    return [
+        user_knob(TAB, 'ARCANE'),
+        user_knob(STRING, 'name_layer', render.name()),
+        user_knob(STRING, 'rol_layer', render.rol_layer()),
+        user_knob(STRING, 'suffix', render.suffix()),
+        user_knob(STRING, 'aov_name', aov_name),
+        user_knob(STRING, 'version_label', render.version()),
+        user_knob(STRING, 'version_short', str(render.int_version())),
+    ]
+
+
+def add_user_knobs(node, knobs: List[user_knob]) -> None:
+    """Create user knobs on a node and set their values, one knob at a time."""
+    knob_classes = {
+        STRING: nuke.String_Knob,
+        INT: nuke.Int_Knob,
+        BOOLEAN: nuke.Boolean_Knob,
+    }
+
+    for knob in knobs:
+        if knob.kind == TAB:
+            node.addKnob(nuke.Tab_Knob(knob.name))
+            continue
+
+        new_knob = knob_classes[knob.kind](knob.name, knob.name)
+        node.addKnob(new_knob)
+        new_knob.setValue(knob.value)
+        if knob.startline is False:
+            new_knob.clearFlag(nuke.STARTLINE)
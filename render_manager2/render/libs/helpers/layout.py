@@ -0,0 +1,115 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Layout of Backdrops and Reads for RenderLayer
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+from collections import namedtuple
+from typing import List
+
+from RenderManager2.render_manager2.render.libs.helpers.config import (
+    ANCHOR_READ,
+    BACKDROP_SIZE,
+    OFFSET_BDROP_X,
+    OFFSET_BDROP_Y,
+    OFFSET_BORDER_BACKDROP,
+    OFFSET_READ_X,
+    OFFSET_READ_Y,
+    POSITION_READ,
+    ROL_POSITION_X,
+)
+
+node_position = namedtuple('node_position', ['xpos', 'ypos'])
+
+# final positions of the nodes of a render layer, subcontainer is None and reads
+# is empty when the suffix has no backdrop type
+layer_layout = namedtuple('layer_layout', ['container', 'subcontainer', 'reads'])
+
+
+def backdrop_offset(rol_main: str, row: int) -> node_position:
+    """Return the offset of a backdrop cell, column by main role and row."""
+    return node_position(
+        OFFSET_BDROP_X * ROL_POSITION_X[rol_main], OFFSET_BDROP_Y * row
+    )
+
+
+def container_position(rol_main: str, row: int) -> node_position:
+    """Return the final position of the backdrop container of a rol_layer."""
+    offset = backdrop_offset(rol_main, row)
+    size = BACKDROP_SIZE['GENERAL']
+    return node_position(size['xpos'] + offset.xpos, size['ypos'] + offset.ypos)
+
+
+def subcontainer_position(suffix: str, rol_main: str, row: int) -> node_position:
+    """Return the final position of the subcontainer of a render layer.
+
+    Args:
+        suffix (str): render layer suffix, one of the BACKDROP_SIZE types.
+        rol_main (str): main role, eg: FG
+        row (int): row of the subcontainer.
+    Returns:
+        node_position: None if the suffix has no backdrop type.
+    """
+    if suffix not in BACKDROP_SIZE:
+        return None
+
+    offset = backdrop_offset(rol_main, row)
+    size = BACKDROP_SIZE[suffix]
+    return node_position(size['xpos'] + offset.xpos, size['ypos'] + offset.ypos)
+
+
+def read_positions(
+    suffix: str, aovs: List[str], rol_main: str, row: int
+) -> List[node_position]:
+    """Return the final position of the read of each aov, in aov order.
+
+    Reads are placed left to right from POSITION_READ, ANCHOR_READ wide and
+    OFFSET_READ_X apart. Reads after one passing the BTY backdrop width go to
+    a second line.
+
+    Args:
+        suffix (str): render layer suffix, one of the POSITION_READ types.
+        aovs (List[str]): aov names of the render layer.
+        rol_main (str): main role, eg: FG
+        row (int): row of the subcontainer.
+    """
+    if suffix not in POSITION_READ:
+        return []
+
+    offset_x, offset_y = backdrop_offset(rol_main, row)
+    start_x, start_y = POSITION_READ[suffix]
+    limit_x = BACKDROP_SIZE['BTY']['bdwidth'] + OFFSET_BORDER_BACKDROP
+    step_x = ANCHOR_READ + OFFSET_READ_X
+
+    positions = []
+    xpos, ypos = start_x, start_y + offset_y
+    for _ in aovs:
+        positions.append((xpos + offset_x, ypos))
+        if xpos > limit_x:
+            xpos, ypos = start_x, start_y + OFFSET_READ_Y + offset_y
+        else:
+            xpos = max(start_x, xpos + step_x)
+
+    return list(map(node_position._make, positions))
+
+
+def layout_render_layer(render, container_row: int, row: int) -> layer_layout:
+    """Return the final positions of the backdrops and reads of a render layer.
+
+    Args:
+        render (Render): render layer, only its roles, suffix and aovs are used.
+        container_row (int): row of the container of its rol_layer.
+        row (int): row of its subcontainer.
+    """
+    rol_main, suffix = render.rol_main(), render.suffix()
+    subcontainer = subcontainer_position(suffix, rol_main, row)
+    reads = read_positions(suffix, render.aovs(), rol_main, row) if subcontainer else []
+
+    return layer_layout(
+        container=container_position(rol_main, container_row),
+        subcontainer=subcontainer,
+        reads=reads,
+    )
+
+
+def plan_layout(plans: list) -> List[layer_layout]:
+    """Return the layout of each planned render layer, see backdrops.plan_layers."""
+    return [layout_render_layer(p.render, p.container_row, p.row) for p in plans]
@@ -0,0 +1,174 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Nuke Script Text of RenderLayer Nodes
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import os
+import tempfile
+from typing import List
+
+try:
+    import nuke
+    import nukescripts
+except ImportError:
+    import RenderManager2.render_manager2.mocks.nuke as nuke
+from RenderManager2.render_manager2.render.libs.helpers.config import (
+    BACKDROP_SIZE,
+    COLOR_BACKDROP_RL,
+)
+from RenderManager2.render_manager2.render.libs.helpers.knobs import (
+    BOOLEAN,
+    TAB,
+    backdrop_knobs,
+    read_knobs,
+    read_name,
+    read_values,
+    user_knob,
+)
+from RenderManager2.render_manager2.render.libs.helpers.layout import (
+    layer_layout,
+    node_position,
+)
+from RenderManager2.render_manager2.render.render_layer_types import Render
+
+# characters escaped inside quoted .nk values, [ would start a tcl expression
+NK_ESCAPE = str.maketrans(
+    {'\\': '\\\\', '"': '\\"', '[': '\\[', '$': '\\$', '\n': '\\n'}
+)
+
+
+def nk_value(value) -> str:
+    """Return a knob value as .nk text."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    return f'"{str(value).translate(NK_ESCAPE)}"'
+
+
+def nk_user_knobs(knobs: List[user_knob]) -> List[str]:
+    """Return addUserKnob and value lines of user knobs, see knobs.add_user_knobs."""
+    lines = []
+    for knob in knobs:
+        if knob.kind == TAB:
+            lines.append(f' addUserKnob {{{TAB} {knob.name}}}')
+            continue
+
+        flags = ''
+        if knob.startline is False:
+            flags = ' -STARTLINE'
+        elif knob.kind == BOOLEAN:
+            flags = ' +STARTLINE'
+        lines.append(f' addUserKnob {{{knob.kind} {knob.name} l {knob.name}{flags}}}')
+        lines.append(f' {knob.name} {nk_value(knob.value)}')
+    return lines
+
+
+def nk_backdrop(
+    label: str,
+    backdrop_size: dict,
+    position: node_position,
+    knobs: List[user_knob],
+    tile_color: int = None,
+) -> str:
+    """Return the .nk text of a backdrop, see backdrops._create_backdrop."""
+    if tile_color is None:
+        tile_color = backdrop_size['tile_color']
+
+    lines = [
+        'BackdropNode {',
+        ' inputs 0',
+        f' tile_color {tile_color:#010x}',
+        f' label {nk_value(label)}',
+        f' note_font_size {backdrop_size["note_font_size"]}',
+        f' xpos {position.xpos}',
+        f' ypos {position.ypos}',
+        f' bdwidth {backdrop_size["bdwidth"]}',
+        f' bdheight {backdrop_size["bdheight"]}',
+        f' z_order {backdrop_size["z_order"]}',
+    ]
+    lines += nk_user_knobs(knobs)
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def nk_read(render: Render, aov_name: str, position: node_position) -> str:
+    """Return the .nk text of the read of an aov, see reads.create_node."""
+    lines = ['Read {', ' inputs 0']
+    lines += [
+        f' {knob_name} {nk_value(value)}'
+        for knob_name, value in read_values(render, aov_name).items()
+    ]
+    lines += [
+        f' name {read_name(render, aov_name)}',
+        f' xpos {position.xpos}',
+        f' ypos {position.ypos}',
+    ]
+    lines += nk_user_knobs(read_knobs(render, aov_name))
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def nk_render_layer(
+    render: Render,
+    container_row: int,
+    row: int,
+    layout: layer_layout,
+    new_container: bool = True,
+) -> str:
+    """Return the .nk text of the container, subcontainer and reads of a render layer.
+
+    Args:
+        render (Render): render layer to create.
+        container_row (int): row of the container of its rol_layer.
+        row (int): row of its subcontainer.
+        layout (layer_layout): final node positions, see layout.layout_render_layer.
+        new_container (bool, optional): include the container backdrop.
+    """
+    nodes = []
+    if new_container:
+        nodes.append(
+            nk_backdrop(
+                render.prefix_rol_layer(),
+                BACKDROP_SIZE['GENERAL'],
+                layout.container,
+                backdrop_knobs(render, container_row, container=True),
+                tile_color=COLOR_BACKDROP_RL[render.rol_main()],
+            )
+        )
+
+    if layout.subcontainer is not None:
+        backdrop_type = render.suffix()
+        nodes.append(
+            nk_backdrop(
+                f'{backdrop_type} v[value version]',
+                BACKDROP_SIZE[backdrop_type],
+                layout.subcontainer,
+                backdrop_knobs(render, row, container=False),
+            )
+        )
+        nodes += [
+            nk_read(render, aov_name, position)
+            for aov_name, position in zip(render.aovs(), layout.reads)
+        ]
+
+    return '\n'.join(nodes)
+
+
+def paste_script(text: str) -> None:
+    """Create the nodes of a .nk text in the root of the script in one operation."""
+    nukescripts.clear_selection_recursive()
+
+    with nuke.root():
+        if hasattr(nuke, 'scriptReadText'):
+            nuke.scriptReadText(text)
+        else:
+            with tempfile.NamedTemporaryFile(
+                'w', suffix='.nk', delete=False, encoding='utf-8'
+            ) as script:
+                script.write(text)
+            try:
+                nuke.nodePaste(script.name)
+            finally:
+                os.remove(script.name)
+
+    nukescripts.clear_selection_recursive()
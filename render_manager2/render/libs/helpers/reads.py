@@ -1,95 +1,96 @@
+import time
+from typing import List
+
 try:
     import nuke
 except ImportError:
     import RenderManager2.render_manager2.mocks.nuke as nuke
-from plugin.utils_nuke.config_colorspace import EXR_CG
-
-from RenderManager2.render_manager2.render.libs.helpers.config import (
-    ANCHOR_READ,
-    BACKDROP_SIZE,
-    NODE_CUSTOM,
-    OFFSET_BORDER_BACKDROP,
-    OFFSET_READ_X,
-    POSITION_READ,
+from qt_log.stream_log import get_stream_logger
+
+from RenderManager2.render_manager2.core.disk_walker import scan_executor, scan_map
+from RenderManager2.render_manager2.render.libs.helpers.knobs import (
+    add_user_knobs,
+    read_knobs,
+    read_name,
+    read_values,
 )
+from RenderManager2.render_manager2.render.libs.helpers.layout import read_positions
 from RenderManager2.render_manager2.render.render_layer_types import Render
+from RenderManager2.render_manager2.render.tokens import SCAN_WORKERS
+
+log = get_stream_logger('RenderManager2 - Reads')
+
+
+def prefetch_aov_data(render_layers: List[Render], workers: int = SCAN_WORKERS) -> int:
+    """Read the frame data of every aov of the render layers on a thread pool.
+
+    Each aov folder is a network listing, they are read concurrently before
+    the reads are created on the main thread, which then only reads memory.
+    Aovs that fail are left to be read, and reported, by create_node.
 
+    Args:
+        render_layers (List[Render]): render layers about to be loaded.
+        workers (int, optional): number of threads, 0 reads serially.
+    Returns:
+        int: number of aovs prefetched.
+    """
+    aovs = [
+        (render, aov_name)
+        for render in render_layers
+        if render.is_resolved()
+        for aov_name in render.aovs()
+    ]
 
-def create_all_aovs(render: Render) -> None:
-    """Create all reads for all aovs renders in a shot."""
+    def prefetch(item) -> bool:
+        render, aov_name = item
+        try:
+            render.frame_set(aov_name)
+        except OSError:
+            return False
+        return True
 
-    offset_x = 0
-    second_line = False
-    # print(f'OFFSET START {offset_x}')
-    for aov_name in render.aovs():
-        pos_read_x = POSITION_READ[render.suffix()][0]
-        pos_read_y = POSITION_READ[render.suffix()][1]
-        # print(f"POS READ X Y {pos_read_x} {pos_read_y}")
+    start = time.perf_counter()
+    with scan_executor(min(workers, len(aovs))) as executor:
+        fetched = sum(scan_map(executor, prefetch, aovs))
 
-        if second_line:
-            # print('SECOND LINE')
-            pos_read_y = POSITION_READ[render.suffix()][1] + 150
+    log.debug(
+        f'Prefetched {fetched} of {len(aovs)} aovs in {time.perf_counter() - start:.3f}s'
+    )
+    return fetched
 
-        if offset_x > pos_read_x:
-            pos_read_x = offset_x
 
-        node_xpos = create_node(render, aov_name, pos_read_x, pos_read_y)
-        # print(f'NODE XPOS{node_xpos}')
+def create_all_aovs(render: Render, row: int = 0) -> None:
+    """Create all reads for all aovs renders in a shot.
 
-        offset_x = node_xpos + ANCHOR_READ + OFFSET_READ_X
+    Reads are created at their final position in the subcontainer of the row,
+    see layout.read_positions.
+    """
+    positions = read_positions(render.suffix(), render.aovs(), render.rol_main(), row)
+    create_reads(render, zip(render.aovs(), positions))
 
-        if node_xpos > BACKDROP_SIZE['BTY']['bdwidth'] + OFFSET_BORDER_BACKDROP:
-            # print('the last node is mayor than the backdrop size')
-            offset_x = 0
-            second_line = True
 
-        # print(f'OFFSET END {offset_x}')
-        # print('-' * 10)
+def create_reads(render: Render, positions) -> None:
+    """Create the reads of a render layer at the given positions.
+
+    Args:
+        render (Render): render layer.
+        positions (Iterable): (aov name, node_position) pairs.
+    """
+    for aov_name, position in positions:
+        create_node(render, aov_name, position.xpos, position.ypos)
 
 
 def create_node(render: Render, aov_name: str, pos_read_x: int, pos_read_y: int) -> int:
     """Create nodes for all aovs renders in a shot."""
 
     node = nuke.nodes.Read()
-    node.setName(f'{render.rol_layer()}_{aov_name}_00')
-
-    arcane_tab = nuke.Tab_Knob('ARCANE')
-    node.addKnob(arcane_tab)
+    node.setName(read_name(render, aov_name))
 
-    aov_data = render.get_aov_data(aov_name)
-    file = f'{render.path()}/{aov_name}/{aov_data["files"]}_####.{aov_data["extension"]}'
-
-    node['file'].setValue(file)
+    for knob_name, value in read_values(render, aov_name).items():
+        node[knob_name].setValue(value)
     node['xpos'].setValue(pos_read_x)
     node['ypos'].setValue(pos_read_y)
-    node['first'].setValue(aov_data['first'])
-    node['last'].setValue(aov_data['last'])
-    node['label'].setValue(aov_name)
-    node['colorspace'].setValue(EXR_CG)
-    node['postage_stamp'].setValue(NODE_CUSTOM['postage_stamp'])
-
-    name_knob = nuke.String_Knob('name_layer', 'name_layer')
-    node.addKnob(name_knob)
-    name_knob.setValue(render.name())
-
-    rol_layer_knob = nuke.String_Knob('rol_layer', 'rol_layer')
-    node.addKnob(rol_layer_knob)
-    rol_layer_knob.setValue(render.rol_layer())
-
-    suffix_knob = nuke.String_Knob('suffix', 'suffix')
-    node.addKnob(suffix_knob)
-    suffix_knob.setValue(render.suffix())
-
-    aov_name_knob = nuke.String_Knob('aov_name', 'aov_name')
-    node.addKnob(aov_name_knob)
-    aov_name_knob.setValue(aov_name)
-
-    version_label_knob = nuke.String_Knob('version_label', 'version_label')
-    node.addKnob(version_label_knob)
-    version_label_knob.setValue(render.version())
-
-    version_knob = nuke.String_Knob('version_short', 'version_short')
-    node.addKnob(version_knob)
-    version_knob.setValue(str(render.int_version()))
+
+    add_user_knobs(node, read_knobs(render, aov_name))
 
     return node.xpos()
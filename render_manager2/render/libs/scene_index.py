@@ -0,0 +1,130 @@
+# ----------------------------------------------------------------------------------------
+# ACME RenderManager Nuke - Scene Index of RenderManager Backdrops
+# Maximiliano Rocamora / Milton Maguna
+# ----------------------------------------------------------------------------------------
+import contextlib
+
+try:
+    import nuke
+except ImportError:
+    import RenderManager2.render_manager2.mocks.nuke as nuke
+
+# subcontainer knobs read by the index, changes to other knobs keep it valid
+INDEXED_KNOBS = {
+    'subcontainer',
+    'name_layer',
+    'version',
+    'range',
+    'frames',
+    'abc_version',
+}
+
+
+class SceneIndex:
+    def __init__(self) -> None:
+        """Data of the RenderManager subcontainer backdrops of the current script.
+
+        Every backdrop is read once and the knobs are kept by name_layer until a
+        backdrop is created, deleted or one of its INDEXED_KNOBS changes. Without
+        Nuke callbacks, eg: outside Nuke, the scene is read again on every lookup.
+        """
+        self._layers = None
+        self._installed = False
+        # bumped on every invalidation, lets views know cached scene data is stale
+        self.generation = 0
+
+    def install(self) -> bool:
+        """Register the Nuke callbacks that invalidate the index.
+
+        Returns:
+            bool: True if the callbacks are registered.
+        """
+        if self._installed:
+            return True
+
+        try:
+            nuke.addOnCreate(self.invalidate, nodeClass='BackdropNode')
+            nuke.addOnDestroy(self.invalidate, nodeClass='BackdropNode')
+            nuke.addKnobChanged(self._knob_changed, nodeClass='BackdropNode')
+        except AttributeError:
+            return False
+
+        self._installed = True
+        return True
+
+    def uninstall(self) -> None:
+        """Remove the Nuke callbacks, lookups read the scene again."""
+        if not self._installed:
+            return
+
+        nuke.removeOnCreate(self.invalidate, nodeClass='BackdropNode')
+        nuke.removeOnDestroy(self.invalidate, nodeClass='BackdropNode')
+        nuke.removeKnobChanged(self._knob_changed, nodeClass='BackdropNode')
+        self._installed = False
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the indexed backdrops, the next lookup reads the scene."""
+        self._layers = None
+        self.generation += 1
+
+    def _knob_changed(self) -> None:
+        """Invalidate when an indexed knob of a backdrop changes."""
+        if nuke.thisKnob().name() in INDEXED_KNOBS:
+            self.invalidate()
+
+    def lookup(self, name_layer: str, field: str, default=None):
+        """Return a knob value of the subcontainer backdrop of a render layer.
+
+        Args:
+            name_layer (str): render layer name, eg: RND_FG_BTY
+            field (str): one of version, ranges or abc_version.
+            default: value returned when no backdrop has the field.
+        """
+        if self._layers is None or not self.install():
+            self._layers = _read_backdrops()
+        return self._layers.get(name_layer, {}).get(field, default)
+
+
+def _read_backdrops() -> dict:
+    """Read all subcontainer backdrops in a single pass.
+
+    Like the previous per method loops, each field is taken from the first
+    backdrop of the layer holding a valid value.
+
+    Returns:
+        dict: fields by name_layer, eg:
+            {'RND_FG_BTY': {'version': 26, 'ranges': ('1001-1020', '20'),
+                            'abc_version': ['char_v003.abc']}}
+    """
+    layers = {}
+    for bdrop in nuke.allNodes('BackdropNode'):
+        with contextlib.suppress(NameError, ValueError):
+            if not int(bdrop['subcontainer'].getValue()):
+                continue
+
+            fields = layers.setdefault(bdrop['name_layer'].getValue(), {})
+
+            if 'version' not in fields:
+                with contextlib.suppress(NameError, ValueError):
+                    fields['version'] = int(bdrop['version'].getValue())
+
+            if 'abc_version' not in fields:
+                with contextlib.suppress(NameError, ValueError):
+                    abc_versions = bdrop['abc_version'].getValue()
+                    fields['abc_version'] = [
+                        item.strip() for item in abc_versions.split(',')
+                    ]
+
+            if 'ranges' not in fields:
+                with contextlib.suppress(NameError, ValueError):
+                    fields['ranges'] = (
+                        bdrop['range'].getValue(),
+                        bdrop['frames'].getValue(),
+                    )
+
+    return layers
+
+
+# shared by all renders of the session
+SCENE_INDEX = SceneIndex()
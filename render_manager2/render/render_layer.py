@@ -2,34 +2,95 @@
 # ACME RenderManager Nuke - Main RenderLayer Class
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
-import contextlib
 import os
-
-try:
-    import nuke
-except ImportError:
-    import RenderManager2.render_manager2.mocks.nuke as nuke
+import sys
+from typing import Callable
 
 from RenderManager2.render_manager2.core.libs.reformat import ReformatRenderLayer
+from RenderManager2.render_manager2.render.frame_set import FrameSet
 from RenderManager2.render_manager2.render.libs.create import Create
 from RenderManager2.render_manager2.render.libs.remove import RemoveRenderLayer
+from RenderManager2.render_manager2.render.libs.scene_index import SCENE_INDEX
 from RenderManager2.render_manager2.render.render_states import OUTDATED, SYNC, UNLOADED
 
 
 class Render:
-    def __init__(self, path: str, name: str, aovs: list, info_json: dict) -> None:
+    # thousands of renders are kept per sequence, no instance dict
+    __slots__ = (
+        '_path',
+        '_name',
+        '_aovs',
+        '_info_json',
+        '_aov_files',
+        '_aov_data',
+        '_read_dir',
+        '_suffix',
+        '_rol_layer',
+        '_rol_main',
+        '_prefix_rol_layer',
+        '_version',
+        '_int_version',
+    )
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        aovs: list,
+        info_json: dict,
+        aov_files: dict = None,
+        frame_sets: dict = None,
+        read_dir: Callable = None,
+    ) -> None:
         """Render Layer Object.
 
         Args:
             path (str): disk path to this render layer.
             name (str): name of this render layer.
             aovs (list): list of aovs for this render layer.
-            info_json (dict): info json dict for this render layer.
+            info_json (dict): info json dict for this render layer, or a callable
+                returning it, called the first time user or abc info is needed.
+            aov_files (dict, optional): file names of aov folders already listed
+                by the disk scan, by aov name.
+            frame_sets (dict, optional): aov sequences already known, by aov name,
+                eg: loaded from a scan snapshot.
+            read_dir (Callable, optional): directory reader of the scan, eg: the
+                scan_dir of a ScanIndex, used to list aov folders not listed yet.
+                os.listdir is used if None.
+
+        A render created with aovs None is a stub of a version not read from disk
+        yet, only name and path methods are valid until resolve() is called.
+
+        Name and version parts are parsed once here, aov names are interned so
+        all versions of a layer share the same strings.
         """
-        self._path = path
-        self._name = name
-        self._aovs = aovs
+        self._path = path.replace('\\', '/')
+        self._name = sys.intern(name)
+        self._aovs = _intern_aovs(aovs)
         self._info_json = info_json
+        self._aov_files = dict(aov_files or {})
+        self._aov_data = dict(frame_sets or {})
+        self._read_dir = read_dir
+
+        parts = self._name.split('_')
+        self._suffix = sys.intern(parts[-1])
+        self._rol_layer = sys.intern('_'.join(parts[1:-1]))
+        self._rol_main = sys.intern(parts[1])
+        self._prefix_rol_layer = sys.intern(self._name.rsplit('_', 1)[0])
+
+        self._version = self._path.rpartition('/')[2]
+        digits = ''.join(i for i in self._version.rsplit('_', 2)[-1] if i.isdigit())
+        self._int_version = int(digits) if digits else 0
+
+    def __getstate__(self) -> dict:
+        # the directory reader belongs to the scanning process, eg: the scan service
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state['_read_dir'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
     def __str__(self) -> str:
         return f'RENDER LAYER {self.name()}, path {self.path()}, aovs {self.aovs()}'
@@ -50,7 +111,7 @@ class Render:
             TECH
             CRYPTO
         """
-        return self._name.split('_')[-1]
+        return self._suffix
 
     def rol_layer(self) -> str:
         """Return rol layer name.
@@ -59,7 +120,7 @@ class Render:
             BG
             ALL
         """
-        return ('_').join(self._name.split('_')[1:-1])
+        return self._rol_layer
 
     def rol_main(self) -> str:
         """Return rol main name.
@@ -68,7 +129,7 @@ class Render:
             BG
             ALL
         """
-        return self._name.split('_')[1]
+        return self._rol_main
 
     def prefix_rol_layer(self) -> str:
         """Return prefix rol layer name.
@@ -77,7 +138,7 @@ class Render:
             RND_BG
             RND_ALL
         """
-        return self._name.rsplit('_', 1)[0]
+        return self._prefix_rol_layer
 
     def path(self) -> str:
         """Return normalized windows path.
@@ -86,7 +147,7 @@ class Render:
             'I:/GizmoRD/FRAMES/DEV/030/CG/RND_BG_TECH/LGT_KAF_010_v0026'
             'I:/GizmoRD/FRAMES/DEV/030/CG/RND_ALL_CRYPTO/LGT_KAF_010_v0026'
         """
-        return self._path.replace('\\', '/')
+        return self._path
 
     def version(self) -> str:
         """Return version of this render layer.
@@ -94,8 +155,7 @@ class Render:
         Example:
             LGT_KAF_010_v0026
         """
-        _version = os.path.split(self.path())
-        return _version[-1]
+        return self._version
 
     def int_version(self) -> int:
         """Return int version of this render layer.
@@ -103,10 +163,7 @@ class Render:
         Example:
             26
         """
-        version = os.path.split(self.path())
-        version = version[-1].rsplit('_', 2)[-1]
-        version = ''.join([i for i in version if i.isdigit()])
-        return int(version) if version else 0
+        return self._int_version
 
     def name_version(self) -> str:
         """Return name of this render layer.
@@ -114,7 +171,7 @@ class Render:
         Example:
             LGT_KAF_010
         """
-        return self.version().rsplit('_', 1)[0]
+        return self._version.rsplit('_', 1)[0]
 
     def aovs(self) -> list:
         """Return the list of aovs names for this render layer.
@@ -125,13 +182,51 @@ class Render:
         """
         return self._aovs
 
+    def is_resolved(self) -> bool:
+        """Return False if this render is a stub waiting to be read from disk."""
+        return self._aovs is not None
+
+    def resolve(
+        self,
+        aovs: list,
+        info_json: dict,
+        aov_files: dict = None,
+        frame_sets: dict = None,
+        read_dir: Callable = None,
+    ) -> None:
+        """Fill the data of a stub render, see disk_collector.resolve_versions.
+
+        Args:
+            aovs (list): list of aovs for this render layer.
+            info_json (dict): info json dict for this render layer, or a callable.
+            aov_files (dict, optional): file names of aov folders already listed.
+            frame_sets (dict, optional): aov sequences already known, by aov name.
+            read_dir (Callable, optional): directory reader of the scan.
+        """
+        self._aovs = _intern_aovs(aovs)
+        self._info_json = info_json
+        self._aov_files.update(aov_files or {})
+        self._aov_data.update(frame_sets or {})
+        if read_dir is not None:
+            self._read_dir = read_dir
+
+    def info(self) -> dict:
+        """Return info json dict, loading it on first access if it was deferred."""
+        if callable(self._info_json):
+            self._info_json = self._info_json() or {}
+        return self._info_json
+
+    def info_loaded(self) -> bool:
+        """Return True if the info json is in memory, False if it is still deferred."""
+        return not callable(self._info_json)
+
     def user(self) -> str:
         """Return user who created this render layer."""
-        return self._info_json.get('user', 'jdo')
+        return self.info().get('user', 'jdo')
 
     def abc_versions(self) -> list:
         """Return list of alembic files used in this render layer."""
-        return self._info_json.get('abc_versions', [])
+        return self.info().get('abc_versions', [])
 
     def get_aov_data(self, aov_name: str) -> dict:
         """Get all the data for this aov from disk files.
@@ -139,28 +234,69 @@ class Render:
         Args:
             aov_name (str): name of the aov to get data for.
         """
+        frame_set = self.frame_set(aov_name)
 
-        # filter only exr files
-        aov_path = os.path.join(self.path(), aov_name)
-        exr_files = [f for f in os.listdir(aov_path) if f.endswith('.exr')]
+        return {
+            'files': frame_set.name,
+            'frames': len(frame_set),
+            'first': frame_set.first,
+            'last': frame_set.last,
+            'range': frame_set.frame_range(),
+            'extension': frame_set.extension,
+        }
 
-        if not exr_files:
-            raise FileNotFoundError(f'No .exr files found in AOV path: {aov_path}')
+    def frame_set(self, aov_name: str) -> FrameSet:
+        """Return the exr sequence of an aov.
 
-        # get first and last frame name
-        name, ver_ext = exr_files[0].rsplit('_', 1)
-        first, extension = ver_ext.split('.')
-        _, last_ver_ext = exr_files[-1].rsplit('_', 1)
-        last = last_ver_ext.split('.')[0]
+        The aov folder is listed once, later calls are answered from memory
+        until invalidate() is called.
 
-        return {
-            'files': name,
-            'frames': len(exr_files),
-            'first': int(first),
-            'last': int(last),
-            'range': f'{first}-{last}',
-            'extension': extension,
-        }
+        Args:
+            aov_name (str): name of the aov to get the sequence for.
+        """
+        if aov_name not in self._aov_data:
+            self._aov_data[aov_name] = self._read_frame_set(aov_name)
+        return self._aov_data[aov_name]
+
+    def frame_set_loaded(self, aov_name: str) -> bool:
+        """Return True if the sequence of an aov is known without listing its folder."""
+        return aov_name in self._aov_data or aov_name in self._aov_files
+
+    def invalidate(self, aov_name: str = None) -> None:
+        """Forget cached aov data so it is read again from disk.
+
+        Use it on renders that are still being written.
+
+        Args:
+            aov_name (str, optional): aov to forget, all aovs if not given.
+        """
+        if aov_name is None:
+            self._aov_files.clear()
+            self._aov_data.clear()
+            return
+
+        self._aov_files.pop(aov_name, None)
+        self._aov_data.pop(aov_name, None)
+
+    def _read_frame_set(self, aov_name: str) -> FrameSet:
+        """Build the aov sequence from the scan listing, or list the aov folder.
+
+        The folder is read with the directory reader of the scan if there is one,
+        eg: a scan index answers unchanged aov folders without listing them.
+        """
+        aov_path = os.path.join(self.path(), aov_name)
+        files = self._aov_files.pop(aov_name, None)
+        if files is None and self._read_dir is not None:
+            aov_dir = self._read_dir(aov_path)
+            files = aov_dir.files if aov_dir is not None else ()
+        if files is None:
+            files = os.listdir(aov_path)
+
+        frame_set = FrameSet.from_files(files, 'exr')
+        if frame_set is None:
+            raise FileNotFoundError(f'No .exr files found in AOV path: {aov_path}')
+
+        return frame_set
 
     def frames(self) -> int:
         """Return range from first aov or 0."""
@@ -181,13 +317,10 @@ class Render:
 
     def status(self) -> int:
         """Return state of this render layer."""
-        if not self.version_from_read():
+        version_from_read = self.version_from_read()
+        if not version_from_read:
             return UNLOADED.value
-        return (
-            OUTDATED.value
-            if self.version_from_read() < self.int_version()
-            else SYNC.value
-        )
+        return OUTDATED.value if version_from_read < self.int_version() else SYNC.value
 
     def status_text(self) -> str:
         """Return text for status column."""
@@ -197,47 +330,15 @@ class Render:
 
     def version_from_read(self) -> int:
         """Return version of this render layer READ from current nukescript."""
-        for bdrop in nuke.allNodes('BackdropNode'):
-            with contextlib.suppress(NameError, ValueError):
-                if not int(bdrop['subcontainer'].getValue()):
-                    continue
-
-                if bdrop['name_layer'].getValue() != self.name():
-                    continue
-
-                return int(bdrop['version'].getValue())
-
-        return 0
+        return SCENE_INDEX.lookup(self.name(), 'version', 0)
 
     def abc_version_from_backdrop(self) -> str:
         """Return the abc version string from the backdrop node."""
-        for bdrop in nuke.allNodes('BackdropNode'):
-            with contextlib.suppress(NameError, ValueError):
-                if not int(bdrop['subcontainer'].getValue()):
-                    continue
-
-                if bdrop['name_layer'].getValue() != self.name():
-                    continue
-
-                abc_versions = bdrop['abc_version'].getValue()
-
-                return [item.strip() for item in abc_versions.split(',')]
-
-        return 'Not Found'
+        return SCENE_INDEX.lookup(self.name(), 'abc_version', 'Not Found')
 
     def ranges_from_read(self) -> tuple:
         """Return range and frame count of this render layer READ from current nukescript."""
-        for bdrop in nuke.allNodes('BackdropNode'):
-            with contextlib.suppress(NameError, ValueError):
-                if not int(bdrop['subcontainer'].getValue()):
-                    continue
-
-                if bdrop['name_layer'].getValue() != self.name():
-                    continue
-
-                return bdrop['range'].getValue(), bdrop['frames'].getValue()
-
-        return '0', '0'
+        return SCENE_INDEX.lookup(self.name(), 'ranges', ('0', '0'))
 
     def load(self):
         """Load this render layer into nuke."""
@@ -250,3 +351,10 @@ class Render:
     def reformat(self):
         """Call for reformat 4k renders."""
         ReformatRenderLayer(self)
+
+
+def _intern_aovs(aovs: list) -> list:
+    """Return the aov names as interned strings, None for stubs."""
+    if aovs is None:
+        return None
+    return [sys.intern(aov) for aov in aovs]
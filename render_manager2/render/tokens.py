@@ -2,6 +2,7 @@
 # ACME RenderManager Nuke - Tokens
 # Maximiliano Rocamora / Milton Maguna
 # ----------------------------------------------------------------------------------------
+import os
 
 # Disk Collector
 # Valid render layer prefixes
@@ -22,3 +23,50 @@ RENDER_LAYER_ORDER = [
 TECHS_AOVS_IN_LAYER = {'_TECH': ["Z", "motionvector", "P", "Pref", "N", "UV"],
                        '_CRYPTO': ["crypto_asset", "crypto_material", "crypto_object"]
                        }
+
+# Disk Collector
+# Manifest written in each version folder by the render job when it finishes
+RENDER_MANIFEST = 'render_manifest.rm2'
+
+# Disk Collector
+# Threads used to list, validate and load info of render layers concurrently
+SCAN_WORKERS = 8
+
+# Disk Collector
+# Shots scanned at the same time by the batch collector
+BATCH_SHOT_WORKERS = 4
+
+# Disk Collector
+# Local database with the listings of previous scans
+SCAN_INDEX_PATH = os.path.join(
+    os.path.expanduser('~'), '.render_manager2', 'scan_index.sqlite'
+)
+
+# Disk Collector
+# Max number of render info files kept in memory
+INFO_CACHE_SIZE = 4096
+
+# Disk Collector
+# Max number of shots whose render layers are kept in memory between refreshes
+SCAN_CACHE_SHOTS = 8
+
+# Scan Service
+# Local address of the shot scan service shared by all Nuke sessions
+SCAN_SERVICE_ADDRESS = ('127.0.0.1', 48620)
+
+# Scan Service
+# Secret shared by the service and the sessions of the same user
+SCAN_SERVICE_KEY_PATH = os.path.join(
+    os.path.expanduser('~'), '.render_manager2', 'scan_service.key'
+)
+
+# Scan Service
+# Number of recently used shots kept warm and seconds between refreshes
+SCAN_SERVICE_SHOTS = 16
+SCAN_SERVICE_POLL_SECONDS = 10
+
+# Scan Service
+# Seconds a session waits for the service before scanning by itself, and seconds
+# between the messages the service sends while a scan is running, must be lower
+SCAN_SERVICE_TIMEOUT = 5
+SCAN_SERVICE_KEEPALIVE = 1
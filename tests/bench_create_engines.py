@@ -0,0 +1,95 @@
+"""Benchmark: knob by knob node creation against pasting .nk text.
+
+Outside Nuke only the .nk text generation is timed. Inside Nuke both creation
+engines load the same render layers into the current script, the created nodes
+are deleted after each run.
+
+Run with: python -m tests.bench_create_engines
+Or in the Nuke script editor:
+    from RenderManager2.tests import bench_create_engines
+    bench_create_engines.main()
+"""
+
+import time
+import timeit
+
+try:
+    import nuke
+except ImportError:
+    nuke = None
+
+from RenderManager2.render_manager2.render.frame_set import FrameSet
+from RenderManager2.render_manager2.render.libs.helpers.layout import (
+    layout_render_layer,
+)
+from RenderManager2.render_manager2.render.libs.helpers.nk_script import (
+    nk_render_layer,
+)
+from RenderManager2.render_manager2.render.render_layer import Render
+
+ROLES = ['BG', 'MG', 'FG', 'ALL', 'VFX', 'VOL']
+LAYERS = 30
+AOVS = 25
+REPEAT = 3
+
+
+def render_layers():
+    """Return LAYERS BTY render layers of AOVS aovs with frame data in memory."""
+    renders = []
+    for i in range(LAYERS):
+        name = f'RND_{ROLES[i % len(ROLES)]}_L{i:02d}_BTY'
+        aovs = [f'aov{aov:02d}' for aov in range(AOVS)]
+        frame_sets = {
+            aov: FrameSet.from_files(
+                [f'{name}_{aov}_{frame}.exr' for frame in range(1001, 1101)]
+            )
+            for aov in aovs
+        }
+        path = f'I:/BENCH/CG/{name}/LGT_KAF_010_v0001'
+        renders.append(Render(path, name, aovs, {}, frame_sets=frame_sets))
+    return renders
+
+
+def time_engine(renders, engine):
+    """Return seconds taken by Create.load_all, deleting the nodes it created."""
+    from RenderManager2.render_manager2.render.libs.create import Create
+
+    before = set(nuke.allNodes())
+    start = time.perf_counter()
+    Create().load_all(renders, engine=engine)
+    elapsed = time.perf_counter() - start
+
+    for node in nuke.allNodes():
+        if node not in before:
+            nuke.delete(node)
+    return elapsed
+
+
+def main():
+    renders = render_layers()
+    reads = LAYERS * AOVS
+
+    def generate():
+        for row, render in enumerate(renders, 1):
+            nk_render_layer(render, row, row, layout_render_layer(render, row, row))
+
+    generate_time = min(timeit.repeat(generate, number=1, repeat=REPEAT))
+    print(
+        f'{LAYERS} layers, {reads} reads | .nk text generated in'
+        f' {generate_time * 1000:8.3f} ms'
+    )
+
+    if nuke is None or not hasattr(nuke, 'nodes'):
+        print('Run inside Nuke to compare the creation engines.')
+        return
+
+    knobs_time = min(time_engine(renders, 'knobs') for _ in range(REPEAT))
+    nk_time = min(time_engine(renders, 'nk') for _ in range(REPEAT))
+    print(
+        f'knobs engine {knobs_time:8.3f} s | nk engine {nk_time:8.3f} s'
+        f' | x{knobs_time / nk_time:.1f} faster'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Micro benchmark: streaming info extractor vs full json parse.
+
+Run with: python -m tests.bench_info_extractor
+"""
+
+import os
+import tempfile
+import timeit
+
+from backpack.json_utils import json_load, json_save
+from RenderManager2.render_manager2.core.disk_collector import get_user_and_reference
+from RenderManager2.render_manager2.core.libs.info_extractor import (
+    extract_user_and_references,
+)
+
+REPEAT = 20
+
+
+def scene_info(references: int) -> dict:
+    files = [
+        f'Reference Node: asset{i:04d}RN FilePath: G:/assets/asset{i:04d}/asset_v001.abc'
+        for i in range(references)
+    ]
+    return {
+        '_about': {'package': 'python-backpack', 'version': '1.1.4'},
+        'arcane': ['STRING arcane_project Bench', f'STRING references {files}'],
+        'system': {
+            'PC': 'WS01',
+            'User': 'jdoe',
+            'time': {f'step_{i}': i for i in range(references)},
+        },
+    }
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        for references in (10, 1000, 10000):
+            info_path = os.path.join(folder, f'info_{references}.json')
+            json_save(scene_info(references), info_path)
+
+            full = extract = None
+
+            def full_parse():
+                nonlocal full
+                full = get_user_and_reference(json_load(info_path))
+
+            def streaming():
+                nonlocal extract
+                extract = extract_user_and_references(info_path)
+
+            full_time = min(timeit.repeat(full_parse, number=1, repeat=REPEAT))
+            stream_time = min(timeit.repeat(streaming, number=1, repeat=REPEAT))
+            assert full == extract
+
+            print(
+                f'{references:>6} references | full parse {full_time * 1000:8.3f} ms'
+                f' | streaming {stream_time * 1000:8.3f} ms'
+                f' | x{full_time / stream_time:.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Micro benchmark: layout of a full shot without Nuke.
+
+Compares the planned layout with the previous create-then-move positions,
+where every read position was written, read back and written again.
+
+Run with: python -m tests.bench_layout
+"""
+
+import timeit
+
+from RenderManager2.render_manager2.render.libs.helpers.layout import (
+    layout_render_layer,
+)
+from RenderManager2.render_manager2.render.render_layer import Render
+
+from .test_layout import _created_then_moved
+
+ROLES = ['BG', 'MG', 'FG', 'ALL', 'VFX', 'VOL']
+LAYERS = 300
+AOVS = 25
+REPEAT = 5
+
+
+def render_layers():
+    """Return LAYERS render layers of AOVS aovs, spread over roles and suffixes."""
+    renders = []
+    for i in range(LAYERS):
+        suffix = ('BTY', 'TECH', 'CRYPTO')[i % 3]
+        name = f'RND_{ROLES[i % len(ROLES)]}_L{i:03d}_{suffix}'
+        aovs = [f'aov{aov}' for aov in range(AOVS)]
+        renders.append(Render(f'/CG/{name}/LGT_KAF_010_v0001', name, aovs, {}))
+    return renders
+
+
+def main():
+    renders = render_layers()
+
+    def planned():
+        for row, render in enumerate(renders, 1):
+            layout_render_layer(render, row, row)
+
+    def previous():
+        for row, render in enumerate(renders, 1):
+            _created_then_moved(render.suffix(), render.aovs(), render.rol_main(), row)
+
+    planned_time = min(timeit.repeat(planned, number=1, repeat=REPEAT))
+    previous_time = min(timeit.repeat(previous, number=1, repeat=REPEAT))
+
+    reads = LAYERS * AOVS
+    print(
+        f'{LAYERS} layers, {reads} reads | planned {planned_time * 1000:8.3f} ms'
+        f' | create then move {previous_time * 1000:8.3f} ms'
+        f' | position knob calls in Nuke: {2 * reads} planned,'
+        f' {5 * reads} create then move'
+    )
+
+
+if __name__ == '__main__':
+    main()
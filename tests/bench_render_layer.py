@@ -0,0 +1,96 @@
+"""Micro benchmark: memory and accessor throughput of 10k Render objects.
+
+Compares the slotted, pre-parsed Render with the previous per-call parsing.
+
+Run with: python -m tests.bench_render_layer
+"""
+
+import os
+import timeit
+import tracemalloc
+
+from RenderManager2.render_manager2.render.render_layer import Render
+
+RENDERS = 10000
+REPEAT = 5
+AOVS = ['beauty', 'AO', 'emission', 'specular', 'diffuse', 'sss', 'Z', 'N']
+
+
+class PreviousRender:
+    """Render name and path parsing as it was before, parsed on every call."""
+
+    def __init__(self, path, name, aovs, info_json):
+        self._path = path
+        self._name = name
+        self._aovs = aovs
+        self._info_json = info_json
+        self._aov_files = {}
+        self._aov_data = {}
+
+    def name(self):
+        return self._name
+
+    def suffix(self):
+        return self._name.split('_')[-1]
+
+    def rol_layer(self):
+        return ('_').join(self._name.split('_')[1:-1])
+
+    def rol_main(self):
+        return self._name.split('_')[1]
+
+    def path(self):
+        return self._path.replace('\\', '/')
+
+    def version(self):
+        return os.path.split(self.path())[-1]
+
+    def int_version(self):
+        version = os.path.split(self.path())[-1].rsplit('_', 2)[-1]
+        version = ''.join([i for i in version if i.isdigit()])
+        return int(version) if version else 0
+
+
+def render_args():
+    """Return constructor arguments of RENDERS renders, 100 versions per layer."""
+    args = []
+    for i in range(RENDERS):
+        name = f'RND_L{i // 100:03d}_BTY'
+        path = f'I:/GizmoRD/FRAMES/DEV/030/CG/{name}/LGT_KAF_010_v{i % 100:04d}'
+        # aov names come from separate directory listings, equal but not shared
+        aovs = [''.join(list(aov)) for aov in AOVS]
+        args.append((path, name, aovs, {}))
+    return args
+
+
+def measure(cls):
+    # scan data is temporary, only what the renders keep alive is measured
+    tracemalloc.start()
+    renders = [cls(*args) for args in render_args()]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def access():
+        renders.sort(key=lambda r: (r.name(), -r.int_version()))
+        for render in renders:
+            render.suffix(), render.rol_layer(), render.rol_main()
+            render.path(), render.version()
+
+    access_time = min(timeit.repeat(access, number=1, repeat=REPEAT))
+    return memory, access_time
+
+
+def main():
+    previous_memory, previous_time = measure(PreviousRender)
+    memory, access_time = measure(Render)
+
+    print(
+        f'{RENDERS} renders | previous {previous_memory / 1024:9.1f} KiB'
+        f' {previous_time * 1000:8.3f} ms'
+        f' | slotted {memory / 1024:9.1f} KiB {access_time * 1000:8.3f} ms'
+        f' | x{previous_time / access_time:.1f} faster'
+    )
+
+
+if __name__ == '__main__':
+    main()
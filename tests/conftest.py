@@ -80,3 +80,68 @@ def read_node_outdated_version(monkeypatch):
 def shot_render_frames_path():
     '''mock render object for tests'''
     return 'I:/GizmoRD/FRAMES/PYTEST/030/CG'
+
+
+def render_paths(renders_by_role) -> list:
+    '''paths of the renders of a collector result, in role order'''
+    return [r.path() for layers in renders_by_role.values() for r in layers]
+
+
+def render_summary(renders_by_role) -> list:
+    '''comparable data of a collector result, stubs only have role and path'''
+    summary = []
+    for role, renders in renders_by_role.items():
+        for render in renders:
+            if not render.is_resolved():
+                summary.append((role, render.path(), None))
+                continue
+
+            frames = {aov: str(render.frame_set(aov)) for aov in render.aovs()}
+            summary.append(
+                (
+                    role,
+                    render.path(),
+                    sorted(render.aovs()),
+                    render.user(),
+                    render.abc_versions(),
+                    frames,
+                )
+            )
+    return summary
+
+
+def _write_frames(folder, prefix: str, frames: list):
+    folder.mkdir(parents=True, exist_ok=True)
+    for frame in frames:
+        (folder / f'{prefix}_{frame:04d}.exr').write_bytes(b'')
+
+
+@pytest.fixture(scope='function')
+def shot_tree(tmp_path):
+    '''build a small shot render tree on disk and return its path'''
+    cg = tmp_path / 'CG'
+    frames = list(range(1001, 1011))
+
+    bty = cg / 'RND_FG_BTY'
+    for version in ('LGT_KAF_010_v0025', 'LGT_KAF_010_v0026'):
+        for aov in ('AO', 'beauty', 'emission'):
+            _write_frames(bty / version / aov, f'RND_FG_BTY_{aov}', frames)
+        (bty / version / 'scene_info.json').write_text(
+            '{"system": {"User": "jdoe"}, "arcane": ["STRING references []"]}'
+        )
+    # empty beauty, invalid version
+    (bty / 'LGT_KAF_010_v0027' / 'beauty').mkdir(parents=True)
+
+    crypto = cg / 'RND_FG_CRYPTO' / 'LGT_KAF_010_v0026'
+    for aov in ('crypto_asset', 'crypto_object', 'extra'):
+        _write_frames(crypto / aov, f'RND_FG_CRYPTO_{aov}', frames)
+
+    tech = cg / 'RND_MG_TECH' / 'VFX_KAF_010_v0003'
+    for aov in ('Z', 'N'):
+        _write_frames(tech / aov, f'RND_MG_TECH_{aov}', frames)
+
+    # invalid folders
+    (cg / 'RND_MG_BAD' / 'LGT_KAF_010_v0001').mkdir(parents=True)
+    (cg / 'IGNORE').mkdir()
+
+    return str(cg).replace('\\', '/')
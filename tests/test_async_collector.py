@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import pytest
+from RenderManager2.render_manager2.core import async_collector
+from RenderManager2.render_manager2.core.async_collector import (
+    CancelToken,
+    collect_render_layers_async,
+    iter_render_layers,
+)
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layer,
+    collect_render_layers_by_role,
+)
+
+
+def test_async_matches_collector(shot_tree):
+    renders = asyncio.run(collect_render_layers_async(shot_tree))
+    expected = collect_render_layers_by_role(shot_tree)
+
+    assert sorted((r.path(), r.user()) for r in renders) == sorted(
+        (r.path(), r.user()) for layers in expected.values() for r in layers
+    )
+    assert asyncio.run(collect_render_layers_async(shot_tree + '/missing')) == []
+
+
+def test_async_cancel_and_timeout(shot_tree, monkeypatch):
+    def slow_layer(path, name, **kwargs):
+        if name == 'RND_FG_CRYPTO':
+            time.sleep(0.5)
+        return collect_render_layer(path, name, **kwargs)
+
+    monkeypatch.setattr(async_collector, 'collect_render_layer', slow_layer)
+
+    renders = asyncio.run(collect_render_layers_async(shot_tree, timeout=0.2))
+    assert {r.name() for r in renders} == {'RND_FG_BTY', 'RND_MG_TECH'}
+
+    async def cancel_after_first():
+        token = CancelToken()
+        names = []
+        async for render in iter_render_layers(shot_tree, token=token):
+            names.append(render.name())
+            token.cancel()
+        return names
+
+    assert len(asyncio.run(cancel_after_first())) == 1
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
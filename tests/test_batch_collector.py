@@ -0,0 +1,35 @@
+import os
+import shutil
+
+import pytest
+from RenderManager2.render_manager2.core.batch_collector import (
+    collect_sequence,
+    collect_shots,
+)
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.tests.conftest import render_summary
+
+
+def test_collect_shots(shot_tree):
+    sequence = os.path.dirname(shot_tree)
+    paths = [shot_tree]
+    for shot in ('010', '020'):
+        paths.append(shutil.copytree(shot_tree, os.path.join(sequence, shot, 'CG')))
+    shutil.rmtree(os.path.join(paths[-1], 'RND_MG_TECH'))
+    paths.append(os.path.join(sequence, 'missing', 'CG'))
+
+    results = dict(collect_shots(paths, shot_workers=2, workers=3))
+    assert sorted(results) == sorted(paths)
+    for path in paths:
+        assert render_summary(results[path]) == render_summary(
+            collect_render_layers_by_role(path)
+        )
+    assert results[paths[-2]]['MG'] == []
+
+    assert list(collect_sequence(paths[::-1])) == paths[::-1]
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
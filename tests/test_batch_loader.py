@@ -0,0 +1,89 @@
+import pytest
+from RenderManager2.render_manager2.render.libs.helpers import backdrops
+from RenderManager2.render_manager2.render.libs.helpers.backdrops import (
+    BackdropState,
+    get_next_row_container,
+    get_next_row_subcontainer,
+    plan_layers,
+)
+from RenderManager2.render_manager2.render.render_layer import Render
+
+from .conftest import DictValue, MockNuke
+
+
+class KnobBackdrop:
+    def __init__(self, **knobs):
+        self._knobs = {key: DictValue(key, value) for key, value in knobs.items()}
+        self.reads = 0
+
+    def __getitem__(self, key: str):
+        self.reads += 1
+        if key not in self._knobs:
+            raise NameError(key)
+        return self._knobs[key]
+
+
+def _container(rol_main, rol_layer, row):
+    return KnobBackdrop(container=True, rol_main=rol_main, rol_layer=rol_layer, row=row)
+
+
+def _subcontainer(name, row):
+    return KnobBackdrop(subcontainer=True, name_layer=name, row=row)
+
+
+def _render(name):
+    return Render(f'/CG/{name}/LGT_KAF_010_v0026', name, ['beauty'], {})
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    nodes = [
+        KnobBackdrop(label='notes'),
+        _container('FG', 'FG', 1),
+        _container('FG', 'FG_CHAR', 2),
+        _subcontainer('RND_FG_CHAR_BTY', 3),
+        _container('BG', 'BG', 1),
+    ]
+    monkeypatch.setattr(backdrops, 'nuke', MockNuke(nodes))
+    return nodes
+
+
+def test_state_matches_per_layer_queries(scene):
+    state = BackdropState()
+    for name in ('RND_FG_BTY', 'RND_FG_CHAR_BTY', 'RND_BG_TECH', 'RND_MG_BTY'):
+        render = _render(name)
+        assert state.next_row(render.rol_main()) == get_next_row_container(render)
+        container = state.containers.get(render.rol_layer())
+        expected = get_next_row_subcontainer(render)
+        assert (container[1] if container else None) == expected
+
+
+def test_plan_layers(scene):
+    names = [
+        'RND_FG_BTY',
+        'RND_FG_CHAR_BTY',
+        'RND_MG_TECH',
+        'RND_MG_BTY',
+        'RND_FG_ENV_BTY',
+    ]
+    plans = plan_layers([_render(name) for name in names], BackdropState())
+    # backdrop knobs are read once, not once per layer
+    assert max(node.reads for node in scene) <= 4
+
+    summary = [
+        (p.render.name(), p.container_row, p.new_container, p.row, len(p.subcontainers))
+        for p in plans
+    ]
+    assert summary == [
+        ('RND_FG_BTY', 1, False, 1, 0),
+        # the previous subcontainer keeps its row
+        ('RND_FG_CHAR_BTY', 2, False, 3, 1),
+        ('RND_MG_TECH', 1, True, 1, 0),
+        # same rol_layer, same planned container
+        ('RND_MG_BTY', 1, False, 1, 0),
+        ('RND_FG_ENV_BTY', 3, True, 3, 0),
+    ]
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+from RenderManager2.render_manager2.core import disk_collector
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+    resolve_versions,
+)
+from RenderManager2.render_manager2.core.disk_walker import ScanStats, walk_render_tree
+
+
+def test_walker_render_tree(shot_tree):
+    versions = walk_render_tree(shot_tree)
+
+    assert [(v.name, v.path, sorted(v.aovs)) for v in versions] == [
+        (
+            'RND_FG_CRYPTO',
+            f'{shot_tree}/RND_FG_CRYPTO/LGT_KAF_010_v0026',
+            ['crypto_asset', 'crypto_object'],
+        ),
+        (
+            'RND_FG_BTY',
+            f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0026',
+            ['AO', 'beauty', 'emission'],
+        ),
+        (
+            'RND_FG_BTY',
+            f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0025',
+            ['AO', 'beauty', 'emission'],
+        ),
+        ('RND_MG_TECH', f'{shot_tree}/RND_MG_TECH/VFX_KAF_010_v0003', ['N', 'Z']),
+    ]
+    assert [v.role for v in versions] == ['FG', 'FG', 'FG', 'MG']
+
+
+def test_walker_reads_each_directory_once(shot_tree, monkeypatch):
+    listed = []
+    scandir = os.scandir
+
+    def counted_scandir(path):
+        listed.append(os.path.normpath(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', counted_scandir)
+    stats = ScanStats()
+    walk_render_tree(shot_tree, stats)
+
+    assert len(listed) == len(set(listed))
+    assert stats.scandir == len(listed)
+    assert stats.stat == 0
+
+
+def test_collector_by_role(shot_tree, monkeypatch):
+    monkeypatch.setattr(disk_collector.os, 'listdir', pytest.fail)
+    renders = collect_render_layers_by_role(shot_tree)
+
+    assert [r.name() for r in renders['FG']] == [
+        'RND_FG_CRYPTO',
+        'RND_FG_BTY',
+        'RND_FG_BTY',
+    ]
+    assert renders['FG'][1].int_version() == 26
+    assert renders['FG'][1].user() == 'jdoe'
+    assert sorted(renders['FG'][0].aovs()) == ['crypto_asset', 'crypto_object']
+    assert renders['MG'][0].path().endswith('RND_MG_TECH/VFX_KAF_010_v0003')
+
+    missing = collect_render_layers_by_role(os.path.join(shot_tree, 'missing'))
+    assert missing.complete and not any(missing.values())
+
+
+def test_collector_threaded_keeps_serial_order(shot_tree):
+    serial = collect_render_layers_by_role(shot_tree)
+    stats = ScanStats()
+    threaded = collect_render_layers_by_role(shot_tree, stats=stats, workers=4)
+
+    assert stats.scandir > 0
+    for role, renders in serial.items():
+        assert [(r.path(), r.aovs(), r.user()) for r in threaded[role]] == [
+            (r.path(), r.aovs(), r.user()) for r in renders
+        ]
+
+
+def test_collector_latest_only(shot_tree):
+    layer = os.path.join(shot_tree, 'RND_FG_BTY')
+    os.makedirs(os.path.join(layer, 'LGT_KAF_010_v0020', 'beauty'))
+
+    stats = ScanStats()
+    renders = collect_render_layers_by_role(shot_tree, stats, latest_only=True)
+    full = ScanStats()
+    collect_render_layers_by_role(shot_tree, full)
+    assert stats.scandir < full.scandir
+
+    bty = [r for r in renders['FG'] if r.name() == 'RND_FG_BTY']
+    assert [r.int_version() for r in bty] == [26, 25, 20]
+    assert [r.is_resolved() for r in bty] == [True, False, False]
+
+    versions = resolve_versions(renders, 'RND_FG_BTY', workers=2)
+    assert [r.int_version() for r in versions] == [26, 25]
+    assert versions[1].is_resolved() and versions[1].user() == 'jdoe'
+    assert len(renders['FG']) == 3
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
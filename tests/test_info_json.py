@@ -0,0 +1,146 @@
+import json
+import os
+
+import pytest
+from backpack.json_utils import json_save
+from RenderManager2.render_manager2.core import disk_collector
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+    get_user_and_reference,
+)
+from RenderManager2.render_manager2.core.info_cache import INFO_CACHE, InfoCache
+from RenderManager2.render_manager2.core.libs.info_extractor import (
+    extract_user_and_references,
+)
+
+REFERENCES = [
+    'Reference Node: charRN FilePath: G:/assets/char/char_v012.abc',
+    'Reference Node: propRN FilePath: G:/assets/prop/prop_v003.ma',
+    'Reference Node: shadersRN FilePath: G:/assets/char/char_shaders_v001.ma',
+    'Reference Node: setRN FilePath: G:/assets/set/set_v001.mb',
+    'Reference Node: camRN FilePath: G:/shots/cam_v002.abc',
+]
+
+
+def scene_info(references: list) -> dict:
+    return {
+        '_about': {'package': 'python-backpack', 'version': '1.1.4'},
+        'arcane': [
+            'STRING arcane_project Test',
+            f'STRING references {references}',
+            'STRING arcane_entity_type shot',
+        ],
+        'system': {'PC': 'WS01', 'User': 'j\u00f6e', 'time': {'User': 'not this'}},
+    }
+
+
+@pytest.fixture(scope='function')
+def count_json_load(monkeypatch):
+    loaded = []
+
+    def counted_extract(path):
+        loaded.append(path)
+        return extract_user_and_references(path)
+
+    INFO_CACHE.clear()
+    monkeypatch.setattr(disk_collector, 'extract_user_and_references', counted_extract)
+    return loaded
+
+
+def test_info_is_deferred_and_cached(shot_tree, count_json_load):
+    renders = collect_render_layers_by_role(shot_tree, defer_info=True)
+    assert count_json_load == []
+
+    render = renders['FG'][1]
+    assert render.user() == 'jdoe'
+    assert render.abc_versions() == []
+    assert len(count_json_load) == 1
+
+    # a new scan of the same files does not parse them again
+    renders = collect_render_layers_by_role(shot_tree)
+    assert [r.user() for r in renders['FG']] == ['John Doe', 'jdoe', 'jdoe']
+    assert len(count_json_load) == 2
+
+    # a changed info file is parsed again
+    info_path = os.path.join(render.path(), 'scene_info.json')
+    with open(info_path, 'w') as f:
+        f.write('{"system": {"User": "other_user"}, "arcane": []}')
+    renders = collect_render_layers_by_role(shot_tree)
+    assert renders['FG'][1].user() == 'other_user'
+    assert len(count_json_load) == 3
+
+
+@pytest.mark.parametrize('references', [REFERENCES, REFERENCES[:1], []])
+@pytest.mark.parametrize('indent', [4, None])
+def test_extractor_matches_full_parse(tmp_path, references, indent):
+    data = scene_info(references)
+    info_path = str(tmp_path / 'scene_info.json')
+    if indent:
+        json_save(data, info_path)
+    else:
+        with open(info_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    assert extract_user_and_references(info_path) == get_user_and_reference(data)
+
+
+@pytest.mark.parametrize('indent', [4, None])
+def test_extractor_double_quoted_references(tmp_path, indent):
+    # json style list, and a python repr item quoted with " for its apostrophe
+    references = [
+        json.dumps(REFERENCES),
+        str(REFERENCES[:1] + ["Reference Node: obrienRN FilePath: G:/o'brien_v001.abc"]),
+    ]
+    expected = [
+        ['char_v012.abc', 'prop_v003.ma', 'cam_v002.abc'],
+        ['char_v012.abc', "o'brien_v001.abc"],
+    ]
+
+    info_path = str(tmp_path / 'scene_info.json')
+    for line, abc_versions in zip(references, expected):
+        data = scene_info([])
+        data['arcane'][1] = f'STRING references {line}'
+        with open(info_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent)
+
+        assert extract_user_and_references(info_path)['abc_versions'] == abc_versions
+
+
+@pytest.mark.parametrize('indent', [2, '\t'])
+def test_extractor_other_indent(tmp_path, indent):
+    data = scene_info(REFERENCES)
+    info_path = str(tmp_path / 'scene_info.json')
+    with open(info_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+
+    result = extract_user_and_references(info_path)
+    assert result == get_user_and_reference(data)
+    assert result['user'] == 'j\u00f6e'
+
+
+def test_extractor_result():
+    assert extract_user_and_references('missing.json') == {
+        'user': 'Unknown',
+        'abc_versions': [],
+    }
+
+
+def test_info_cache_lru(tmp_path):
+    cache = InfoCache(max_size=2)
+    for i in range(3):
+        (tmp_path / f'v{i}').mkdir()
+        (tmp_path / f'v{i}' / 'info.json').write_text('{}')
+
+    def loader():
+        return {'user': 'jdoe', 'abc_versions': [], 'system': {'huge': 'dump'}}
+
+    for i in range(3):
+        data = cache.get(str(tmp_path / f'v{i}'), ('info.json',), loader)
+        assert data == {'user': 'jdoe', 'abc_versions': []}
+
+    assert len(cache) == 2
+    assert cache.get(str(tmp_path / 'v2'), ('info.json',), pytest.fail)['user'] == 'jdoe'
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,78 @@
+import pytest
+from RenderManager2.render_manager2.render.libs.helpers.config import (
+    ANCHOR_READ,
+    BACKDROP_SIZE,
+    OFFSET_BDROP_X,
+    OFFSET_BDROP_Y,
+    OFFSET_BORDER_BACKDROP,
+    OFFSET_READ_X,
+    POSITION_READ,
+    ROL_POSITION_X,
+)
+from RenderManager2.render_manager2.render.libs.helpers.layout import (
+    container_position,
+    layout_render_layer,
+    plan_layout,
+    read_positions,
+)
+from RenderManager2.render_manager2.render.render_layer import Render
+
+
+def _created_then_moved(suffix, aovs, rol_main, row):
+    """Read positions of create_all_aovs followed by _move_backdrop."""
+    positions, offset_x, second_line = [], 0, False
+    for _ in aovs:
+        pos_read_x, pos_read_y = POSITION_READ[suffix]
+        if second_line:
+            pos_read_y = POSITION_READ[suffix][1] + 150
+        if offset_x > pos_read_x:
+            pos_read_x = offset_x
+        positions.append((pos_read_x, pos_read_y))
+        offset_x = pos_read_x + ANCHOR_READ + OFFSET_READ_X
+        if pos_read_x > BACKDROP_SIZE['BTY']['bdwidth'] + OFFSET_BORDER_BACKDROP:
+            offset_x = 0
+            second_line = True
+
+    move_x = OFFSET_BDROP_X * ROL_POSITION_X[rol_main]
+    move_y = OFFSET_BDROP_Y * row
+    return [(x + move_x, y + move_y) for x, y in positions]
+
+
+@pytest.mark.parametrize('count', [1, 5, 25, 60])
+@pytest.mark.parametrize('suffix', ['BTY', 'TECH', 'CRYPTO'])
+def test_reads_match_previous_layout(suffix, count):
+    aovs = [f'aov{i}' for i in range(count)]
+    for rol_main, row in (('BG', 1), ('FG', 3)):
+        positions = read_positions(suffix, aovs, rol_main, row)
+        assert positions == _created_then_moved(suffix, aovs, rol_main, row)
+
+
+def test_layout_render_layer():
+    render = Render('/CG/RND_FG_BTY/LGT_KAF_010_v0026', 'RND_FG_BTY', ['a', 'b'], {})
+    layout = layout_render_layer(render, 1, 2)
+
+    assert layout.container == container_position('FG', 1) == (7800, -2300)
+    assert layout.subcontainer == (100 + 7800, -500 - 2400)
+    assert layout.reads == [(180 + 7800, -360 - 2400), (290 + 7800, -360 - 2400)]
+
+    # layers without backdrop type only get a container
+    render = Render('/CG/RND_FG_ENV/LGT_KAF_010_v0026', 'RND_FG_ENV', ['a'], {})
+    layout = layout_render_layer(render, 1, 1)
+    assert layout.subcontainer is None and layout.reads == []
+
+
+def test_plan_layout():
+    class Plan:
+        def __init__(self, name, container_row, row):
+            self.render = Render(f'/CG/{name}/LGT_KAF_010_v0001', name, ['a'], {})
+            self.container_row, self.row = container_row, row
+
+    layouts = plan_layout([Plan('RND_BG_BTY', 1, 1), Plan('RND_BG_TECH', 1, 2)])
+    assert [layout.subcontainer for layout in layouts] == [
+        (100 + 2600, -500 - 1200),
+        (100 + 2600, -850 - 2400),
+    ]
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,119 @@
+import re
+
+import pytest
+from RenderManager2.render_manager2.core.disk_collector import collect_render_layer
+from RenderManager2.render_manager2.render.libs.helpers import knobs
+from RenderManager2.render_manager2.render.libs.helpers.knobs import (
+    add_user_knobs,
+    backdrop_knobs,
+    read_knobs,
+    read_values,
+)
+from RenderManager2.render_manager2.render.libs.helpers.layout import (
+    layout_render_layer,
+)
+from RenderManager2.render_manager2.render.libs.helpers.nk_script import (
+    nk_render_layer,
+    nk_value,
+)
+
+NODE = re.compile(r'^(\w+) \{\n(.*?)\n\}$', re.MULTILINE | re.DOTALL)
+USER_KNOB = re.compile(r'addUserKnob \{(\d+) (\w+)(?: l \w+)?( [-+]STARTLINE)?\}')
+
+
+class FakeKnob:
+    def __init__(self, name, label=None):
+        self.name, self.value, self.startline = name, None, True
+
+    def setValue(self, value):  # noqa: N802
+        self.value = value
+
+    def clearFlag(self, flag):  # noqa: N802
+        self.startline = False
+
+
+class FakeNuke:
+    String_Knob = Int_Knob = Boolean_Knob = Tab_Knob = FakeKnob
+    STARTLINE = 1
+
+
+class FakeNode(list):
+    def addKnob(self, knob):  # noqa: N802
+        self.append(knob)
+
+
+def parse_nodes(text):
+    """Return (class, knob values, user knob names) of each node of a .nk text."""
+    nodes = []
+    for node_class, body in NODE.findall(text):
+        values, user = {}, []
+        for line in body.splitlines():
+            line = line.strip()
+            match = USER_KNOB.match(line)
+            if match:
+                user.append((match.group(2), match.group(3)))
+                continue
+            name, value = line.split(' ', 1)
+            values[name] = value
+        nodes.append((node_class, values, user))
+    return nodes
+
+
+def knob_engine(knob_list, monkeypatch):
+    """Return (name, .nk value, startline) of user knobs made one by one."""
+    monkeypatch.setattr(knobs, 'nuke', FakeNuke)
+    node = FakeNode()
+    add_user_knobs(node, knob_list)
+    return [(k.name, k.value, k.startline) for k in node[1:]]
+
+
+@pytest.fixture
+def render(shot_tree):
+    return collect_render_layer(shot_tree, 'RND_FG_BTY')[0]
+
+
+def test_nk_value():
+    assert nk_value(True) == 'true' and nk_value(False) == 'false'
+    assert nk_value(1001) == '1001'
+    assert nk_value('BTY v[value version]') == r'"BTY v\[value version]"'
+    assert nk_value('a "b" $c\\') == r'"a \"b\" \$c\\"'
+
+
+def test_nk_render_layer_matches_knob_engine(render, monkeypatch):
+    layout = layout_render_layer(render, 1, 2)
+    nodes = parse_nodes(nk_render_layer(render, 1, 2, layout))
+
+    assert [node[0] for node in nodes] == ['BackdropNode', 'BackdropNode'] + ['Read'] * 3
+    container, subcontainer, *reads = nodes
+
+    expected = [
+        (container, backdrop_knobs(render, 1, container=True), layout.container),
+        (subcontainer, backdrop_knobs(render, 2), layout.subcontainer),
+    ]
+    for aov_name, read, position in zip(render.aovs(), reads, layout.reads):
+        expected.append((read, read_knobs(render, aov_name), position))
+        for knob_name, value in read_values(render, aov_name).items():
+            assert read[1][knob_name] == nk_value(value)
+        assert read[1]['name'] == f'FG_{aov_name}_00'
+
+    for (_, values, user), knob_list, position in expected:
+        made = knob_engine(knob_list, monkeypatch)
+        assert [name for name, _ in user[1:]] == [name for name, _, _ in made]
+        for (name, flag), (_, value, startline) in zip(user[1:], made):
+            assert values[name] == nk_value(value)
+            assert (flag != ' -STARTLINE') == startline
+        assert (int(values['xpos']), int(values['ypos'])) == position
+
+    assert subcontainer[1]['label'] == r'"BTY v\[value version]"'
+    assert container[1]['tile_color'] == f'{1716201727:#010x}'
+
+
+def test_nk_render_layer_without_container(render):
+    layout = layout_render_layer(render, 1, 1)
+    nodes = parse_nodes(nk_render_layer(render, 1, 1, layout, new_container=False))
+    assert [node[0] for node in nodes] == ['BackdropNode'] + ['Read'] * 3
+    assert nodes[0][1]['subcontainer'] == 'true'
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+from RenderManager2.render_manager2.render import render_layer
+from RenderManager2.render_manager2.render.libs.helpers.reads import prefetch_aov_data
+from RenderManager2.render_manager2.render.render_layer import Render
+
+
+def test_prefetch_reads_all_aovs_once(shot_tree, monkeypatch):
+    bty = Render(
+        f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0026',
+        'RND_FG_BTY',
+        ['AO', 'beauty', 'emission', 'missing'],
+        {},
+    )
+    tech = Render(
+        f'{shot_tree}/RND_MG_TECH/VFX_KAF_010_v0003', 'RND_MG_TECH', ['Z', 'N'], {}
+    )
+    stub = Render(f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0025', 'RND_FG_BTY', None, {})
+
+    listed = []
+
+    def listdir(path):
+        listed.append(path)
+        return os_listdir(path)
+
+    os_listdir = os.listdir
+    monkeypatch.setattr(render_layer.os, 'listdir', listdir)
+
+    assert prefetch_aov_data([bty, tech, stub], workers=4) == 5
+    assert len(listed) == 6
+
+    # node creation only reads memory
+    listed.clear()
+    data = bty.get_aov_data('beauty')
+    assert (data['first'], data['last']) == (1001, 1010)
+    assert data['files'] == 'RND_FG_BTY_beauty'
+    assert tech.frame_range() == '1001-1010'
+    assert listed == []
+
+    with pytest.raises(OSError):
+        bty.get_aov_data('missing')
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
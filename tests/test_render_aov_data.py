@@ -0,0 +1,115 @@
+import os
+import pickle
+
+import pytest
+from RenderManager2.render_manager2.core import scan_index
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.render import render_layer
+from RenderManager2.render_manager2.render.frame_set import FrameSet
+
+
+@pytest.fixture(scope='function')
+def count_listdir(monkeypatch):
+    listed = []
+    listdir = os.listdir
+
+    def counted_listdir(path):
+        listed.append(os.path.basename(path))
+        return listdir(path)
+
+    monkeypatch.setattr(render_layer.os, 'listdir', counted_listdir)
+    return listed
+
+
+def test_aov_data_is_cached(shot_tree, count_listdir):
+    render = collect_render_layers_by_role(shot_tree)['FG'][1]
+
+    # beauty was listed by the scan, AO is listed once on first access
+    for _ in range(3):
+        assert render.get_aov_data('beauty')['range'] == '1001-1010'
+        assert render.get_aov_data('AO')['frames'] == 10
+        assert render.frame_range() == '1001-1010'
+    assert count_listdir == ['AO']
+
+    with open(os.path.join(render.path(), 'AO', 'RND_FG_BTY_AO_1011.exr'), 'w'):
+        pass
+    assert render.get_aov_data('AO')['frames'] == 10
+
+    render.invalidate('AO')
+    assert render.get_aov_data('AO')['frames'] == 11
+    assert count_listdir == ['AO', 'AO']
+
+    render.invalidate()
+    render.get_aov_data('beauty')
+    assert count_listdir == ['AO', 'AO', 'beauty']
+
+
+def test_frame_set_from_unsorted_files():
+    files = [f'RND_FG_BTY_AO_{frame:04d}.exr' for frame in (1010, 1001, 1003, 1002, 1007)]
+    files += ['RND_FG_BTY_AO_1005.exr', 'thumbs.db', 'RND_FG_BTY_AO_1004.tmp']
+    frame_set = FrameSet.from_files(files)
+
+    assert frame_set.name == 'RND_FG_BTY_AO'
+    assert frame_set.extension == 'exr'
+    assert frame_set.padding == 4
+    assert (len(frame_set), frame_set.first, frame_set.last) == (6, 1001, 1010)
+    assert frame_set.ranges() == [(1001, 1003), (1005, 1005), (1007, 1007), (1010, 1010)]
+    assert frame_set.gaps() == [(1004, 1004), (1006, 1006), (1008, 1009)]
+    assert frame_set.missing() == [1004, 1006, 1008, 1009]
+    assert not frame_set.is_complete()
+    assert 1005 in frame_set and 1008 not in frame_set and 999 not in frame_set
+    assert list(frame_set) == [1001, 1002, 1003, 1005, 1007, 1010]
+    assert str(frame_set) == '1001-1003,1005,1007,1010'
+    assert frame_set.frame_range() == '1001-1010'
+
+    assert FrameSet.from_files(['thumbs.db']) is None
+    assert FrameSet.from_files(['beauty_0001.exr', 'beauty_0002.exr']).is_complete()
+
+
+def test_get_aov_data_with_gaps(shot_tree):
+    render = collect_render_layers_by_role(shot_tree)['FG'][1]
+    os.remove(os.path.join(render.path(), 'AO', 'RND_FG_BTY_AO_1001.exr'))
+    os.remove(os.path.join(render.path(), 'AO', 'RND_FG_BTY_AO_1005.exr'))
+
+    assert render.get_aov_data('AO') == {
+        'files': 'RND_FG_BTY_AO',
+        'frames': 8,
+        'first': 1002,
+        'last': 1010,
+        'range': '1002-1010',
+        'extension': 'exr',
+    }
+    assert render.frame_set('AO').missing() == [1005]
+
+
+def test_aov_folders_are_read_through_the_index(shot_tree, count_listdir, monkeypatch):
+    read, scan_dir = [], scan_index.scan_dir
+
+    def counted_scan_dir(path, stats=None):
+        read.append(os.path.basename(path))
+        return scan_dir(path, stats)
+
+    monkeypatch.setattr(scan_index, 'scan_dir', counted_scan_dir)
+    index = ScanIndex(':memory:')
+    render = collect_render_layers_by_role(shot_tree, index=index)['FG'][1]
+    read.clear()
+    assert render.get_aov_data('AO')['frames'] == 10
+    assert read == ['AO']
+
+    # a later scan gets the unchanged aov folder from the index
+    render = collect_render_layers_by_role(shot_tree, index=index)['FG'][1]
+    read.clear()
+    assert render.get_aov_data('AO')['frames'] == 10
+    assert read == [] and count_listdir == []
+
+    # the reader is not sent with the render, eg: by the scan service
+    copy = pickle.loads(pickle.dumps(render))
+    assert copy.get_aov_data('emission')['frames'] == 10
+    assert count_listdir == ['emission']
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.disk_walker import ScanStats
+from RenderManager2.render_manager2.core.render_manifest import (
+    build_manifest,
+    find_version_path,
+    write_manifest,
+)
+from RenderManager2.tests.conftest import render_summary
+
+
+def _write_all_manifests(shot_tree):
+    for layer in os.listdir(shot_tree):
+        for version in os.listdir(os.path.join(shot_tree, layer)):
+            path = f'{shot_tree}/{layer}/{version}'
+            write_manifest(path, build_manifest(path))
+
+
+def test_collector_reads_manifests(shot_tree, monkeypatch):
+    expected = render_summary(collect_render_layers_by_role(shot_tree))
+    walk_stats = ScanStats()
+    collect_render_layers_by_role(shot_tree, walk_stats)
+
+    _write_all_manifests(shot_tree)
+
+    listed = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, 'listdir', lambda path: listed.append(path) or listdir(path))
+
+    stats = ScanStats()
+    renders = collect_render_layers_by_role(shot_tree, stats)
+    assert render_summary(renders) == expected
+    assert stats.scandir < walk_stats.scandir
+    # aov frames come from the manifest, aov folders are never listed
+    assert listed == []
+
+
+def test_invalid_manifest_falls_back_to_walk(shot_tree):
+    expected = render_summary(collect_render_layers_by_role(shot_tree))
+    version_path = f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0026'
+    manifest = build_manifest(version_path)
+    manifest['manifest_version'] = 0
+    write_manifest(version_path, manifest)
+
+    assert render_summary(collect_render_layers_by_role(shot_tree)) == expected
+
+
+def test_find_version_path(shot_tree):
+    version_path = f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0026'
+    assert find_version_path(version_path + '/beauty') == version_path
+    assert find_version_path(version_path) == version_path
+    assert find_version_path(shot_tree) is None
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,36 @@
+import pickle
+
+import pytest
+from RenderManager2.render_manager2.render.render_layer import Render
+
+
+def test_render_parts_parsed_once():
+    render = Render(
+        'I:\\FRAMES\\030\\CG\\RND_ALL_KEY_TECH\\LGT_KAF_010_v0026',
+        'RND_ALL_KEY_TECH',
+        ['Z', 'N'],
+        {'user': 'jdoe'},
+    )
+    assert render.path() == 'I:/FRAMES/030/CG/RND_ALL_KEY_TECH/LGT_KAF_010_v0026'
+    assert render.suffix() == 'TECH'
+    assert render.rol_layer() == 'ALL_KEY'
+    assert render.rol_main() == 'ALL'
+    assert render.prefix_rol_layer() == 'RND_ALL_KEY'
+    assert render.version() == 'LGT_KAF_010_v0026'
+    assert render.int_version() == 26
+    assert render.name_version() == 'LGT_KAF_010'
+    assert not hasattr(render, '__dict__')
+
+    # aov names built at runtime, like the ones of a directory listing
+    first = Render('CG/RND_FG_BTY/LGT_v0025', 'RND_FG_BTY', [''.join(['bea', 'uty'])], {})
+    second = Render(
+        'CG/RND_FG_BTY/LGT_v0026', 'RND_FG_BTY', [''.join(['beau', 'ty'])], {}
+    )
+    assert first.aovs()[0] is second.aovs()[0]
+
+    copy = pickle.loads(pickle.dumps(render))
+    assert (copy.path(), copy.aovs(), copy.user()) == (render.path(), ['Z', 'N'], 'jdoe')
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+from RenderManager2.render_manager2.core import disk_collector
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layer,
+    collect_render_layers_by_role,
+)
+from RenderManager2.tests.conftest import render_paths
+
+
+def test_budget_returns_partial_and_resumes(shot_tree, monkeypatch):
+    expected = collect_render_layers_by_role(shot_tree)
+    assert expected.complete and expected.pending() == []
+
+    def slow_layer(path, name, *args):
+        if name == 'RND_FG_CRYPTO':
+            time.sleep(0.5)
+        return collect_render_layer(path, name, *args)
+
+    monkeypatch.setattr(disk_collector, 'collect_render_layer', slow_layer)
+
+    start = time.monotonic()
+    partial = collect_render_layers_by_role(shot_tree, workers=4, budget=0.2)
+    assert time.monotonic() - start < 0.45
+
+    assert not partial.complete
+    assert partial.pending() == ['RND_FG_CRYPTO']
+    assert partial.pending_paths() == [f'{shot_tree}/RND_FG_CRYPTO']
+    assert {r.name() for r in partial['FG']} == {'RND_FG_BTY'}
+
+    resumed = collect_render_layers_by_role(shot_tree, resume=partial)
+    assert resumed is partial and resumed.complete
+    assert render_paths(resumed) == render_paths(expected)
+
+
+def test_budget_complete_and_missing_path(shot_tree):
+    result = collect_render_layers_by_role(shot_tree, budget=10)
+    assert result.complete
+    assert render_paths(result) == render_paths(collect_render_layers_by_role(shot_tree))
+
+    missing = collect_render_layers_by_role(shot_tree + '/missing', budget=10)
+    assert missing.complete and missing.latest_versions() == []
+
+
+def test_budget_exceeded_listing_root(shot_tree, monkeypatch):
+    scan_dir = disk_collector.scan_dir
+
+    def slow_root(path, *args):
+        if path == shot_tree:
+            time.sleep(0.5)
+        return scan_dir(path, *args)
+
+    monkeypatch.setattr(disk_collector, 'scan_dir', slow_root)
+    partial = collect_render_layers_by_role(shot_tree, budget=0.1)
+    assert not partial.listed and not partial.complete
+    assert partial.pending() == [] and partial.latest_versions() == []
+
+    resumed = collect_render_layers_by_role(shot_tree, resume=partial)
+    assert resumed is partial and resumed.complete
+    assert render_paths(resumed) == render_paths(collect_render_layers_by_role(shot_tree))
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from RenderManager2.render_manager2.core.disk_collector import collect_render_layer
+from RenderManager2.render_manager2.core.scan_cache import ScanCache, layer_signature
+
+
+def _touch_dir(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+def test_layer_signature_changes(shot_tree):
+    layer = f'{shot_tree}/RND_FG_BTY'
+    signature = layer_signature(layer)
+    assert [name for name, _, _ in signature[1]] == [
+        'LGT_KAF_010_v0025',
+        'LGT_KAF_010_v0026',
+        'LGT_KAF_010_v0027',
+    ]
+    assert layer_signature(layer) == signature
+
+    # aovs added to a version change its folder mtime
+    _touch_dir(f'{layer}/LGT_KAF_010_v0026', 5)
+    assert layer_signature(layer) != signature
+    assert layer_signature(f'{shot_tree}/RND_FG_MISSING') is None
+
+
+def test_layer_signature_changes_with_beauty_frames(shot_tree):
+    layer = f'{shot_tree}/RND_FG_BTY'
+    signature = layer_signature(layer)
+
+    # frames written into the empty beauty of v0027 make it valid
+    _touch_dir(f'{layer}/LGT_KAF_010_v0027/beauty', 5)
+    changed = layer_signature(layer)
+    assert changed != signature
+    assert changed[1][:2] == signature[1][:2]
+
+
+def test_cache_hits_only_unchanged_layers(shot_tree):
+    cache = ScanCache()
+    names = ['RND_FG_BTY', 'RND_MG_TECH']
+    layers = {
+        name: (
+            layer_signature(f'{shot_tree}/{name}'),
+            collect_render_layer(shot_tree, name),
+        )
+        for name in names
+    }
+    cache.store(shot_tree, layers)
+
+    for name in names:
+        renders = cache.get(shot_tree, name, layer_signature(f'{shot_tree}/{name}'))
+        assert renders == list(layers[name][1])
+
+    # new version folder
+    os.makedirs(f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0028/beauty')
+    signature = layer_signature(f'{shot_tree}/RND_FG_BTY')
+    assert cache.get(shot_tree, 'RND_FG_BTY', signature) is None
+    assert cache.get(shot_tree, 'RND_MG_TECH', layers['RND_MG_TECH'][0])
+    assert cache.get(shot_tree, 'RND_MG_TECH', None) is None
+
+    cache.invalidate(shot_tree)
+    assert cache.get(shot_tree, 'RND_MG_TECH', layers['RND_MG_TECH'][0]) is None
+
+
+def test_cache_evicts_oldest_shot():
+    cache = ScanCache(max_shots=2)
+    for path in ('/a', '/b', '/c'):
+        cache.store(path, {'RND_FG_BTY': ((1, ()), [])})
+    assert len(cache) == 2
+    assert cache.get('/a', 'RND_FG_BTY', (1, ())) is None
+    assert cache.get('/c', 'RND_FG_BTY', (1, ())) == []
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
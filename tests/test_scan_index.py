@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import pytest
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.disk_walker import ScanStats
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.tests.conftest import render_summary
+
+
+def test_index_skips_unchanged_directories(shot_tree, tmp_path):
+    db_path = str(tmp_path / 'index' / 'scan_index.sqlite')
+    expected = render_summary(collect_render_layers_by_role(shot_tree))
+
+    first = ScanStats()
+    renders = collect_render_layers_by_role(shot_tree, first, index=ScanIndex(db_path))
+    assert render_summary(renders) == expected
+    assert first.scandir > 0
+
+    # reopening the database, nothing changed on disk
+    second = ScanStats()
+    renders = collect_render_layers_by_role(shot_tree, second, index=ScanIndex(db_path))
+    assert render_summary(renders) == expected
+    assert second.scandir == 0
+
+
+def test_index_lists_changed_directories(shot_tree):
+    index = ScanIndex(':memory:')
+    collect_render_layers_by_role(shot_tree, index=index)
+
+    layer = os.path.join(shot_tree, 'RND_FG_BTY')
+    shutil.copytree(
+        os.path.join(layer, 'LGT_KAF_010_v0026'), os.path.join(layer, 'LGT_KAF_010_v0030')
+    )
+    os.utime(layer, ns=(0, 123456789))
+
+    stats = ScanStats()
+    renders = collect_render_layers_by_role(shot_tree, stats, index=index)
+    assert renders['FG'][1].int_version() == 30
+    # the layer folder and the new version with its beauty aov
+    assert stats.scandir == 3
+
+
+def test_index_rescan_reads_unchanged_directories(shot_tree):
+    index = ScanIndex(':memory:')
+    collect_render_layers_by_role(shot_tree, index=index)
+
+    # frame written in place, the aov folder keeps its mtime
+    aov = os.path.join(shot_tree, 'RND_FG_BTY', 'LGT_KAF_010_v0026', 'beauty')
+    mtime = os.stat(aov).st_mtime_ns
+    open(os.path.join(aov, 'RND_FG_BTY_beauty_1011.exr'), 'wb').close()
+    os.utime(aov, ns=(mtime, mtime))
+
+    def frames():
+        renders = collect_render_layers_by_role(shot_tree, index=index)
+        return len(renders['FG'][1].frame_set('beauty'))
+
+    assert frames() == 10
+    stats = ScanStats()
+    renders = collect_render_layers_by_role(shot_tree, stats, index=index.rescan())
+    assert len(renders['FG'][1].frame_set('beauty')) == 11
+    assert stats.scandir > 0
+    # the fresh listing is kept for later scans
+    assert frames() == 11
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,70 @@
+import pytest
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+    resolve_versions,
+)
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.render.render_layer import Render
+
+
+def _latest_by_loop(renders_by_role):
+    latest = {}
+    for renders in renders_by_role.values():
+        for render in renders:
+            current = latest.get(render.name())
+            if current is None or render.int_version() > current.int_version():
+                latest[render.name()] = render
+    return list(latest.values())
+
+
+def _render(name, version):
+    return Render(f'/CG/{name}/LGT_KAF_010_v{version:04d}', name, ['beauty'], {})
+
+
+def test_index_matches_role_lists(shot_tree):
+    result = collect_render_layers_by_role(shot_tree)
+    assert result.latest_versions() == _latest_by_loop(result)
+
+    versions = result.versions('RND_FG_BTY')
+    assert [r.int_version() for r in versions] == [26, 25]
+    assert result.latest('RND_FG_BTY') is versions[0]
+    assert result.latest('RND_FG_MISSING') is None
+    assert result.versions('RND_FG_MISSING') == []
+
+
+def test_index_updates_incrementally():
+    result = ScanResult('/CG', ['RND_FG_BTY', 'RND_BG_BTY'])
+    result.add_layer('RND_FG_BTY', [_render('RND_FG_BTY', 1)])
+    result.add_layer('RND_BG_BTY', [_render('RND_BG_BTY', 3)])
+    assert [r.name() for r in result.latest_versions()] == ['RND_BG_BTY', 'RND_FG_BTY']
+
+    # rescan of one layer with a new version, the other keeps its renders
+    bg = result.latest('RND_BG_BTY')
+    result.add_layer('RND_FG_BTY', [_render('RND_FG_BTY', v) for v in (1, 4, 2)])
+    assert [r.int_version() for r in result.versions('RND_FG_BTY')] == [4, 2, 1]
+    assert result.latest('RND_BG_BTY') is bg
+    assert len(result['FG']) == 3
+
+    result.remove_render(result.latest('RND_FG_BTY'))
+    assert result.latest('RND_FG_BTY').int_version() == 2
+    assert len(result['FG']) == 2
+
+    # layer emptied by a rescan
+    result.add_layer('RND_FG_BTY', [])
+    assert result.versions('RND_FG_BTY') == [] and result['FG'] == []
+    assert result.latest_versions() == [bg]
+
+
+def test_resolve_versions_uses_index(shot_tree):
+    lazy = collect_render_layers_by_role(shot_tree, latest_only=True, defer_info=True)
+    plain = dict(collect_render_layers_by_role(shot_tree, latest_only=True))
+
+    versions = resolve_versions(lazy, 'RND_FG_BTY')
+    expected = resolve_versions(plain, 'RND_FG_BTY')
+    assert [r.path() for r in versions] == [r.path() for r in expected]
+    assert all(r.is_resolved() for r in versions)
+    assert lazy.versions('RND_FG_BTY') == versions
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,138 @@
+import threading
+import time
+from multiprocessing.connection import Client
+
+import pytest
+from RenderManager2.render_manager2.core import scan_service
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.scan_index import ScanIndex
+from RenderManager2.render_manager2.core.scan_service import (
+    ScanService,
+    request_scan,
+    service_key,
+)
+from RenderManager2.tests.conftest import render_paths
+
+
+def test_service_serves_warm_scans(shot_tree, tmp_path):
+    key_path = str(tmp_path / 'service.key')
+    address = ('127.0.0.1', 0)
+
+    assert request_scan(shot_tree, key_path=key_path) is None
+
+    service = ScanService(address, key_path, index=ScanIndex(':memory:'))
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    while service._listener is None:
+        time.sleep(0.01)
+    address = service._listener.address
+
+    try:
+        result = request_scan(shot_tree, address=address, key_path=key_path)
+        assert result.complete
+        assert render_paths(result) == render_paths(
+            collect_render_layers_by_role(shot_tree)
+        )
+        bty = next(r for r in result['FG'] if r.name() == 'RND_FG_BTY')
+        assert bty.user() == 'jdoe'
+
+        # warm shots are refreshed in place, new shots are scanned on request
+        service.refresh()
+        assert list(service._shots) == [shot_tree]
+        missing = request_scan(shot_tree + '/missing', address=address, key_path=key_path)
+        assert missing.complete and missing.latest_versions() == []
+    finally:
+        service.stop()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert request_scan(shot_tree, address=address, key_path=key_path) is None
+
+
+def test_changed_warm_shot_is_scanned_again(shot_tree):
+    service = ScanService(index=ScanIndex(':memory:'))
+    try:
+        first = service.get(shot_tree)
+        assert service.get(shot_tree) is first
+        assert first.latest('RND_FG_BTY').path().endswith('v0026')
+
+        # frames written into the empty beauty of v0027 make it the latest
+        beauty = f'{shot_tree}/RND_FG_BTY/LGT_KAF_010_v0027/beauty'
+        with open(f'{beauty}/RND_FG_BTY_beauty_1001.exr', 'wb'):
+            pass
+        second = service.get(shot_tree)
+        assert second is not first
+        assert second.latest('RND_FG_BTY').path().endswith('v0027')
+    finally:
+        service.stop()
+
+
+@pytest.fixture
+def slow_service(tmp_path, monkeypatch):
+    """Running service whose scans take 0.5s, yields (service, address, key_path)."""
+    monkeypatch.setattr(scan_service, 'SCAN_SERVICE_KEEPALIVE', 0.05)
+    key_path = str(tmp_path / 'service.key')
+    service = ScanService(('127.0.0.1', 0), key_path, index=ScanIndex(':memory:'))
+
+    scans, scan = [], service._scan
+
+    def slow_scan(path, **kwargs):
+        scans.append(path)
+        time.sleep(0.5)
+        return scan(path, **kwargs)
+
+    service._scan = slow_scan
+    service.scans = scans
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    while service._listener is None:
+        time.sleep(0.01)
+
+    yield service, service._listener.address, key_path
+    service.stop()
+    thread.join(timeout=5)
+
+
+def test_slow_scan_is_waited_and_shared(shot_tree, slow_service):
+    service, address, key_path = slow_service
+    results = []
+
+    def request():
+        results.append(
+            request_scan(shot_tree, address=address, key_path=key_path, timeout=0.2)
+        )
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(results) == 2 and all(result.complete for result in results)
+    assert service.scans == [shot_tree]
+
+
+def test_closed_client_ends_its_handler(shot_tree, slow_service, monkeypatch):
+    service, address, key_path = slow_service
+    handled, handle = [], service._handle
+
+    def counted_handle(connection):
+        handle(connection)
+        handled.append(connection)
+
+    monkeypatch.setattr(service, '_handle', counted_handle)
+    with Client(address, authkey=service_key(key_path)) as connection:
+        connection.send(('scan', shot_tree, False))
+
+    # the handler returns without raising, the scan still warms the shot
+    deadline = time.monotonic() + 5
+    while not handled and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert handled
+    assert service.get(shot_tree).complete and service.scans == [shot_tree]
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+from RenderManager2.render_manager2.core import disk_collector
+from RenderManager2.render_manager2.core.disk_collector import (
+    collect_render_layers_by_role,
+)
+from RenderManager2.render_manager2.core.info_cache import INFO_CACHE
+from RenderManager2.render_manager2.core.scan_result import ScanResult
+from RenderManager2.render_manager2.core.scan_snapshot import (
+    load_snapshot,
+    save_snapshot,
+)
+from RenderManager2.tests.conftest import render_summary
+
+
+@pytest.mark.parametrize('latest_only', [False, True])
+def test_snapshot_round_trip(shot_tree, tmp_path, latest_only):
+    result = collect_render_layers_by_role(shot_tree, latest_only=latest_only)
+    snapshot_path = str(tmp_path / 'shot.rm2s')
+
+    save_snapshot(result, snapshot_path)
+    loaded = load_snapshot(snapshot_path)
+
+    assert loaded.path == shot_tree and loaded.complete
+    assert render_summary(loaded) == render_summary(result)
+
+    frame_set = loaded['FG'][-1].frame_set('beauty')
+    assert frame_set.frame_range() == '1001-1010' and len(frame_set) == 10
+    assert 1005 in frame_set and 1011 not in frame_set
+
+
+def test_snapshot_keeps_deferred_data(shot_tree, tmp_path, monkeypatch):
+    INFO_CACHE.clear()
+    result = collect_render_layers_by_role(shot_tree, defer_info=True)
+    bty = next(r for r in result['FG'] if r.name() == 'RND_FG_BTY')
+    bty.invalidate('AO')
+    snapshot_path = str(tmp_path / 'shot.rm2s')
+
+    # nothing is read from disk to save
+    with monkeypatch.context() as patch:
+        patch.setattr(disk_collector, 'extract_user_and_references', pytest.fail)
+        patch.setattr(os, 'listdir', pytest.fail)
+        save_snapshot(result, snapshot_path)
+        loaded = load_snapshot(snapshot_path)
+
+    loaded_bty = next(r for r in loaded['FG'] if r.name() == 'RND_FG_BTY')
+    assert not loaded_bty.info_loaded() and not loaded_bty.frame_set_loaded('AO')
+    assert loaded_bty.frame_set_loaded('beauty')
+    assert loaded_bty.user() == 'jdoe'
+    assert len(loaded_bty.frame_set('AO')) == 10
+
+    # the file is closed after loading and can be replaced
+    save_snapshot(loaded, snapshot_path)
+    assert render_summary(load_snapshot(snapshot_path)) == render_summary(result)
+
+
+def test_snapshot_of_unlisted_scan(tmp_path):
+    snapshot_path = str(tmp_path / 'shot.rm2s')
+    save_snapshot(ScanResult('/CG', listed=False), snapshot_path)
+    loaded = load_snapshot(snapshot_path)
+    assert loaded.path == '/CG' and not loaded.listed and not loaded.complete
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / 'shot.rm2s'
+    path.write_bytes(b'{"not": "a snapshot"}')
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])
@@ -0,0 +1,113 @@
+import pytest
+from RenderManager2.render_manager2.render.libs import scene_index
+from RenderManager2.render_manager2.render.libs.scene_index import SceneIndex
+
+
+class Knob:
+    def __init__(self, name, value):
+        self._name, self._value = name, value
+
+    def name(self):
+        return self._name
+
+    def getValue(self):
+        return self._value
+
+
+class Backdrop:
+    def __init__(self, **knobs):
+        self.knobs = {name: Knob(name, value) for name, value in knobs.items()}
+
+    def __getitem__(self, name):
+        if name not in self.knobs:
+            raise NameError(name)
+        return self.knobs[name]
+
+
+class CallbackNuke:
+    def __init__(self, backdrops):
+        self.backdrops = backdrops
+        self.reads = 0
+        self.callbacks = {}
+        self.knob = None
+
+    def allNodes(self, node_class):
+        self.reads += 1
+        return self.backdrops
+
+    def addOnCreate(self, func, nodeClass):
+        self.callbacks['create'] = func
+
+    def addOnDestroy(self, func, nodeClass):
+        self.callbacks['destroy'] = func
+
+    def addKnobChanged(self, func, nodeClass):
+        self.callbacks['knob'] = func
+
+    def thisKnob(self):
+        return self.knob
+
+
+def subcontainer(name_layer, version, **knobs):
+    return Backdrop(
+        subcontainer=1,
+        name_layer=name_layer,
+        version=str(version),
+        range='1001-1010',
+        frames='10',
+        abc_version='char_v003.abc, prop_v001.abc',
+        **knobs,
+    )
+
+
+def test_scene_index_single_pass_and_invalidation(monkeypatch):
+    backdrops = [
+        Backdrop(container=1, rol_layer='FG'),
+        Backdrop(subcontainer=1, name_layer='RND_FG_BTY'),
+        subcontainer('RND_FG_BTY', 26),
+        subcontainer('RND_BG_TECH', 21),
+    ]
+    mock = CallbackNuke(backdrops)
+    monkeypatch.setattr(scene_index, 'nuke', mock)
+    index = SceneIndex()
+
+    assert index.lookup('RND_FG_BTY', 'version') == 26
+    assert index.lookup('RND_BG_TECH', 'ranges') == ('1001-1010', '10')
+    assert index.lookup('RND_FG_BTY', 'abc_version') == ['char_v003.abc', 'prop_v001.abc']
+    assert index.lookup('RND_FG_CRYPTO', 'version', 0) == 0
+    assert mock.reads == 1
+
+    # moving a backdrop keeps the index, changing the version invalidates it
+    mock.knob = Knob('xpos', 10)
+    mock.callbacks['knob']()
+    backdrops[2].knobs['version'] = Knob('version', '27')
+    assert index.lookup('RND_FG_BTY', 'version') == 26
+
+    mock.knob = Knob('version', '27')
+    mock.callbacks['knob']()
+    assert index.lookup('RND_FG_BTY', 'version') == 27
+
+    backdrops.pop()
+    mock.callbacks['destroy']()
+    assert index.lookup('RND_BG_TECH', 'version', 0) == 0
+    assert mock.reads == 3
+
+
+def test_scene_index_without_callbacks(monkeypatch):
+    class PlainNuke:
+        backdrops = [subcontainer('RND_FG_BTY', 26)]
+
+        def allNodes(self, node_class):
+            return self.backdrops
+
+    mock = PlainNuke()
+    monkeypatch.setattr(scene_index, 'nuke', mock)
+    index = SceneIndex()
+
+    assert index.lookup('RND_FG_BTY', 'version') == 26
+    mock.backdrops = []
+    assert index.lookup('RND_FG_BTY', 'version', 0) == 0
+
+
+if __name__ == '__main__':
+    pytest.main(['-v', '-s'])